@@ -1,14 +1,23 @@
 """Admin-only endpoints: security audit, system management."""
 
-from fastapi import APIRouter, Request
-from sqlalchemy import select, text
+from uuid import UUID
+
+from fastapi import APIRouter, Query, Request
+from pydantic import BaseModel
+from sqlalchemy import func, select, text, update
 
 from app.api.v1.deps import AdminUserId, DbSession
+from app.models import RawSignal
 from app.rate_limit import limiter
 
 router = APIRouter(prefix="/admin", tags=["admin"])
 
 
+class DeadLetterReplayRequest(BaseModel):
+    ids: list[UUID] | None = None  # None replays every dead letter (optionally for one source)
+    source_type: str | None = None
+
+
 @router.get("/security-audit")
 @limiter.limit("2/minute")
 async def run_security_audit(request: Request, user_id: AdminUserId, db: DbSession):
@@ -50,3 +59,68 @@ async def get_audit_history(request: Request, user_id: AdminUserId, db: DbSessio
         }
         for row in rows
     ]
+
+
+@router.get("/event-loop")
+@limiter.limit("10/minute")
+async def get_event_loop_stats(request: Request, user_id: AdminUserId):
+    """Blocked event-loop intervals recorded by the loop monitor, worst call sites first."""
+    from app.config import settings
+    from app.core.loop_monitor import stats
+
+    return {"mode": settings.loop_monitor_mode, **stats.to_dict()}
+
+
+@router.get("/dead-letters")
+@limiter.limit("30/minute")
+async def list_dead_letters(
+    request: Request,
+    user_id: AdminUserId,
+    db: DbSession,
+    source_type: str | None = Query(None),
+    limit: int = Query(50, ge=1, le=500),
+    offset: int = Query(0, ge=0),
+):
+    """Raw signals that exhausted their processing attempts, newest first. Admin-only."""
+    filters = [RawSignal.processing_status == "dead_letter"]
+    if source_type:
+        filters.append(RawSignal.source_type == source_type)
+
+    total = (await db.execute(select(func.count()).select_from(RawSignal).where(*filters))).scalar_one()
+    result = await db.execute(
+        select(RawSignal).where(*filters).order_by(RawSignal.created_at.desc()).limit(limit).offset(offset)
+    )
+    return {
+        "total": total,
+        "items": [
+            {
+                "id": str(raw.id),
+                "source_type": raw.source_type,
+                "company_name": raw.company_name,
+                "event_type": raw.event_type,
+                "source_url": raw.source_url,
+                "attempt_count": raw.attempt_count,
+                "last_error": raw.last_error,
+                "created_at": raw.created_at.isoformat() if raw.created_at else None,
+            }
+            for raw in result.scalars().all()
+        ],
+    }
+
+
+@router.post("/dead-letters/replay")
+@limiter.limit("10/minute")
+async def replay_dead_letters(request: Request, body: DeadLetterReplayRequest, user_id: AdminUserId, db: DbSession):
+    """Put dead-lettered raw signals back in the queue with a fresh attempt budget. Admin-only."""
+    query = (
+        update(RawSignal)
+        .where(RawSignal.processing_status == "dead_letter")
+        .values(processing_status="raw", attempt_count=0, next_attempt_at=None)
+        .execution_options(synchronize_session=False)
+    )
+    if body.ids is not None:
+        query = query.where(RawSignal.id.in_(body.ids))
+    if body.source_type:
+        query = query.where(RawSignal.source_type == body.source_type)
+    result = await db.execute(query)
+    return {"replayed": result.rowcount}
@@ -6,11 +6,10 @@ from app.api.v1.deps import CurrentUserId, DbSession, TenantId
 from app.config import settings
 from app.models import Subscription, Tenant, User
 from app.rate_limit import limiter
+from app.services import stripe_client
 
 router = APIRouter(prefix="/billing", tags=["billing"])
 
-stripe.api_key = settings.stripe_secret_key
-
 
 def _price_to_plan(price_id: str) -> str:
     """Map a Stripe price ID to a plan name."""
@@ -51,7 +50,7 @@ async def create_checkout(request: Request, body: CheckoutRequest, db: DbSession
     # Get or create Stripe customer
     if not tenant.stripe_customer_id:
         user = await db.get(User, user_id)
-        customer = stripe.Customer.create(
+        customer = await stripe_client.create_customer(
             email=user.email if user else None,
             name=user.full_name if user else None,
             metadata={"tenant_id": str(tenant_id)},
@@ -59,7 +58,7 @@ async def create_checkout(request: Request, body: CheckoutRequest, db: DbSession
         tenant.stripe_customer_id = customer.id
         await db.flush()
 
-    session = stripe.checkout.Session.create(
+    session = await stripe_client.create_checkout_session(
         customer=tenant.stripe_customer_id,
         mode="subscription",
         line_items=[{"price": _resolve_price_id(body.price_id) if body.price_id else settings.stripe_starter_price_id, "quantity": 1}],
@@ -83,7 +82,7 @@ async def create_subscription(request: Request, body: CheckoutRequest, db: DbSes
     # Get or create Stripe customer
     if not tenant.stripe_customer_id:
         user = await db.get(User, user_id)
-        customer = stripe.Customer.create(
+        customer = await stripe_client.create_customer(
             email=user.email if user else None,
             name=user.full_name if user else None,
             metadata={"tenant_id": str(tenant_id)},
@@ -91,7 +90,7 @@ async def create_subscription(request: Request, body: CheckoutRequest, db: DbSes
         tenant.stripe_customer_id = customer.id
         await db.flush()
 
-    subscription = stripe.Subscription.create(
+    subscription = await stripe_client.create_subscription(
         customer=tenant.stripe_customer_id,
         items=[{"price": _resolve_price_id(body.price_id) if body.price_id else settings.stripe_starter_price_id}],
         payment_behavior="default_incomplete",
@@ -115,7 +114,7 @@ async def customer_portal(request: Request, db: DbSession, tenant_id: TenantId):
     if not tenant or not tenant.stripe_customer_id:
         raise HTTPException(status_code=404, detail="No billing account found")
 
-    session = stripe.billing_portal.Session.create(
+    session = await stripe_client.create_portal_session(
         customer=tenant.stripe_customer_id,
         return_url=f"{settings.frontend_url}/dashboard/settings",
     )
@@ -153,7 +152,7 @@ async def stripe_webhook(request: Request, db: DbSession):
                 # Resolve plan from the Stripe subscription's price
                 plan_name = "starter"
                 try:
-                    stripe_sub = stripe.Subscription.retrieve(subscription_id)
+                    stripe_sub = await stripe_client.retrieve_subscription(subscription_id)
                     if stripe_sub["items"]["data"]:
                         price_id = stripe_sub["items"]["data"][0]["price"]["id"]
                         plan_name = _price_to_plan(price_id)
@@ -3,29 +3,25 @@
 from uuid import UUID
 
 import structlog
-from fastapi import APIRouter, HTTPException, Request
+from fastapi import APIRouter, HTTPException, Request, Response
+from redis.exceptions import RedisError
+from sqlalchemy import select
 
 from app.api.v1.deps import DbSession, TenantPlan
+from app.contacts.jobs import ACTIVE_STATES, discovery_job_id, enqueue_discovery, get_progress
 from app.contacts.pipeline import get_or_discover_contacts
 from app.models.company import Company
+from app.models.contact import Contact
 from app.plan_limits import raise_plan_limit
 from app.rate_limit import limiter
-from app.schemas.contact import ContactOut, ContactsResponse
+from app.schemas.contact import ContactDiscoveryProgress, ContactOut, ContactsResponse
 
 logger = structlog.get_logger()
 
 router = APIRouter(prefix="/contacts", tags=["contacts"])
 
 
-@router.post("/{company_id}/find", response_model=ContactsResponse)
-@limiter.limit("10/minute")
-async def find_contacts(
-    request: Request,
-    company_id: UUID,
-    db: DbSession,
-    tp: TenantPlan,
-):
-    """Trigger contact discovery for a company. Paid plans only."""
+def _require_contacts_plan(tp) -> None:
     if tp.limits.contacts_per_day == 0:
         raise_plan_limit(
             "contacts",
@@ -33,33 +29,113 @@ async def find_contacts(
             "Contact discovery requires a paid plan. Upgrade to find decision-makers.",
         )
 
-    company = await db.get(Company, company_id)
-    if not company:
-        raise HTTPException(status_code=404, detail="Company not found")
-
-    if not company.domain:
-        return ContactsResponse(
-            contacts=[],
-            company_id=company.id,
-            company_name=company.name,
-            status="no_domain",
-            total=0,
-        )
 
-    contacts = await get_or_discover_contacts(db, company)
-    await db.commit()
+async def _top_contacts(db, company_id: UUID) -> list[Contact]:
+    result = await db.execute(
+        select(Contact)
+        .where(Contact.company_id == company_id)
+        .order_by(Contact.decision_maker_score.desc().nullslast())
+        .limit(5)
+    )
+    return list(result.scalars().all())
 
-    status = "found" if contacts else "none_found"
 
+def _contacts_response(
+    company: Company,
+    contacts: list[Contact],
+    status: str,
+    progress: dict[str, str] | None = None,
+) -> ContactsResponse:
     return ContactsResponse(
         contacts=[ContactOut.model_validate(c) for c in contacts],
         company_id=company.id,
         company_name=company.name,
         status=status,
         total=len(contacts),
+        job_id=discovery_job_id(company.id) if progress else None,
+        progress=ContactDiscoveryProgress.model_validate(progress) if progress else None,
     )
 
 
+@router.post("/{company_id}/find", response_model=ContactsResponse)
+@limiter.limit("10/minute")
+async def find_contacts(
+    request: Request,
+    response: Response,
+    company_id: UUID,
+    db: DbSession,
+    tp: TenantPlan,
+):
+    """Trigger contact discovery for a company. Paid plans only.
+
+    Discovery runs as a background job; a ``pending`` response carries the
+    job id and callers poll ``GET /contacts/{company_id}/status``. Repeat
+    requests while a job is in flight join that job.
+    """
+    _require_contacts_plan(tp)
+
+    company = await db.get(Company, company_id)
+    if not company:
+        raise HTTPException(status_code=404, detail="Company not found")
+
+    if not company.domain:
+        return _contacts_response(company, [], "no_domain")
+
+    progress = await get_progress(company_id)
+    if progress and progress.get("state") in ACTIVE_STATES:
+        response.status_code = 202
+        return _contacts_response(company, await _top_contacts(db, company_id), "pending", progress)
+
+    contacts = await _top_contacts(db, company_id)
+    if contacts:
+        return _contacts_response(company, contacts, "found")
+    if company.contacts_found_at is not None:
+        return _contacts_response(company, [], "none_found")
+
+    try:
+        await enqueue_discovery(company_id)
+    except (RedisError, OSError) as e:
+        # No job queue available — fall back to discovering inline
+        logger.warning("contacts.enqueue_failed", company_id=str(company_id), error=str(e))
+        contacts = await get_or_discover_contacts(db, company)
+        await db.commit()
+        return _contacts_response(company, contacts, "found" if contacts else "none_found")
+
+    response.status_code = 202
+    return _contacts_response(company, [], "pending", {"state": "queued"})
+
+
+@router.get("/{company_id}/status", response_model=ContactsResponse)
+@limiter.limit("120/minute")
+async def get_contacts_status(
+    request: Request,
+    company_id: UUID,
+    db: DbSession,
+    tp: TenantPlan,
+):
+    """Progress of a company's discovery job, with the contacts saved so far."""
+    _require_contacts_plan(tp)
+
+    company = await db.get(Company, company_id)
+    if not company:
+        raise HTTPException(status_code=404, detail="Company not found")
+
+    progress = await get_progress(company_id)
+    contacts = await _top_contacts(db, company_id)
+    state = progress.get("state") if progress else None
+
+    if not company.domain:
+        status = "no_domain"
+    elif state in ACTIVE_STATES:
+        status = "pending"
+    elif state == "failed" and not contacts:
+        status = "failed"
+    else:
+        status = "found" if contacts else "none_found"
+
+    return _contacts_response(company, contacts, status, progress)
+
+
 @router.get("/{company_id}", response_model=ContactsResponse)
 @limiter.limit("60/minute")
 async def get_contacts(
@@ -69,36 +145,16 @@ async def get_contacts(
     tp: TenantPlan,
 ):
     """Get cached contacts for a company."""
-    if tp.limits.contacts_per_day == 0:
-        raise_plan_limit(
-            "contacts",
-            tp.plan,
-            "Contact discovery requires a paid plan. Upgrade to find decision-makers.",
-        )
+    _require_contacts_plan(tp)
 
     company = await db.get(Company, company_id)
     if not company:
         raise HTTPException(status_code=404, detail="Company not found")
 
-    from sqlalchemy import select
-    from app.models.contact import Contact
-
-    result = await db.execute(
-        select(Contact)
-        .where(Contact.company_id == company_id)
-        .order_by(Contact.decision_maker_score.desc().nullslast())
-        .limit(5)
-    )
-    contacts = list(result.scalars().all())
+    contacts = await _top_contacts(db, company_id)
 
     status = "found" if contacts else "none_found"
     if not company.domain:
         status = "no_domain"
 
-    return ContactsResponse(
-        contacts=[ContactOut.model_validate(c) for c in contacts],
-        company_id=company.id,
-        company_name=company.name,
-        status=status,
-        total=len(contacts),
-    )
+    return _contacts_response(company, contacts, status)
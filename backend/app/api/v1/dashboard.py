@@ -5,6 +5,8 @@ from sqlalchemy import func, select
 
 from app.api.v1.deps import DbSession, TenantId
 from app.models import Alert, Company, Signal, SignalSource, Watchlist
+from app.processing.enrichment_queue import enrichment_queue_by_source
+from app.processing.signal_queue import queue_wait_by_source, raw_queue_by_source
 from app.rate_limit import limiter
 from app.schemas.dashboard import DashboardResponse, DashboardStats, PipelineHealthItem
 from app.schemas.signal import SignalOut
@@ -88,6 +90,28 @@ async def get_stats(request: Request, db: DbSession, tenant_id: TenantId):
 async def pipeline_health(request: Request, db: DbSession):
     result = await db.execute(select(SignalSource).order_by(SignalSource.name))
     sources = result.scalars().all()
+    queue = await enrichment_queue_by_source(db)
+    raw_queue = await raw_queue_by_source(db)
+    now = datetime.now(timezone.utc)
+    waits = await queue_wait_by_source(db, now)
+
+    def queue_fields(source_type: str) -> dict:
+        depth, oldest = queue.get(source_type, (0, None))
+        return {
+            "enrichment_queue_depth": depth,
+            "enrichment_oldest_wait_seconds": int((now - oldest).total_seconds()) if oldest else None,
+        }
+
+    def raw_queue_fields(source_type: str) -> dict:
+        depth, oldest = raw_queue.get(source_type, (0, None))
+        avg_wait, max_wait = waits.get(source_type, (None, None))
+        return {
+            "raw_queue_depth": depth,
+            "raw_oldest_wait_seconds": int((now - oldest).total_seconds()) if oldest else None,
+            "avg_queue_wait_seconds": int(avg_wait) if avg_wait is not None else None,
+            "max_queue_wait_seconds": int(max_wait) if max_wait is not None else None,
+        }
+
     return [
         PipelineHealthItem(
             name=s.name,
@@ -99,6 +123,8 @@ async def pipeline_health(request: Request, db: DbSession):
             last_run_duration_ms=s.last_run_duration_ms,
             error_count=s.error_count,
             last_error=s.last_error,
+            **queue_fields(s.source_type),
+            **raw_queue_fields(s.source_type),
         )
         for s in sources
     ]
@@ -6,12 +6,13 @@ from uuid import UUID
 import structlog
 from fastapi import APIRouter, HTTPException, Query, Request
 from fastapi.responses import StreamingResponse
-from sqlalchemy import case, distinct, func, select
+from sqlalchemy import case, func, select
 from sqlalchemy.orm import aliased
 
 from app.api.v1.deps import CurrentUserId, DbSession, TenantId, TenantPlan
 from app.models import Company, Contact, Signal, Watchlist
 from app.plan_limits import raise_plan_limit
+from app.processing.deal_aggregates import days_since_latest, deal_score_aggregates, deal_score_from_row
 from app.processing.deal_scorer import DealScoreResult, compute_deal_score
 from app.processing.disposition import get_disposition_window
 from app.processing.justification import generate_compact_justification, generate_full_justification
@@ -102,28 +103,15 @@ async def _build_opportunities(
 
     # Aggregate signals per company
     agg_query = (
-        select(
-            Company.id.label("company_id"),
+        deal_score_aggregates(
             Company.name.label("company_name"),
             Company.ticker,
             Company.industry,
             Company.headquarters_state,
             Company.employee_count,
-            Company.composite_risk_score,
-            Company.risk_trend,
-            func.count(Signal.id).label("signal_count"),
-            func.coalesce(func.sum(Signal.device_estimate), 0).label("total_device_estimate"),
-            func.max(Signal.created_at).label("latest_signal_at"),
             func.min(Signal.created_at).label("earliest_signal_at"),
-            func.avg(Signal.confidence_score).label("avg_confidence"),
-            func.avg(Signal.severity_score).label("avg_severity"),
-            func.count(distinct(Signal.source_name)).label("source_diversity"),
-            func.array_agg(distinct(Signal.signal_type)).label("signal_types"),
-            func.array_agg(distinct(Signal.source_name)).label("source_names"),
         )
-        .join(Signal, Signal.company_id == Company.id)
         .where(base_filter)
-        .group_by(Company.id)
         .having(func.count(Signal.id) > 0)
     )
 
@@ -159,22 +147,11 @@ async def _build_opportunities(
     # Compute deal scores and build opportunity objects
     opportunities: list[OpportunityOut] = []
     for row in rows:
-        days_since = (now - row.latest_signal_at.replace(tzinfo=timezone.utc)).days if row.latest_signal_at else 999
+        days_since = days_since_latest(row, now)
         signal_types_list = list(row.signal_types) if row.signal_types else []
         source_names_list = list(row.source_names) if row.source_names else []
 
-        deal_result = compute_deal_score(
-            avg_severity=float(row.avg_severity or 0),
-            avg_confidence=float(row.avg_confidence or 0),
-            composite_risk_score=row.composite_risk_score or 0,
-            total_devices=int(row.total_device_estimate or 0),
-            source_diversity=int(row.source_diversity or 1),
-            signal_types=signal_types_list,
-            days_since_latest=days_since,
-            source_names=source_names_list,
-            risk_trend=row.risk_trend or "stable",
-            signal_count=row.signal_count,
-        )
+        deal_result = deal_score_from_row(row, now)
 
         if min_deal_score and deal_result.score < min_deal_score:
             continue
@@ -142,7 +142,7 @@ async def trigger_company_enrichment(
         from app.db.session import async_session_factory
 
         async with async_session_factory() as session:
-            stats = await backfill_all_companies(session, batch_size=30)
+            stats = await backfill_all_companies(session, batch_size=100)
         return EnrichResponse(message="Backfill complete", stats=stats)
 
     stats = await enrich_pending_companies(db, batch_size=20)
@@ -21,6 +21,25 @@ class Settings(BaseSettings):
     # Redis
     redis_url: str = "redis://localhost:6379"
 
+    # Event loop monitoring
+    loop_monitor_mode: str = "off"  # off | debug | watchdog
+    loop_block_threshold_ms: int = 100
+    blocking_pool_size: int = 16  # Threads for sync SDK calls / parsing
+
+    # Signal pipeline
+    pipeline_max_attempts: int = 5  # Failed processing runs before a raw signal is dead-lettered
+
+    # Company enrichment
+    enrichment_concurrency: int = 10  # Companies enriched at once; SEC calls share one rate limit
+    enrichment_llm_concurrency: int = 4  # Concurrent LLM fallback calls per enrichment batch
+
+    # Contact discovery
+    browser_pool_size: int = 3  # Concurrent Playwright contexts for contact discovery
+    pattern_skip_smtp_confidence: float = 0.9  # Inferred email pattern probability that skips SMTP
+    contact_prefetch_batch: int = 25  # Top opportunities to prefetch contacts for per run
+    contact_prefetch_llm_per_hour: int = 40
+    contact_prefetch_smtp_per_hour: int = 400  # RCPT probes
+
     # Claude API
     anthropic_api_key: str = ""
 
@@ -29,7 +48,10 @@ class Settings(BaseSettings):
 
     # Resend
     resend_api_key: str = ""
+    resend_api_url: str = "https://api.resend.com"
     from_email: str = "support@disposight.com"
+    resend_requests_per_second: float = 2.0  # Resend's default team rate limit
+    email_outbox_batch_size: int = 200
 
     # Stripe
     stripe_secret_key: str = ""
@@ -39,6 +61,8 @@ class Settings(BaseSettings):
     stripe_starter_yearly_price_id: str = ""
     stripe_pro_yearly_price_id: str = ""
     stripe_enterprise_price_id: str = ""
+    stripe_api_base: str = ""  # Override for local stand-in servers
+    stripe_timeout_seconds: float = 20.0
 
     # Sentry
     sentry_dsn: str = ""
@@ -49,6 +73,7 @@ class Settings(BaseSettings):
 
     # SEC EDGAR
     sec_user_agent: str = "DispoSight support@disposight.com"
+    sec_reference_dir: str = "/tmp/disposight/sec"  # Shared on-disk cache of SEC reference data
 
     # CourtListener
     courtlistener_api_key: str = ""
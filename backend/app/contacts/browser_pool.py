@@ -0,0 +1,134 @@
+"""Long-lived headless Chromium shared by contact discovery.
+
+Launching Chromium costs far more than rendering a page, so one browser is
+started on first use and kept for the life of the process (closed from the
+app lifespan / worker shutdown). Each company gets its own fresh browser
+context — isolated cookies and storage — and at most ``max_contexts`` are open
+at once. Images, fonts and media are aborted at the network layer. If the
+browser process dies it is relaunched on the next request.
+"""
+
+import asyncio
+from contextlib import asynccontextmanager
+
+import structlog
+
+from app.config import settings
+
+logger = structlog.get_logger()
+
+USER_AGENT = "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36"
+BLOCKED_RESOURCE_TYPES = frozenset({"image", "font", "media"})
+PAGE_TIMEOUT_MS = 10000
+
+STRIP_CHROME_JS = """
+    document.querySelectorAll('script, style, nav, footer')
+        .forEach(el => el.remove())
+"""
+
+
+class BrowserUnavailable(Exception):
+    """Playwright is not installed or Chromium could not be launched."""
+
+
+async def _block_heavy_resources(route) -> None:
+    if route.request.resource_type in BLOCKED_RESOURCE_TYPES:
+        await route.abort()
+    else:
+        await route.continue_()
+
+
+class BrowserPool:
+    """One persistent browser handing out fresh, concurrency-capped contexts."""
+
+    def __init__(self, max_contexts: int | None = None):
+        self._max_contexts = max_contexts or settings.browser_pool_size
+        self._semaphore = asyncio.Semaphore(self._max_contexts)
+        self._lock = asyncio.Lock()
+        self._playwright = None
+        self._browser = None
+        self.launches = 0
+
+    async def _ensure_browser(self):
+        async with self._lock:
+            if self._browser is not None and self._browser.is_connected():
+                return self._browser
+            if self._browser is not None:
+                logger.warning("browser_pool.relaunching")
+                self._browser = None
+
+            if self._playwright is None:
+                try:
+                    from playwright.async_api import async_playwright
+                except ImportError as e:
+                    raise BrowserUnavailable("playwright not installed") from e
+                self._playwright = await async_playwright().start()
+
+            try:
+                self._browser = await self._playwright.chromium.launch(headless=True)
+            except Exception as e:
+                raise BrowserUnavailable(str(e)) from e
+            self.launches += 1
+            logger.info("browser_pool.launched", launches=self.launches)
+            return self._browser
+
+    @asynccontextmanager
+    async def context(self):
+        """A fresh browser context; waits while ``max_contexts`` are in use."""
+        async with self._semaphore:
+            browser = await self._ensure_browser()
+            try:
+                ctx = await browser.new_context(user_agent=USER_AGENT)
+            except Exception:
+                # Browser crashed between the health check and now — relaunch once
+                if browser.is_connected():
+                    raise
+                browser = await self._ensure_browser()
+                ctx = await browser.new_context(user_agent=USER_AGENT)
+            await ctx.route("**/*", _block_heavy_resources)
+            try:
+                yield ctx
+            finally:
+                try:
+                    await ctx.close()
+                except Exception:
+                    pass
+
+    async def scrape(self, base_url: str, paths: list[str], max_chars: int = 5000) -> str:
+        """Render ``paths`` under ``base_url`` in one context and return their visible text."""
+        all_text = ""
+        try:
+            async with self.context() as ctx:
+                page = await ctx.new_page()
+                for path in paths:
+                    try:
+                        await page.goto(f"{base_url}{path}", timeout=PAGE_TIMEOUT_MS, wait_until="networkidle")
+                        await page.evaluate(STRIP_CHROME_JS)
+                        text = await page.evaluate("document.body.innerText")
+                        if text and len(text.strip()) > 100:
+                            all_text += f"\n\n--- {path} ---\n{text.strip()}"
+                            if len(all_text) > max_chars:
+                                break
+                    except Exception:
+                        continue
+        except BrowserUnavailable as e:
+            logger.warning("playwright.unavailable", error=str(e))
+        except Exception as e:
+            logger.error("playwright.scrape_failed", error=str(e))
+
+        return all_text[:max_chars]
+
+    async def close(self) -> None:
+        async with self._lock:
+            if self._browser is not None:
+                try:
+                    await self._browser.close()
+                except Exception:
+                    pass
+                self._browser = None
+            if self._playwright is not None:
+                await self._playwright.stop()
+                self._playwright = None
+
+
+browser_pool = BrowserPool()
@@ -4,18 +4,22 @@ Scrapes team/about/leadership pages, uses AI to extract names, titles, and phone
 scores each contact by seniority level.
 """
 
-import httpx
+from collections.abc import Awaitable, Callable
+
 import structlog
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from bs4 import BeautifulSoup
-
+from app.contacts.browser_pool import browser_pool
+from app.contacts.page_fetcher import fetch_page_text, fetch_pages
 from app.processing.llm_client import llm_client
 from app.models.company import Company
 from app.models.contact import Contact
 
 logger = structlog.get_logger()
 
+# Called with a stage name ("scraping", "extracting", "validating") and counts
+ProgressCallback = Callable[..., Awaitable[None]]
+
 CONTACT_PROMPT = """From this company website content, extract people in leadership/management roles.
 
 Company: {company_name}
@@ -74,7 +78,9 @@ TEAM_PAGE_PATHS = [
 ]
 
 
-async def find_contacts_for_company(db: AsyncSession, company: Company) -> list[Contact]:
+async def find_contacts_for_company(
+    db: AsyncSession, company: Company, on_progress: ProgressCallback | None = None
+) -> list[Contact]:
     """Find decision-makers for a company by scraping website pages.
 
     1. Scrape team/about/leadership pages and use AI to extract contacts
@@ -86,80 +92,31 @@ async def find_contacts_for_company(db: AsyncSession, company: Company) -> list[
     base_url = f"https://{company.domain}"
 
     # Step 1: Scrape team/about pages + AI extraction
-    contacts = await _scrape_and_extract_contacts(db, company, base_url)
+    contacts = await _scrape_and_extract_contacts(db, company, base_url, on_progress)
     if contacts:
         return contacts
 
     # Step 2: Try the homepage as a last resort
-    contacts = await _try_homepage_extraction(db, company, base_url)
+    contacts = await _try_homepage_extraction(db, company, base_url, on_progress)
     return contacts
 
 
-async def _scrape_with_playwright(base_url: str, paths: list[str]) -> str:
-    """Render JS-heavy pages with headless Chromium. Fallback when httpx fails."""
-    try:
-        from playwright.async_api import async_playwright
-    except ImportError:
-        logger.warning("playwright.not_installed")
-        return ""
+async def _report(on_progress: ProgressCallback | None, state: str, **counts) -> None:
+    if on_progress is not None:
+        await on_progress(state, **counts)
 
-    all_text = ""
-    try:
-        async with async_playwright() as p:
-            browser = await p.chromium.launch(headless=True)
-            context = await browser.new_context(
-                user_agent="Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36"
-            )
-            page = await context.new_page()
-
-            for path in paths:
-                try:
-                    url = f"{base_url}{path}"
-                    await page.goto(url, timeout=10000, wait_until="networkidle")
-                    await page.evaluate("""
-                        document.querySelectorAll('script, style, nav, footer')
-                            .forEach(el => el.remove())
-                    """)
-                    text = await page.evaluate("document.body.innerText")
-                    if text and len(text.strip()) > 100:
-                        all_text += f"\n\n--- {path} ---\n{text.strip()}"
-                        if len(all_text) > 5000:
-                            break
-                except Exception:
-                    continue
-
-            await browser.close()
-    except Exception as e:
-        logger.error("playwright.scrape_failed", error=str(e))
 
-    return all_text[:5000]
+async def _scrape_with_playwright(base_url: str, paths: list[str]) -> str:
+    """Render JS-heavy pages with the pooled headless Chromium. Fallback when httpx fails."""
+    return await browser_pool.scrape(base_url, paths)
 
 
 async def _scrape_and_extract_contacts(
-    db: AsyncSession, company: Company, base_url: str
+    db: AsyncSession, company: Company, base_url: str, on_progress: ProgressCallback | None = None
 ) -> list[Contact]:
     """Scrape team/about pages and use AI to extract contacts."""
-    all_text = ""
-
-    async with httpx.AsyncClient(timeout=5.0, follow_redirects=True, verify=False) as client:
-        for path in TEAM_PAGE_PATHS:
-            try:
-                url = f"{base_url}{path}"
-                response = await client.get(
-                    url,
-                    headers={"User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36"},
-                )
-                if response.status_code == 200:
-                    soup = BeautifulSoup(response.text, "html.parser")
-                    for tag in soup(["script", "style", "nav", "footer"]):
-                        tag.decompose()
-                    text = soup.get_text(separator=" ", strip=True)
-                    if len(text) > 100:
-                        all_text += f"\n\n--- {path} ---\n{text}"
-                        if len(all_text) > 5000:
-                            break
-            except Exception:
-                continue
+    await _report(on_progress, "scraping")
+    all_text = await fetch_pages(base_url, TEAM_PAGE_PATHS)
 
     # If httpx found nothing, try Playwright for JS-rendered pages
     if not all_text:
@@ -169,34 +126,24 @@ async def _scrape_and_extract_contacts(
     if not all_text:
         return []
 
+    await _report(on_progress, "extracting")
     return await _ai_extract_contacts(db, company, all_text[:5000], "website")
 
 
 async def _try_homepage_extraction(
-    db: AsyncSession, company: Company, base_url: str
+    db: AsyncSession, company: Company, base_url: str, on_progress: ProgressCallback | None = None
 ) -> list[Contact]:
     """Last resort: try the homepage for any mentioned names."""
-    try:
-        async with httpx.AsyncClient(timeout=5.0, follow_redirects=True, verify=False) as client:
-            response = await client.get(
-                base_url,
-                headers={"User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36"},
-            )
-            if response.status_code == 200:
-                soup = BeautifulSoup(response.text, "html.parser")
-                for tag in soup(["script", "style", "nav", "footer"]):
-                    tag.decompose()
-                text = soup.get_text(separator=" ", strip=True)
-
-                if len(text) >= 100:
-                    return await _ai_extract_contacts(db, company, text[:5000], "homepage")
-    except Exception:
-        pass
+    text = await fetch_page_text(base_url)
+    if len(text) >= 100:
+        await _report(on_progress, "extracting")
+        return await _ai_extract_contacts(db, company, text[:5000], "homepage")
 
     # Try Playwright for JS-rendered homepage
     logger.info("contacts.trying_playwright_homepage", company=company.name)
     all_text = await _scrape_with_playwright(base_url, [""])
     if all_text and len(all_text.strip()) > 100:
+        await _report(on_progress, "extracting")
         return await _ai_extract_contacts(db, company, all_text[:5000], "homepage")
 
     return []
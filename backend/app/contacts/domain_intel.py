@@ -0,0 +1,185 @@
+"""Per-domain mail intelligence for contact validation.
+
+Caches what we learn about a domain — MX hosts (including "no MX"), whether it
+is catch-all, and whether its MX blocks our SMTP probes — so contacts at an
+already-seen domain skip every network check that can't change the outcome.
+
+Two tiers: a small in-process LRU in front of the ``email_patterns`` row for
+the domain. Each fact has its own timestamp and TTL; negative results expire
+sooner than positive ones.
+"""
+
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+
+import dns.asyncresolver
+import dns.exception
+import dns.resolver
+import structlog
+from sqlalchemy import func, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.email_pattern import EmailPattern
+
+logger = structlog.get_logger()
+
+MX_TTL = timedelta(days=7)
+NO_MX_TTL = timedelta(days=1)
+CATCH_ALL_TTL = timedelta(days=30)
+SMTP_BLOCKED_TTL = timedelta(days=1)
+MEMORY_TTL = timedelta(minutes=10)
+MEMORY_MAX_DOMAINS = 5000
+DNS_LIFETIME = 5.0
+
+
+@dataclass
+class DomainIntel:
+    domain: str
+    mx_hosts: list[str] = field(default_factory=list)
+    mx_valid: bool | None = None
+    mx_checked_at: datetime | None = None
+    has_catch_all: bool | None = None
+    catch_all_checked_at: datetime | None = None
+    smtp_blocked: bool | None = None
+    smtp_checked_at: datetime | None = None
+    pattern: str | None = None
+
+    def mx_fresh(self, now: datetime) -> bool:
+        if self.mx_checked_at is None or self.mx_valid is None:
+            return False
+        return now - self.mx_checked_at < (MX_TTL if self.mx_valid else NO_MX_TTL)
+
+    def catch_all_known(self, now: datetime) -> bool:
+        if self.has_catch_all is None or self.catch_all_checked_at is None:
+            return False
+        return now - self.catch_all_checked_at < CATCH_ALL_TTL
+
+    def blocked(self, now: datetime) -> bool:
+        if not self.smtp_blocked or self.smtp_checked_at is None:
+            return False
+        return now - self.smtp_checked_at < SMTP_BLOCKED_TTL
+
+
+_memory: "OrderedDict[str, tuple[DomainIntel, datetime]]" = OrderedDict()
+
+
+def _memory_get(domain: str, now: datetime) -> DomainIntel | None:
+    entry = _memory.get(domain)
+    if entry is None:
+        return None
+    intel, stored_at = entry
+    if now - stored_at >= MEMORY_TTL:
+        del _memory[domain]
+        return None
+    _memory.move_to_end(domain)
+    return intel
+
+
+def _memory_put(intel: DomainIntel, now: datetime) -> None:
+    _memory[intel.domain] = (intel, now)
+    _memory.move_to_end(intel.domain)
+    while len(_memory) > MEMORY_MAX_DOMAINS:
+        _memory.popitem(last=False)
+
+
+def clear_memory() -> None:
+    _memory.clear()
+
+
+async def resolve_mx(domain: str) -> tuple[list[str], bool]:
+    """Resolve MX hosts by preference. Returns (hosts, definitive).
+
+    ``definitive`` is False for timeouts and server failures (including no
+    nameserver answering), whose empty result must not be cached as "no MX".
+    """
+    try:
+        answers = await dns.asyncresolver.resolve(domain, "MX", lifetime=DNS_LIFETIME)
+    except (dns.resolver.NXDOMAIN, dns.resolver.NoAnswer):
+        return [], True
+    except (dns.exception.Timeout, dns.exception.DNSException) as e:
+        logger.debug("domain_intel.mx_lookup_failed", domain=domain, error=str(e))
+        return [], False
+    hosts = sorted(answers, key=lambda r: r.preference)
+    return [str(r.exchange).rstrip(".") for r in hosts if str(r.exchange) != "."], True
+
+
+async def _load(db: AsyncSession, domain: str) -> DomainIntel:
+    result = await db.execute(select(EmailPattern).where(EmailPattern.domain == domain))
+    row = result.scalar_one_or_none()
+    if row is None:
+        return DomainIntel(domain=domain)
+    return DomainIntel(
+        domain=domain,
+        mx_hosts=list(row.mx_hosts or []),
+        mx_valid=row.mx_valid,
+        mx_checked_at=row.mx_checked_at,
+        has_catch_all=row.has_catch_all,
+        catch_all_checked_at=row.catch_all_checked_at,
+        smtp_blocked=row.smtp_blocked,
+        smtp_checked_at=row.smtp_checked_at,
+        pattern=row.pattern,
+    )
+
+
+async def _persist(db: AsyncSession, intel: DomainIntel) -> None:
+    values = {
+        "domain": intel.domain,
+        "pattern": intel.pattern,
+        "mx_valid": intel.mx_valid,
+        "mx_hosts": intel.mx_hosts,
+        "mx_checked_at": intel.mx_checked_at,
+        "has_catch_all": intel.has_catch_all,
+        "catch_all_checked_at": intel.catch_all_checked_at,
+        "smtp_blocked": intel.smtp_blocked,
+        "smtp_checked_at": intel.smtp_checked_at,
+    }
+    stmt = pg_insert(EmailPattern).values(**values)
+    update = {k: stmt.excluded[k] for k in values if k not in ("domain", "pattern")}
+    # Never erase a pattern another worker learned since we loaded the row
+    update["pattern"] = func.coalesce(stmt.excluded.pattern, EmailPattern.pattern)
+    update["updated_at"] = func.now()
+    await db.execute(stmt.on_conflict_do_update(index_elements=["domain"], set_=update))
+
+
+async def get_domain_intel(db: AsyncSession, domain: str) -> DomainIntel:
+    """Cached intel for ``domain``, resolving MX if it is unknown or expired."""
+    now = datetime.now(timezone.utc)
+    intel = _memory_get(domain, now)
+    if intel is None:
+        intel = await _load(db, domain)
+
+    if not intel.mx_fresh(now):
+        hosts, definitive = await resolve_mx(domain)
+        # A failed lookup says nothing new: keep whatever hosts we knew
+        if definitive:
+            intel.mx_hosts = hosts
+            intel.mx_valid = bool(hosts)
+            intel.mx_checked_at = now
+            await _persist(db, intel)
+
+    _memory_put(intel, now)
+    return intel
+
+
+async def record_probe(
+    db: AsyncSession,
+    intel: DomainIntel,
+    *,
+    catch_all: bool | None = None,
+    smtp_blocked: bool | None = None,
+    pattern: str | None = None,
+) -> None:
+    """Store the outcome of SMTP probing for the domain."""
+    now = datetime.now(timezone.utc)
+    if catch_all is not None:
+        intel.has_catch_all = catch_all
+        intel.catch_all_checked_at = now
+    if smtp_blocked is not None:
+        intel.smtp_blocked = smtp_blocked
+        intel.smtp_checked_at = now
+    if pattern is not None:
+        intel.pattern = pattern
+    await _persist(db, intel)
+    _memory_put(intel, now)
@@ -1,13 +1,15 @@
 """Email builder — generate email permutations from name + domain.
 
 Checks email_patterns cache first. If we already know a domain's pattern,
-only generates that one permutation.
+only generates that one permutation; otherwise the inferred most likely
+pattern is the default.
 """
 
 import structlog
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.contacts.pattern_inference import infer_patterns
 from app.models.contact import Contact
 from app.models.email_pattern import EmailPattern
 
@@ -42,11 +44,13 @@ async def build_emails_for_contact(
     db: AsyncSession,
     contact: Contact,
     domain: str,
+    industry: str | None = None,
 ) -> str | None:
     """Generate and assign the best email for a contact.
 
     If we have a cached pattern for this domain, use only that.
-    Otherwise, generate all permutations — validation will pick the right one.
+    Otherwise, use the most likely pattern from ``pattern_inference`` —
+    validation will pick the right one.
     """
     if not contact.first_name or not contact.last_name or not domain:
         return None
@@ -67,10 +71,11 @@ async def build_emails_for_contact(
                 contact.email_status = "unverified"
                 return email
 
-    # No cached pattern — use most common format as default
+    # No cached pattern — use the most likely format for this domain / industry / TLD
     permutations = generate_email_permutations(contact.first_name, contact.last_name, domain)
     if permutations:
-        email, pattern = permutations[0]  # first.last is most common
+        inference = await infer_patterns(db, domain, industry)
+        email, pattern = inference.rank(permutations)[0]
         contact.email = email
         contact.email_pattern_used = pattern
         contact.email_status = "unverified"
@@ -6,26 +6,42 @@ Waterfall approach for maximum deliverability:
 3. SMTP verify ALL email permutations — first "accepted" wins
 4. Try multiple MX hosts if first is inconclusive
 5. Pattern intelligence fallback — use cached patterns if SMTP is blocked
-6. Default to first.last (statistically most common at ~60% of companies)
+6. Default to the most likely pattern (``pattern_inference``; first.last
+   when there is no evidence)
+
+Permutations are tried in order of inferred likelihood, and SMTP is skipped
+entirely when the domain's verified contacts make one pattern likely enough.
+
+All SMTP checks for a contact share one ``SmtpSession`` per MX host: the
+catch-all probe and the most likely permutation go in the first batch, the
+rest follow RCPT_GROUP_SIZE at a time on the same connection, stopping at
+the first accepted address. Small groups keep pipelining's round-trip
+savings without probing every permutation when an early one is accepted.
+
+MX hosts, catch-all status, SMTP blocking and the winning pattern are cached
+per domain (``domain_intel``), so later contacts at the same domain skip the
+MX lookup, the catch-all probe, or SMTP entirely.
 
 Status flow: unverified → valid / invalid / risky / failed
 """
 
-import asyncio
 import random
 import string
+from datetime import datetime, timezone
 
-import dns.resolver
 import structlog
-from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.contacts.domain_intel import get_domain_intel, record_probe, resolve_mx
 from app.contacts.email_builder import generate_email_permutations
+from app.contacts.pattern_inference import infer_patterns, record_verified_pattern
+from app.contacts.smtp_session import SmtpSession
 from app.models.contact import Contact
-from app.models.email_pattern import EmailPattern
 
 logger = structlog.get_logger()
 
+RCPT_GROUP_SIZE = 2  # Permutations pipelined per batch after the first
+
 
 async def validate_email(email: str) -> tuple[str, dict]:
     """Validate a single email address. Returns (status, details).
@@ -45,13 +61,16 @@ async def validate_email(email: str) -> tuple[str, dict]:
 
     details["mx_hosts"] = mx_hosts[:3]
 
-    # Step 2: SMTP verification
-    smtp_result = await _smtp_verify(email, mx_hosts[0])
+    # Step 2: SMTP verification + catch-all probe on one session
+    probe = _random_address(domain)
+    async with SmtpSession(mx_hosts[0]) as session:
+        results = await session.check([email, probe])
+    smtp_result = results[email]
     details["smtp_result"] = smtp_result
 
     if smtp_result == "accepted":
         # Step 3: Catch-all detection
-        is_catch_all = await _check_catch_all(domain, mx_hosts[0])
+        is_catch_all = results[probe] == "accepted"
         details["catch_all"] = is_catch_all
 
         if is_catch_all:
@@ -65,7 +84,7 @@ async def validate_email(email: str) -> tuple[str, dict]:
 
 
 async def waterfall_validate(
-    contact: Contact, domain: str, db: AsyncSession
+    contact: Contact, domain: str, db: AsyncSession, industry: str | None = None
 ) -> tuple[str, str | None, str | None]:
     """Waterfall email validation: try all permutations until one works.
 
@@ -74,54 +93,78 @@ async def waterfall_validate(
     if not contact.first_name or not contact.last_name or not domain:
         return "failed", None, None
 
+    now = datetime.now(timezone.utc)
+    intel = await get_domain_intel(db, domain)
+
     # Step 1: Quick MX check — skip domain entirely if no MX records
-    mx_hosts = await _check_mx(domain)
+    mx_hosts = intel.mx_hosts
     if not mx_hosts:
         logger.debug("waterfall.no_mx", domain=domain)
         return "invalid", None, None
 
-    # Step 2: Check for catch-all domain first (saves time)
-    is_catch_all = await _check_catch_all(domain, mx_hosts[0])
-    if is_catch_all:
-        # Domain accepts everything — check cached pattern or use first.last
-        cached_pattern = await _get_cached_pattern(db, domain)
-        permutations = generate_email_permutations(contact.first_name, contact.last_name, domain)
-
-        if cached_pattern:
-            for email, pattern_name in permutations:
-                if pattern_name == cached_pattern:
-                    return "risky", email, pattern_name
-
-        # Default to first.last for catch-all domains
-        if permutations:
-            return "risky", permutations[0][0], permutations[0][1]
-        return "risky", None, None
-
-    # Step 3: Generate all permutations and SMTP verify each one
     permutations = generate_email_permutations(contact.first_name, contact.last_name, domain)
 
-    # Try cached pattern first (most likely to succeed)
-    cached_pattern = await _get_cached_pattern(db, domain)
+    # Most likely pattern first: domain evidence, then industry / TLD priors
+    cached_pattern = intel.pattern
+    inference = await infer_patterns(db, domain, industry, known_pattern=cached_pattern)
+    permutations = inference.rank(permutations)
     if cached_pattern:
         permutations = _prioritize_pattern(permutations, cached_pattern)
 
-    consecutive_errors = 0
+    # Known catch-all: domain accepts everything — no probe needed
+    if intel.catch_all_known(now) and intel.has_catch_all:
+        return _catch_all_result(permutations)
 
-    for email, pattern_name in permutations:
-        # Try primary MX host
-        smtp_result = await _smtp_verify(email, mx_hosts[0])
+    # Known SMTP-blocked: every probe would be inconclusive
+    if intel.blocked(now):
+        logger.debug("waterfall.smtp_blocked_cached", domain=domain)
+        return _fallback_result(permutations, cached_pattern)
 
-        if smtp_result == "accepted":
-            # Winner! Cache this pattern for future contacts at this domain
-            await _update_pattern_cache(db, domain, pattern_name, {"catch_all": False})
-            logger.info("waterfall.valid", email=email, pattern=pattern_name)
-            return "valid", email, pattern_name
+    # Established pattern: probing would only confirm what we already know
+    if inference.confident:
+        pattern, probability = inference.best
+        for email, pattern_name in permutations:
+            if pattern_name == pattern:
+                logger.debug(
+                    "waterfall.pattern_inferred",
+                    email=email,
+                    pattern=pattern,
+                    probability=round(probability, 3),
+                )
+                return "unverified", email, pattern_name
 
-        elif smtp_result == "rejected":
-            consecutive_errors = 0
-            continue
+    async with SmtpSession(mx_hosts[0]) as primary, _LazySession(mx_hosts[1:2]) as backup:
+        # Step 2: Catch-all probe (unless already known) + most likely permutation in one batch
+        probe = None if intel.catch_all_known(now) else _random_address(domain)
+        first_batch = ([probe] if probe else []) + [email for email, _ in permutations[:1]]
+        results = await primary.check(first_batch)
+
+        if probe and results[probe] == "accepted":
+            await record_probe(db, intel, catch_all=True, smtp_blocked=False)
+            return _catch_all_result(permutations)
+
+        # Step 3: SMTP verify each permutation in order; first accepted wins
+        consecutive_errors = 0
+        learned_not_catch_all = probe is not None and results[probe] == "rejected"
+
+        for email, pattern_name in permutations:
+            if email not in results:
+                # Next few permutations, pipelined on the same session
+                group = [e for e, _ in permutations if e not in results][:RCPT_GROUP_SIZE]
+                results.update(await primary.check(group))
+            smtp_result = results[email]
+
+            if smtp_result == "accepted":
+                # Winner! Cache this pattern for future contacts at this domain
+                await record_probe(db, intel, catch_all=False, smtp_blocked=False, pattern=pattern_name)
+                record_verified_pattern(domain, industry, pattern_name)
+                logger.info("waterfall.valid", email=email, pattern=pattern_name)
+                return "valid", email, pattern_name
+
+            elif smtp_result == "rejected":
+                consecutive_errors = 0
+                continue
 
-        else:
             consecutive_errors += 1
             if consecutive_errors >= 2:
                 logger.debug(
@@ -129,29 +172,45 @@ async def waterfall_validate(
                     domain=domain,
                     consecutive_errors=consecutive_errors,
                 )
+                await record_probe(db, intel, smtp_blocked=True)
+                learned_not_catch_all = False
                 break
 
             # Try one backup MX host before moving on
-            if len(mx_hosts) > 1:
-                smtp_result = await _smtp_verify(email, mx_hosts[1])
+            if backup.available:
+                smtp_result = (await backup.check([email]))[email]
                 if smtp_result == "accepted":
-                    await _update_pattern_cache(db, domain, pattern_name, {"catch_all": False})
+                    await record_probe(db, intel, catch_all=False, smtp_blocked=False, pattern=pattern_name)
+                    record_verified_pattern(domain, industry, pattern_name)
                     logger.info("waterfall.valid_backup_mx", email=email, pattern=pattern_name)
                     return "valid", email, pattern_name
                 elif smtp_result == "rejected":
                     consecutive_errors = 0
-                    continue
 
-        await asyncio.sleep(0.5)
+        if learned_not_catch_all:
+            await record_probe(db, intel, catch_all=False, smtp_blocked=False)
+
+    return _fallback_result(permutations, cached_pattern)
+
+
+def _catch_all_result(permutations: list[tuple[str, str]]) -> tuple[str, str | None, str | None]:
+    """Catch-all domain: use the cached pattern (already first) or first.last."""
+    if permutations:
+        return "risky", permutations[0][0], permutations[0][1]
+    return "risky", None, None
 
-    # Step 4: All SMTP checks failed/inconclusive — pattern intelligence fallback
+
+def _fallback_result(
+    permutations: list[tuple[str, str]], cached_pattern: str | None
+) -> tuple[str, str | None, str | None]:
+    """All SMTP checks failed/inconclusive — pattern intelligence, then first.last."""
     if cached_pattern:
         for email, pattern_name in permutations:
             if pattern_name == cached_pattern:
                 logger.info("waterfall.pattern_fallback", email=email, pattern=pattern_name)
                 return "unverified", email, pattern_name
 
-    # Step 5: Default to first.last (statistically most common)
+    # Default to the most likely pattern (already first)
     if permutations:
         logger.info("waterfall.default_fallback", email=permutations[0][0])
         return "unverified", permutations[0][0], permutations[0][1]
@@ -173,103 +232,34 @@ def _prioritize_pattern(
     return prioritized + rest
 
 
-async def _get_cached_pattern(db: AsyncSession, domain: str) -> str | None:
-    """Look up cached email pattern for a domain."""
-    result = await db.execute(
-        select(EmailPattern).where(EmailPattern.domain == domain)
-    )
-    cached = result.scalar_one_or_none()
-    return cached.pattern if cached else None
-
-
 async def _check_mx(domain: str) -> list[str]:
     """Check MX records for a domain. Returns list of MX hosts."""
-    try:
-        loop = asyncio.get_event_loop()
-        answers = await loop.run_in_executor(
-            None, lambda: dns.resolver.resolve(domain, "MX")
-        )
-        hosts = sorted(answers, key=lambda x: x.preference)
-        return [str(r.exchange).rstrip(".") for r in hosts]
-    except Exception:
-        return []
+    hosts, _ = await resolve_mx(domain)
+    return hosts
 
 
-async def _smtp_verify(email: str, mx_host: str) -> str:
-    """Verify email via SMTP RCPT TO command.
-
-    Returns: accepted, rejected, or error
-    """
-    try:
-        reader, writer = await asyncio.wait_for(
-            asyncio.open_connection(mx_host, 25),
-            timeout=3.0,
-        )
-
-        # Read banner
-        await asyncio.wait_for(reader.readline(), timeout=3.0)
-
-        # EHLO
-        writer.write(b"EHLO disposight.com\r\n")
-        await writer.drain()
-        await asyncio.wait_for(reader.readline(), timeout=3.0)
-
-        # MAIL FROM
-        writer.write(b"MAIL FROM:<verify@disposight.com>\r\n")
-        await writer.drain()
-        response = await asyncio.wait_for(reader.readline(), timeout=3.0)
-
-        if not response.startswith(b"250"):
-            writer.close()
-            return "error"
-
-        # RCPT TO — the key check
-        writer.write(f"RCPT TO:<{email}>\r\n".encode())
-        await writer.drain()
-        response = await asyncio.wait_for(reader.readline(), timeout=3.0)
-
-        # Clean up
-        writer.write(b"QUIT\r\n")
-        await writer.drain()
-        writer.close()
-
-        if response.startswith(b"250"):
-            return "accepted"
-        elif response.startswith((b"550", b"551", b"552", b"553")):
-            return "rejected"
-        return "error"
-
-    except Exception as e:
-        logger.debug("smtp.verify_failed", email=email, error=str(e))
-        return "error"
-
-
-async def _check_catch_all(domain: str, mx_host: str) -> bool:
-    """Test if domain is catch-all by sending to a random address."""
+def _random_address(domain: str) -> str:
+    """An address that should not exist — accepted only by catch-all domains."""
     random_user = "".join(random.choices(string.ascii_lowercase, k=12))
-    random_email = f"{random_user}@{domain}"
-    result = await _smtp_verify(random_email, mx_host)
-    return result == "accepted"
-
-
-async def _update_pattern_cache(
-    db: AsyncSession, domain: str, pattern: str, details: dict
-) -> None:
-    """Cache the email pattern for a domain."""
-    result = await db.execute(
-        select(EmailPattern).where(EmailPattern.domain == domain)
-    )
-    existing = result.scalar_one_or_none()
-
-    if existing:
-        existing.pattern = pattern
-        existing.mx_valid = True
-        existing.has_catch_all = details.get("catch_all", False)
-    else:
-        ep = EmailPattern(
-            domain=domain,
-            pattern=pattern,
-            mx_valid=True,
-            has_catch_all=details.get("catch_all", False),
-        )
-        db.add(ep)
+    return f"{random_user}@{domain}"
+
+
+class _LazySession:
+    """Backup-MX session that only connects if it is actually used."""
+
+    def __init__(self, hosts: list[str]):
+        self._session = SmtpSession(hosts[0]) if hosts else None
+
+    @property
+    def available(self) -> bool:
+        return self._session is not None
+
+    async def check(self, emails: list[str]) -> dict[str, str]:
+        return await self._session.check(emails)
+
+    async def __aenter__(self) -> "_LazySession":
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        if self._session is not None:
+            await self._session.close()
@@ -0,0 +1,149 @@
+"""Background contact discovery jobs.
+
+``POST /contacts/{company_id}/find`` enqueues ``discover_company_contacts`` on
+the arq worker instead of running scrape → extract → validate inside the
+request. The arq job id is derived from the company, so duplicate requests
+coalesce onto the job that is already queued or running.
+
+The job publishes its stage (queued → scraping → extracting → validating →
+done | failed) to a short-lived Redis hash read by the status endpoint, and
+commits after every stage so contacts appear as soon as they are found.
+"""
+
+from datetime import datetime, timezone
+from uuid import UUID
+
+import structlog
+from redis.exceptions import RedisError
+
+from app.contacts.contact_finder import ProgressCallback
+from app.contacts.pipeline import get_or_discover_contacts
+from app.core.jobs import get_job_pool
+from app.core.redis import get_redis
+from app.db.session import async_session_factory
+from app.models.company import Company
+
+logger = structlog.get_logger()
+
+DISCOVERY_JOB = "discover_company_contacts"
+PROGRESS_TTL_SECONDS = 3600
+ACTIVE_STATES = frozenset({"queued", "scraping", "extracting", "validating"})
+
+
+def discovery_job_id(company_id: UUID | str) -> str:
+    return f"contacts:discover:{company_id}"
+
+
+def _progress_key(company_id: UUID | str) -> str:
+    return f"contacts:progress:{company_id}"
+
+
+async def set_progress(company_id: UUID | str, state: str, replace: bool = False, **fields) -> None:
+    """Publish the job's current stage; best effort. ``replace`` drops earlier fields."""
+    redis = get_redis()
+    if redis is None:
+        return
+    mapping = {"state": state, "updated_at": datetime.now(timezone.utc).isoformat()}
+    mapping.update({k: str(v) for k, v in fields.items() if v is not None})
+    try:
+        key = _progress_key(company_id)
+        pipe = redis.pipeline(transaction=True)
+        if replace:
+            pipe.delete(key)
+        pipe.hset(key, mapping=mapping)
+        pipe.expire(key, PROGRESS_TTL_SECONDS)
+        await pipe.execute()
+    except RedisError as e:
+        logger.warning("contacts.progress_write_failed", company_id=str(company_id), error=str(e))
+
+
+async def clear_progress(company_id: UUID | str) -> None:
+    """Forget the job's progress; best effort."""
+    redis = get_redis()
+    if redis is None:
+        return
+    try:
+        await redis.delete(_progress_key(company_id))
+    except RedisError as e:
+        logger.warning("contacts.progress_write_failed", company_id=str(company_id), error=str(e))
+
+
+async def get_progress(company_id: UUID | str) -> dict[str, str] | None:
+    """The last published stage for a company's discovery job, if any."""
+    redis = get_redis()
+    if redis is None:
+        return None
+    try:
+        raw = await redis.hgetall(_progress_key(company_id))
+    except RedisError as e:
+        logger.warning("contacts.progress_read_failed", company_id=str(company_id), error=str(e))
+        return None
+    if not raw:
+        return None
+    return {
+        (k.decode() if isinstance(k, bytes) else k): (v.decode() if isinstance(v, bytes) else v)
+        for k, v in raw.items()
+    }
+
+
+async def queue_discovery(company_id: UUID, **job_kwargs) -> bool:
+    """Queue discovery for a company; False if a job for it is already in flight.
+
+    Raises ``RedisError`` / ``OSError`` when the queue is unreachable; the
+    "queued" state is withdrawn first so callers falling back to an inline
+    run are not reported as pending.
+    """
+    progress = await get_progress(company_id)
+    if progress and progress.get("state") in ACTIVE_STATES:
+        return False
+
+    # Written before enqueueing so it cannot overwrite a fast worker's first stage
+    await set_progress(company_id, "queued", replace=True)
+    try:
+        pool = await get_job_pool()
+        # None means arq already holds a job with this id
+        job = await pool.enqueue_job(
+            DISCOVERY_JOB, str(company_id), _job_id=discovery_job_id(company_id), **job_kwargs
+        )
+    except (RedisError, OSError):
+        await clear_progress(company_id)
+        raise
+    return job is not None
+
+
+async def enqueue_discovery(company_id: UUID) -> str:
+    """Queue discovery for a company, or join the job already in flight.
+
+    Raises ``RedisError`` / ``OSError`` when the queue is unreachable.
+    """
+    await queue_discovery(company_id)
+    return discovery_job_id(company_id)
+
+
+async def run_discovery_job(company_id: str, on_progress: ProgressCallback | None = None) -> dict:
+    """Worker body: run the pipeline, committing and reporting at each stage."""
+    async with async_session_factory() as db:
+        company = await db.get(Company, UUID(company_id))
+        if company is None:
+            await set_progress(company_id, "failed", error="company_not_found")
+            return {"company_id": company_id, "contacts": 0}
+
+        async def checkpoint(state: str, **counts) -> None:
+            # Persist what we have so far; the status endpoint reads it back
+            await db.commit()
+            await set_progress(company_id, state, **counts)
+            if on_progress is not None:
+                await on_progress(state, **counts)
+
+        try:
+            contacts = await get_or_discover_contacts(db, company, on_progress=checkpoint)
+            await db.commit()
+        except Exception as e:
+            await db.rollback()
+            await set_progress(company_id, "failed", error=type(e).__name__)
+            logger.error("contacts.job_failed", company_id=company_id, error=str(e))
+            raise
+
+    await set_progress(company_id, "done", found=len(contacts))
+    logger.info("contacts.job_complete", company_id=company_id, count=len(contacts))
+    return {"company_id": company_id, "contacts": len(contacts)}
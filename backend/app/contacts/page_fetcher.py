@@ -0,0 +1,178 @@
+"""Concurrent team-page fetcher for contact discovery.
+
+Fetches a company's candidate team/about pages in parallel over one shared,
+pooled HTTP/2 client, at most ``PER_DOMAIN_CONCURRENCY`` requests at a time
+per domain. Paths are tried in order of how often they have produced usable
+text, and outstanding fetches are cancelled as soon as enough text has been
+collected, the overall deadline passes, or the domain turns out to be
+unreachable.
+"""
+
+import asyncio
+import time
+from dataclasses import dataclass, field
+
+import httpx
+import structlog
+from bs4 import BeautifulSoup
+
+from app.core.blocking import run_blocking
+
+logger = structlog.get_logger()
+
+USER_AGENT = "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36"
+PAGE_TIMEOUT = 5.0
+FETCH_DEADLINE = 12.0
+PER_DOMAIN_CONCURRENCY = 6
+MAX_CHARS = 5000
+MIN_PAGE_CHARS = 100
+
+try:
+    import lxml  # noqa: F401
+
+    _PARSER = "lxml"
+except ImportError:
+    _PARSER = "html.parser"
+
+try:
+    import h2  # noqa: F401
+
+    _HTTP2 = True
+except ImportError:
+    _HTTP2 = False
+
+_client: httpx.AsyncClient | None = None
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """Return the process-wide pooled client used for website scraping."""
+    global _client
+    if _client is None:
+        _client = httpx.AsyncClient(
+            http2=_HTTP2,
+            timeout=httpx.Timeout(PAGE_TIMEOUT, connect=3.0),
+            follow_redirects=True,
+            verify=False,
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=20, keepalive_expiry=15),
+            headers={"User-Agent": USER_AGENT},
+        )
+    return _client
+
+
+async def close_http_client() -> None:
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+
+def html_to_text(html: str) -> str:
+    """Visible page text with scripts, styles, nav and footer removed."""
+    soup = BeautifulSoup(html, _PARSER)
+    for tag in soup(["script", "style", "nav", "footer"]):
+        tag.decompose()
+    return soup.get_text(separator=" ", strip=True)
+
+
+@dataclass
+class PathStats:
+    """How often each path has yielded usable text, across all companies."""
+
+    attempts: dict[str, int] = field(default_factory=dict)
+    hits: dict[str, int] = field(default_factory=dict)
+
+    def record(self, path: str, hit: bool) -> None:
+        self.attempts[path] = self.attempts.get(path, 0) + 1
+        if hit:
+            self.hits[path] = self.hits.get(path, 0) + 1
+
+    def hit_rate(self, path: str) -> float:
+        # Laplace-smoothed so untried paths start at 0.5
+        return (self.hits.get(path, 0) + 1) / (self.attempts.get(path, 0) + 2)
+
+    def rank(self, paths: list[str]) -> list[str]:
+        """Most productive first; ties keep the given order."""
+        order = {p: i for i, p in enumerate(paths)}
+        return sorted(paths, key=lambda p: (-self.hit_rate(p), order[p]))
+
+
+path_stats = PathStats()
+
+
+async def _fetch_text(client: httpx.AsyncClient, url: str, semaphore: asyncio.Semaphore) -> str:
+    async with semaphore:
+        response = await client.get(url)
+    if response.status_code != 200:
+        return ""
+    return await run_blocking(html_to_text, response.text)
+
+
+async def fetch_pages(
+    base_url: str,
+    paths: list[str],
+    max_chars: int = MAX_CHARS,
+    concurrency: int = PER_DOMAIN_CONCURRENCY,
+    deadline: float = FETCH_DEADLINE,
+    client: httpx.AsyncClient | None = None,
+    stats: PathStats | None = None,
+) -> str:
+    """Fetch ``paths`` under ``base_url`` concurrently and return their combined text.
+
+    Each page with more than MIN_PAGE_CHARS of text is appended as
+    ``--- path ---`` sections in completion order. Returns as soon as
+    ``max_chars`` are collected, cancelling whatever is still in flight.
+    """
+    client = client or get_http_client()
+    stats = stats or path_stats
+    semaphore = asyncio.Semaphore(concurrency)
+    started = time.monotonic()
+
+    tasks = {
+        asyncio.create_task(_fetch_text(client, f"{base_url}{path}", semaphore)): path
+        for path in stats.rank(paths)
+    }
+    all_text = ""
+    pending = set(tasks)
+    unreachable = False
+    try:
+        while pending and not unreachable and len(all_text) <= max_chars:
+            remaining = deadline - (time.monotonic() - started)
+            if remaining <= 0:
+                logger.info("contacts.fetch_deadline", base_url=base_url, pending=len(pending))
+                break
+            done, pending = await asyncio.wait(pending, timeout=remaining, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                path = tasks[task]
+                try:
+                    text = task.result()
+                except httpx.ConnectError:
+                    # DNS failure / refused connection: every other path will fail the same way
+                    stats.record(path, False)
+                    unreachable = True
+                    continue
+                except Exception:
+                    stats.record(path, False)
+                    continue
+
+                hit = len(text) > MIN_PAGE_CHARS
+                stats.record(path, hit)
+                if hit:
+                    all_text += f"\n\n--- {path} ---\n{text}"
+    finally:
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+
+    if unreachable and not all_text:
+        logger.info("contacts.domain_unreachable", base_url=base_url)
+    return all_text[:max_chars]
+
+
+async def fetch_page_text(url: str, client: httpx.AsyncClient | None = None) -> str:
+    """Text of a single page ("" on any error or non-200)."""
+    client = client or get_http_client()
+    try:
+        return await _fetch_text(client, url, asyncio.Semaphore(1))
+    except Exception:
+        return ""
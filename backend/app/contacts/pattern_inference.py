@@ -0,0 +1,174 @@
+"""Statistical email-pattern inference.
+
+Learns how likely each permutation pattern is from every SMTP-verified
+contact we hold, so the waterfall probes the most likely address first and
+can skip SMTP altogether once a domain's pattern is well established.
+
+Estimates are hierarchical: a base prior, refined by counts for the
+domain's TLD, then by counts for the company's industry, then by the
+domain's own verified contacts. Each level is a Dirichlet-smoothed mix of
+its own counts and the level above, so sparse levels fall back gracefully.
+"""
+
+import time
+from collections import Counter, defaultdict
+from dataclasses import dataclass, field
+
+import structlog
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.models.company import Company
+from app.models.contact import Contact
+
+logger = structlog.get_logger()
+
+# Rough share of each pattern across company domains, before any evidence
+BASE_PRIOR = {
+    "first.last": 0.40,
+    "flast": 0.20,
+    "first": 0.12,
+    "firstlast": 0.08,
+    "f.last": 0.06,
+    "last": 0.05,
+    "first.l": 0.05,
+    "last.first": 0.04,
+}
+
+# Pseudo-counts: how much each level defers to the one above it
+GLOBAL_WEIGHT = 20.0
+TLD_WEIGHT = 10.0
+INDUSTRY_WEIGHT = 10.0
+DOMAIN_WEIGHT = 1.0
+
+MIN_DOMAIN_EVIDENCE = 2  # Never skip SMTP on priors alone
+MODEL_TTL_SECONDS = 3600
+
+
+def _tld(domain: str) -> str:
+    return domain.rsplit(".", 1)[-1].lower()
+
+
+def _industry_key(industry: str | None) -> str | None:
+    return industry.strip().lower() if industry and industry.strip() else None
+
+
+def _smooth(counts: Counter, prior: dict[str, float], weight: float) -> dict[str, float]:
+    total = sum(counts.values())
+    return {p: (counts.get(p, 0) + weight * q) / (total + weight) for p, q in prior.items()}
+
+
+@dataclass
+class PatternInference:
+    probabilities: dict[str, float]
+    domain_evidence: int
+
+    @property
+    def best(self) -> tuple[str, float]:
+        return max(self.probabilities.items(), key=lambda item: item[1])
+
+    @property
+    def confident(self) -> bool:
+        """True when the top pattern is likely enough to skip SMTP probing."""
+        return (
+            self.domain_evidence >= MIN_DOMAIN_EVIDENCE
+            and self.best[1] >= settings.pattern_skip_smtp_confidence
+        )
+
+    def rank(self, permutations: list[tuple[str, str]]) -> list[tuple[str, str]]:
+        """Order (email, pattern) permutations from most to least likely."""
+        return sorted(permutations, key=lambda item: -self.probabilities.get(item[1], 0.0))
+
+
+@dataclass
+class PatternModel:
+    """Verified-pattern counts by domain, industry and TLD."""
+
+    by_domain: dict[str, Counter] = field(default_factory=lambda: defaultdict(Counter))
+    by_industry: dict[str, Counter] = field(default_factory=lambda: defaultdict(Counter))
+    by_tld: dict[str, Counter] = field(default_factory=lambda: defaultdict(Counter))
+    overall: Counter = field(default_factory=Counter)
+
+    def observe(self, domain: str, industry: str | None, pattern: str, count: int = 1) -> None:
+        if pattern not in BASE_PRIOR:
+            return
+        domain = domain.lower()
+        self.by_domain[domain][pattern] += count
+        self.by_tld[_tld(domain)][pattern] += count
+        if key := _industry_key(industry):
+            self.by_industry[key][pattern] += count
+        self.overall[pattern] += count
+
+    def infer(
+        self, domain: str, industry: str | None = None, known_pattern: str | None = None
+    ) -> PatternInference:
+        domain = domain.lower()
+        prior = _smooth(self.overall, BASE_PRIOR, GLOBAL_WEIGHT)
+        prior = _smooth(self.by_tld.get(_tld(domain), Counter()), prior, TLD_WEIGHT)
+        if key := _industry_key(industry):
+            prior = _smooth(self.by_industry.get(key, Counter()), prior, INDUSTRY_WEIGHT)
+
+        evidence = Counter(self.by_domain.get(domain, Counter()))
+        # A pattern cached for the domain without contacts behind it still counts once
+        if not evidence and known_pattern in BASE_PRIOR:
+            evidence[known_pattern] = 1
+        return PatternInference(
+            probabilities=_smooth(evidence, prior, DOMAIN_WEIGHT),
+            domain_evidence=sum(evidence.values()),
+        )
+
+
+_model: PatternModel | None = None
+_loaded_at = 0.0
+
+
+async def load_pattern_model(db: AsyncSession) -> PatternModel:
+    """Build the model from every SMTP-verified contact."""
+    result = await db.execute(
+        select(Company.domain, Company.industry, Contact.email_pattern_used, func.count())
+        .join(Company, Contact.company_id == Company.id)
+        .where(
+            Contact.email_status == "valid",
+            Contact.email_pattern_used.is_not(None),
+            Company.domain.is_not(None),
+        )
+        .group_by(Company.domain, Company.industry, Contact.email_pattern_used)
+    )
+    model = PatternModel()
+    for domain, industry, pattern, count in result.all():
+        model.observe(domain, industry, pattern, count)
+    logger.debug(
+        "pattern_inference.model_loaded",
+        domains=len(model.by_domain),
+        contacts=sum(model.overall.values()),
+    )
+    return model
+
+
+async def get_pattern_model(db: AsyncSession) -> PatternModel:
+    """Process-wide model, rebuilt from the database at most once per TTL."""
+    global _model, _loaded_at
+    if _model is None or time.monotonic() - _loaded_at > MODEL_TTL_SECONDS:
+        _model = await load_pattern_model(db)
+        _loaded_at = time.monotonic()
+    return _model
+
+
+def record_verified_pattern(domain: str, industry: str | None, pattern: str) -> None:
+    """Count a fresh SMTP verification before the next model rebuild picks it up."""
+    if _model is not None:
+        _model.observe(domain, industry, pattern)
+
+
+async def infer_patterns(
+    db: AsyncSession, domain: str, industry: str | None = None, known_pattern: str | None = None
+) -> PatternInference:
+    model = await get_pattern_model(db)
+    return model.infer(domain, industry, known_pattern)
+
+
+def reset_pattern_model() -> None:
+    global _model, _loaded_at
+    _model = None
+    _loaded_at = 0.0
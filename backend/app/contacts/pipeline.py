@@ -6,7 +6,7 @@ import structlog
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.contacts.contact_finder import find_contacts_for_company
+from app.contacts.contact_finder import ProgressCallback, find_contacts_for_company
 from app.contacts.email_builder import build_emails_for_contact
 from app.contacts.email_validator import waterfall_validate
 from app.models.company import Company
@@ -15,23 +15,28 @@ from app.models.contact import Contact
 logger = structlog.get_logger()
 
 
-async def discover_contacts(db: AsyncSession, company: Company) -> list[Contact]:
+async def discover_contacts(
+    db: AsyncSession, company: Company, on_progress: ProgressCallback | None = None
+) -> list[Contact]:
     """Run the full contact discovery pipeline for a company.
 
     1. Scrape website for leadership contacts (with phones from AI)
     2. Build email addresses for each contact
     3. Validate emails via MX/SMTP waterfall
     4. Keep top 5 by decision_maker_score
+
+    ``on_progress`` is awaited at each stage and after every validated
+    contact; background jobs use it to commit and publish progress.
     """
     if not company.domain:
         return []
 
-    # Mark as attempted at the START to prevent concurrent runs
-    company.contacts_found_at = datetime.now(timezone.utc)
-
-    # Step 1: Find contacts from website
-    contacts = await find_contacts_for_company(db, company)
+    # Step 1: Find contacts from website. Progress callbacks may commit, so the
+    # attempt is only recorded once discovery has finished; concurrent runs are
+    # prevented by the job id instead.
+    contacts = await find_contacts_for_company(db, company, on_progress)
     if not contacts:
+        company.contacts_found_at = datetime.now(timezone.utc)
         await db.flush()
         return []
 
@@ -39,12 +44,16 @@ async def discover_contacts(db: AsyncSession, company: Company) -> list[Contact]
     smtp_blocked = False  # Track whether SMTP is blocked for this domain
 
     # Step 2 & 3: Build and validate emails for each contact
-    for contact in contacts:
+    if on_progress is not None:
+        await on_progress("validating", found=len(contacts), validated=0)
+    for i, contact in enumerate(contacts, start=1):
         if contact.first_name and contact.last_name:
-            await build_emails_for_contact(db, contact, domain)
+            await build_emails_for_contact(db, contact, domain, company.industry)
 
             if not smtp_blocked:
-                status, winning_email, pattern_used = await waterfall_validate(contact, domain, db)
+                status, winning_email, pattern_used = await waterfall_validate(
+                    contact, domain, db, industry=company.industry
+                )
                 contact.email_status = status
                 if winning_email and winning_email != contact.email:
                     contact.email = winning_email
@@ -54,10 +63,14 @@ async def discover_contacts(db: AsyncSession, company: Company) -> list[Contact]
                 if status == "unverified":
                     smtp_blocked = True
 
+        if on_progress is not None:
+            await on_progress("validating", found=len(contacts), validated=i)
+
     # Step 4: Sort by score, keep top 5
     contacts.sort(key=lambda c: c.decision_maker_score or 0, reverse=True)
     contacts = contacts[:5]
 
+    company.contacts_found_at = datetime.now(timezone.utc)
     await db.flush()
 
     logger.info(
@@ -70,7 +83,9 @@ async def discover_contacts(db: AsyncSession, company: Company) -> list[Contact]
     return contacts
 
 
-async def get_or_discover_contacts(db: AsyncSession, company: Company) -> list[Contact]:
+async def get_or_discover_contacts(
+    db: AsyncSession, company: Company, on_progress: ProgressCallback | None = None
+) -> list[Contact]:
     """Get cached contacts or run discovery pipeline.
 
     1. Check DB for existing contacts
@@ -95,4 +110,4 @@ async def get_or_discover_contacts(db: AsyncSession, company: Company) -> list[C
         return []
 
     # Run discovery
-    return await discover_contacts(db, company)
+    return await discover_contacts(db, company, on_progress)
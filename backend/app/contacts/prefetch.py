@@ -0,0 +1,235 @@
+"""Off-peak contact prefetch for the highest-ranked opportunities.
+
+Discovery normally waits for a rep to click "find". This job runs it ahead
+of time for the top opportunities by deal score that have a domain and
+have never been searched, so the most valuable companies already have
+contacts when reps open them.
+
+Prefetched companies are queued as the same per-company discovery job a
+rep's click uses, so a click during prefetch joins that job instead of
+starting a second run.
+
+Work is metered against hourly budgets kept in Redis — LLM extraction calls
+and SMTP RCPT probes — shared by every worker. A company's worst case is
+reserved when its job is queued. The job returns what it did not use once
+it finishes.
+
+A failed discovery leaves ``contacts_found_at`` unset, so the company would
+rank first again on every run. Prefetch failures are counted per company
+and a company is skipped after MAX_PREFETCH_FAILURES of them; a rep's click
+still runs it.
+"""
+
+from datetime import datetime, timedelta, timezone
+from uuid import UUID
+
+import structlog
+from redis.exceptions import RedisError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.contacts.jobs import queue_discovery, run_discovery_job
+from app.contacts.smtp_session import ProbeMeter, probe_meter
+from app.core.redis import get_redis
+from app.db.session import async_session_factory
+from app.models.company import Company
+from app.models.signal import Signal
+from app.processing.deal_aggregates import deal_score_aggregates, deal_score_from_row
+
+logger = structlog.get_logger()
+
+LOOKBACK = timedelta(days=90)
+# Worst case per company: team-page extraction + homepage fallback;
+# five contacts x (eight permutations + catch-all probe)
+LLM_CALLS_PER_COMPANY = 2
+SMTP_PROBES_PER_COMPANY = 45
+BUDGET_KEY_TTL_SECONDS = 2 * 3600
+MAX_PREFETCH_FAILURES = 2
+FAILURE_KEY_TTL_SECONDS = 7 * 24 * 3600
+
+
+class HourlyBudget:
+    """A per-clock-hour allowance shared through a Redis counter."""
+
+    def __init__(self, redis, resource: str, limit: int):
+        self.redis = redis
+        self.resource = resource
+        self.limit = limit
+
+    def _key(self, hour: str | None = None) -> str:
+        return f"prefetch:budget:{self.resource}:{hour or budget_hour()}"
+
+    async def remaining(self) -> int:
+        used = await self.redis.get(self._key())
+        return self.limit - int(used or 0)
+
+    async def charge(self, amount: int, hour: str | None = None) -> None:
+        """Add ``amount`` to the hour's usage; negative amounts give budget back."""
+        if amount == 0:
+            return
+        key = self._key(hour)
+        pipe = self.redis.pipeline(transaction=True)
+        pipe.incrby(key, amount)
+        pipe.expire(key, BUDGET_KEY_TTL_SECONDS)
+        await pipe.execute()
+
+
+def budget_hour(now: datetime | None = None) -> str:
+    now = now or datetime.now(timezone.utc)
+    return f"{now:%Y%m%d%H}"
+
+
+def _failures_key(company_id: UUID | str) -> str:
+    return f"prefetch:failures:{company_id}"
+
+
+async def without_repeat_failures(redis, ranked: list[tuple[UUID, int]]) -> list[tuple[UUID, int]]:
+    """Drop companies whose prefetched discovery failed MAX_PREFETCH_FAILURES times."""
+    if not ranked:
+        return ranked
+    counts = await redis.mget([_failures_key(company_id) for company_id, _ in ranked])
+    return [
+        candidate for candidate, failures in zip(ranked, counts)
+        if int(failures or 0) < MAX_PREFETCH_FAILURES
+    ]
+
+
+async def _record_outcome(redis, company_id: str, failed: bool) -> None:
+    key = _failures_key(company_id)
+    try:
+        if not failed:
+            await redis.delete(key)
+            return
+        pipe = redis.pipeline(transaction=True)
+        pipe.incrby(key, 1)
+        pipe.expire(key, FAILURE_KEY_TTL_SECONDS)
+        await pipe.execute()
+    except RedisError as e:
+        logger.warning("contacts.prefetch_outcome_unrecorded", company_id=company_id, error=str(e))
+
+
+def _budgets(redis) -> tuple[HourlyBudget, HourlyBudget]:
+    return (
+        HourlyBudget(redis, "llm", settings.contact_prefetch_llm_per_hour),
+        HourlyBudget(redis, "smtp", settings.contact_prefetch_smtp_per_hour),
+    )
+
+
+def rank_candidates(rows, now: datetime) -> list[tuple[UUID, int]]:
+    """(company_id, deal_score) for aggregated signal rows, best first."""
+    scored = [(row.company_id, deal_score_from_row(row, now).score) for row in rows]
+    scored.sort(key=lambda item: item[1], reverse=True)
+    return scored
+
+
+async def select_prefetch_candidates(db: AsyncSession) -> list[tuple[UUID, int]]:
+    """Never-searched companies with a domain, best deal score first."""
+    now = datetime.now(timezone.utc)
+    result = await db.execute(
+        deal_score_aggregates().where(
+            Signal.device_estimate.isnot(None),
+            Company.normalized_name != "unknown",
+            Company.domain.isnot(None),
+            Company.domain != "",
+            Company.contacts_found_at.is_(None),
+            Company.last_signal_at >= now - LOOKBACK,
+        )
+    )
+    return rank_candidates(result.all(), now)
+
+
+async def prefetch_contacts(limit: int | None = None) -> dict:
+    """Queue discovery for the top opportunities until the hourly budget runs out."""
+    redis = get_redis()
+    if redis is None:
+        # Budgets are shared through Redis; without it there is no safe cap
+        return {"skipped": "no_redis"}
+
+    llm_budget, smtp_budget = _budgets(redis)
+
+    async with async_session_factory() as db:
+        ranked = await select_prefetch_candidates(db)
+    try:
+        ranked = await without_repeat_failures(redis, ranked)
+    except RedisError as e:
+        logger.warning("contacts.prefetch_redis_unavailable", error=str(e))
+        return {"skipped": "redis_unavailable"}
+    candidates = ranked[: limit or settings.contact_prefetch_batch]
+
+    stats = {"candidates": len(candidates), "queued": 0, "skipped": 0}
+    for company_id, deal_score in candidates:
+        try:
+            if (
+                await llm_budget.remaining() < LLM_CALLS_PER_COMPANY
+                or await smtp_budget.remaining() < SMTP_PROBES_PER_COMPANY
+            ):
+                stats["budget_exhausted"] = True
+                break
+        except RedisError as e:
+            logger.warning("contacts.prefetch_budget_unavailable", error=str(e))
+            break
+
+        hour = budget_hour()
+        try:
+            await llm_budget.charge(LLM_CALLS_PER_COMPANY, hour)
+            await smtp_budget.charge(SMTP_PROBES_PER_COMPANY, hour)
+            queued = await queue_discovery(company_id, budget_hour=hour)
+        except (RedisError, OSError) as e:
+            logger.warning(
+                "contacts.prefetch_enqueue_failed", company_id=str(company_id), error=str(e)
+            )
+            await _release(llm_budget, smtp_budget, hour, 0, 0)
+            break
+
+        if not queued:
+            # A rep's click already queued or started this company's job
+            await _release(llm_budget, smtp_budget, hour, 0, 0)
+            stats["skipped"] += 1
+            continue
+
+        stats["queued"] += 1
+        logger.debug("contacts.prefetch_queued", company_id=str(company_id), deal_score=deal_score)
+
+    logger.info("contacts.prefetch_complete", **stats)
+    return stats
+
+
+async def _release(
+    llm_budget: HourlyBudget, smtp_budget: HourlyBudget, hour: str, llm_calls: int, smtp_probes: int
+) -> None:
+    """Swap a company's worst-case reservation for what it actually used."""
+    try:
+        await llm_budget.charge(llm_calls - LLM_CALLS_PER_COMPANY, hour)
+        await smtp_budget.charge(smtp_probes - SMTP_PROBES_PER_COMPANY, hour)
+    except RedisError as e:
+        logger.warning("contacts.prefetch_charge_failed", error=str(e))
+
+
+async def run_prefetch_job(company_id: str, hour: str) -> dict:
+    """Worker body for a prefetched discovery: run it metered, then settle its reservation."""
+    llm_calls = 0
+
+    async def count_llm_calls(state: str, **counts) -> None:
+        nonlocal llm_calls
+        if state == "extracting":
+            llm_calls += 1
+
+    meter = ProbeMeter()
+    token = probe_meter.set(meter)
+    failed = True
+    try:
+        result = await run_discovery_job(company_id, on_progress=count_llm_calls)
+        failed = False
+        return result
+    finally:
+        probe_meter.reset(token)
+        redis = get_redis()
+        if redis is not None:
+            await _release(*_budgets(redis), hour, llm_calls, meter.rcpts)
+            await _record_outcome(redis, company_id, failed)
+        logger.debug(
+            "contacts.prefetched",
+            company_id=company_id,
+            llm_calls=llm_calls,
+            smtp_probes=meter.rcpts,
+        )
@@ -0,0 +1,175 @@
+"""Reusable SMTP verification session.
+
+One connection per MX host: banner and EHLO happen once, then any number of
+``check`` batches each run MAIL FROM + one RCPT TO per address + RSET on the
+same session. When the server advertises PIPELINING the RCPT commands of a
+batch are written in one go and their replies read back in order (RFC 2920).
+A connection that drops mid-session is re-opened once. A host that cannot
+be reached or refuses the session is marked ``unreachable`` and every later
+check on it reports "error" without touching the network.
+
+Results per address: accepted (250/251), rejected (550-553) or error.
+"""
+
+import asyncio
+from contextvars import ContextVar
+from dataclasses import dataclass
+
+import structlog
+
+logger = structlog.get_logger()
+
+SMTP_PORT = 25
+HELO_DOMAIN = "disposight.com"
+MAIL_FROM = "verify@disposight.com"
+REJECT_CODES = frozenset({550, 551, 552, 553})
+
+
+@dataclass
+class ProbeMeter:
+    """Counts RCPT probes sent, for jobs that spend SMTP against a budget."""
+
+    rcpts: int = 0
+
+
+probe_meter: ContextVar[ProbeMeter | None] = ContextVar("smtp_probe_meter", default=None)
+
+
+class SmtpReplyError(Exception):
+    """Unexpected reply to a session-level command (EHLO/MAIL FROM/RSET)."""
+
+
+def classify_rcpt(code: int) -> str:
+    if code in (250, 251):
+        return "accepted"
+    if code in REJECT_CODES:
+        return "rejected"
+    return "error"
+
+
+class SmtpSession:
+    """A single SMTP connection used to verify many recipients."""
+
+    def __init__(self, mx_host: str, port: int | None = None, timeout: float = 3.0, connect_timeout: float = 3.0):
+        self.mx_host = mx_host
+        self.port = port or SMTP_PORT
+        self.timeout = timeout
+        self.connect_timeout = connect_timeout
+        self.extensions: set[str] = set()
+        self.connections = 0
+        self.unreachable = False
+        self._reader: asyncio.StreamReader | None = None
+        self._writer: asyncio.StreamWriter | None = None
+
+    @property
+    def connected(self) -> bool:
+        return self._writer is not None and not self._writer.is_closing()
+
+    @property
+    def pipelining(self) -> bool:
+        return "PIPELINING" in self.extensions
+
+    async def __aenter__(self) -> "SmtpSession":
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        await self.close()
+
+    async def _read_reply(self) -> tuple[int, list[str]]:
+        """Read one (possibly multi-line, ``250-...``) reply."""
+        lines: list[str] = []
+        while True:
+            raw = await asyncio.wait_for(self._reader.readline(), timeout=self.timeout)
+            if not raw:
+                raise ConnectionError("connection closed by server")
+            line = raw.decode("utf-8", "replace").rstrip("\r\n")
+            lines.append(line[4:])
+            if len(line) < 4 or line[3] != "-":
+                try:
+                    return int(line[:3]), lines
+                except ValueError as e:
+                    raise SmtpReplyError(f"malformed reply: {line!r}") from e
+
+    async def _command(self, command: str) -> tuple[int, list[str]]:
+        self._writer.write(f"{command}\r\n".encode())
+        await self._writer.drain()
+        return await self._read_reply()
+
+    async def connect(self) -> None:
+        self._reader, self._writer = await asyncio.wait_for(
+            asyncio.open_connection(self.mx_host, self.port),
+            timeout=self.connect_timeout,
+        )
+        self.connections += 1
+        code, _ = await self._read_reply()
+        if code != 220:
+            raise SmtpReplyError(f"banner {code}")
+
+        code, lines = await self._command(f"EHLO {HELO_DOMAIN}")
+        if code == 250:
+            # First line is the greeting, the rest are extension keywords
+            self.extensions = {line.split(" ", 1)[0].upper() for line in lines[1:] if line}
+        else:
+            self.extensions = set()
+            code, _ = await self._command(f"HELO {HELO_DOMAIN}")
+            if code != 250:
+                raise SmtpReplyError(f"HELO {code}")
+
+    async def _check_batch(self, emails: list[str]) -> list[str]:
+        code, _ = await self._command(f"MAIL FROM:<{MAIL_FROM}>")
+        if code != 250:
+            raise SmtpReplyError(f"MAIL FROM {code}")
+
+        if (meter := probe_meter.get()) is not None:
+            meter.rcpts += len(emails)
+
+        if self.pipelining:
+            self._writer.write("".join(f"RCPT TO:<{email}>\r\n" for email in emails).encode())
+            await self._writer.drain()
+            codes = [(await self._read_reply())[0] for _ in emails]
+        else:
+            codes = [(await self._command(f"RCPT TO:<{email}>"))[0] for email in emails]
+
+        # Leave the session ready for the next batch
+        await self._command("RSET")
+        return [classify_rcpt(code) for code in codes]
+
+    async def check(self, emails: list[str]) -> dict[str, str]:
+        """Verify ``emails`` on this session. Returns {email: accepted|rejected|error}."""
+        if not emails:
+            return {}
+        if self.unreachable:
+            return {email: "error" for email in emails}
+
+        was_connected = self.connected
+        for attempt in range(2):
+            try:
+                if not self.connected:
+                    await self.connect()
+                results = await self._check_batch(emails)
+                return dict(zip(emails, results))
+            except SmtpReplyError as e:
+                logger.debug("smtp.session_refused", mx=self.mx_host, error=str(e))
+                await self.close()
+                self.unreachable = True
+                break
+            except (OSError, asyncio.TimeoutError, ConnectionError) as e:
+                logger.debug("smtp.session_error", mx=self.mx_host, error=str(e) or type(e).__name__)
+                await self.close(quit=False)
+                # Reconnect only when an established session dropped, not when connecting fails
+                if attempt or not was_connected:
+                    self.unreachable = not was_connected
+                    break
+        return {email: "error" for email in emails}
+
+    async def close(self, quit: bool = True) -> None:
+        if self._writer is None:
+            return
+        writer, self._writer, self._reader = self._writer, None, None
+        try:
+            if quit and not writer.is_closing():
+                writer.write(b"QUIT\r\n")
+                await asyncio.wait_for(writer.drain(), timeout=self.timeout)
+            writer.close()
+        except Exception:
+            pass
@@ -0,0 +1,29 @@
+"""Shared arq connection for enqueueing background jobs from the API."""
+
+import dataclasses
+
+from arq import create_pool
+from arq.connections import ArqRedis, RedisSettings
+
+from app.config import settings
+
+_pool: ArqRedis | None = None
+
+
+async def get_job_pool() -> ArqRedis:
+    """Return the process-wide arq pool, connecting on first use."""
+    global _pool
+    if _pool is None:
+        # Fail fast: callers fall back to running inline when Redis is down
+        redis_settings = dataclasses.replace(
+            RedisSettings.from_dsn(settings.redis_url), conn_timeout=2, conn_retries=0
+        )
+        _pool = await create_pool(redis_settings)
+    return _pool
+
+
+async def close_job_pool() -> None:
+    global _pool
+    if _pool is not None:
+        await _pool.aclose()
+        _pool = None
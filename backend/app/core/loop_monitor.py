@@ -0,0 +1,217 @@
+"""Event-loop blocking detector.
+
+Two modes (``settings.loop_monitor_mode``):
+  debug    — asyncio debug mode. asyncio's own "Executing <Handle> took N seconds"
+             warnings are captured and recorded against the offending handle.
+  watchdog — production-safe. A heartbeat coroutine ticks on the loop while a
+             daemon thread samples the loop thread's stack whenever the heartbeat
+             stalls, attributing the blocked interval to the first non-library frame.
+
+Every blocked interval is logged as ``event_loop.blocked`` and aggregated per
+call site in ``stats`` (exposed via /admin/event-loop).
+"""
+
+import asyncio
+import logging
+import os
+import sys
+import sysconfig
+import threading
+import time
+from dataclasses import dataclass, field
+
+import structlog
+
+logger = structlog.get_logger()
+
+_LIBRARY_PATHS = tuple(
+    os.path.realpath(p)
+    for p in {sysconfig.get_paths()["stdlib"], sysconfig.get_paths()["purelib"], sysconfig.get_paths()["platlib"]}
+)
+_THIS_FILE = os.path.realpath(__file__)
+
+
+@dataclass
+class SiteStats:
+    count: int = 0
+    total_ms: float = 0.0
+    max_ms: float = 0.0
+
+
+@dataclass
+class BlockingStats:
+    """Aggregated blocked-interval metrics, keyed by call site."""
+
+    blocked_count: int = 0
+    blocked_total_ms: float = 0.0
+    max_blocked_ms: float = 0.0
+    sites: dict[str, SiteStats] = field(default_factory=dict)
+
+    def record(self, duration_ms: float, site: str) -> None:
+        self.blocked_count += 1
+        self.blocked_total_ms += duration_ms
+        self.max_blocked_ms = max(self.max_blocked_ms, duration_ms)
+        entry = self.sites.setdefault(site, SiteStats())
+        entry.count += 1
+        entry.total_ms += duration_ms
+        entry.max_ms = max(entry.max_ms, duration_ms)
+
+    def to_dict(self, top: int = 20) -> dict:
+        ranked = sorted(self.sites.items(), key=lambda kv: kv[1].total_ms, reverse=True)
+        return {
+            "blocked_count": self.blocked_count,
+            "blocked_total_ms": round(self.blocked_total_ms, 1),
+            "max_blocked_ms": round(self.max_blocked_ms, 1),
+            "sites": [
+                {
+                    "site": site,
+                    "count": s.count,
+                    "total_ms": round(s.total_ms, 1),
+                    "max_ms": round(s.max_ms, 1),
+                }
+                for site, s in ranked[:top]
+            ],
+        }
+
+
+stats = BlockingStats()
+
+
+def _is_library_frame(filename: str) -> bool:
+    path = os.path.realpath(filename)
+    return path == _THIS_FILE or path.startswith(_LIBRARY_PATHS) or filename.startswith("<")
+
+
+def _describe(frame) -> str:
+    return f"{os.path.relpath(frame.f_code.co_filename)}:{frame.f_lineno} in {frame.f_code.co_name}"
+
+
+def attribute_frame(frame) -> tuple[str, str]:
+    """Return (call_site, blocking_in) for a sampled stack.
+
+    call_site is the innermost frame outside stdlib/site-packages — the line of
+    our code that made the blocking call. blocking_in is the innermost frame.
+    """
+    if frame is None:
+        return "unknown", "unknown"
+    blocking_in = _describe(frame)
+    current = frame
+    while current is not None:
+        if not _is_library_frame(current.f_code.co_filename):
+            return _describe(current), blocking_in
+        current = current.f_back
+    return blocking_in, blocking_in
+
+
+def _record(duration_ms: float, site: str, blocking_in: str | None = None) -> None:
+    stats.record(duration_ms, site)
+    logger.warning(
+        "event_loop.blocked",
+        duration_ms=round(duration_ms, 1),
+        site=site,
+        blocking_in=blocking_in,
+    )
+
+
+class _SlowCallbackHandler(logging.Handler):
+    """Turns asyncio's debug-mode slow callback warnings into recorded metrics."""
+
+    def emit(self, record: logging.LogRecord) -> None:
+        if not record.msg.startswith("Executing") or not record.args or len(record.args) < 2:
+            return
+        handle, seconds = record.args[0], record.args[1]
+        _record(float(seconds) * 1000, str(handle))
+
+
+class LoopMonitor:
+    """Detects and attributes event-loop stalls longer than ``threshold_ms``."""
+
+    def __init__(self, mode: str = "watchdog", threshold_ms: int = 100):
+        self.mode = mode
+        self.threshold = threshold_ms / 1000
+        self.interval = max(self.threshold / 4, 0.005)
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._loop_thread_id: int | None = None
+        self._heartbeat_task: asyncio.Task | None = None
+        self._watchdog: threading.Thread | None = None
+        self._stop = threading.Event()
+        self._last_beat = time.monotonic()
+        self._sample: tuple[str, str] | None = None
+        self._log_handler: logging.Handler | None = None
+
+    def start(self) -> None:
+        """Start monitoring the running loop. Must be called from inside it."""
+        self._loop = asyncio.get_running_loop()
+        self._loop_thread_id = threading.get_ident()
+
+        if self.mode == "debug":
+            self._loop.set_debug(True)
+            self._loop.slow_callback_duration = self.threshold
+            self._log_handler = _SlowCallbackHandler(level=logging.WARNING)
+            logging.getLogger("asyncio").addHandler(self._log_handler)
+        else:
+            self._last_beat = time.monotonic()
+            self._stop.clear()
+            self._heartbeat_task = self._loop.create_task(self._heartbeat())
+            self._watchdog = threading.Thread(target=self._watch, name="loop-watchdog", daemon=True)
+            self._watchdog.start()
+
+        logger.info("loop_monitor.started", mode=self.mode, threshold_ms=int(self.threshold * 1000))
+
+    async def stop(self) -> None:
+        self._stop.set()
+        if self._heartbeat_task:
+            self._heartbeat_task.cancel()
+            try:
+                await self._heartbeat_task
+            except asyncio.CancelledError:
+                pass
+            self._heartbeat_task = None
+        if self._watchdog:
+            self._watchdog.join(timeout=1)
+            self._watchdog = None
+        if self._log_handler:
+            logging.getLogger("asyncio").removeHandler(self._log_handler)
+            self._log_handler = None
+        if self.mode == "debug" and self._loop:
+            self._loop.set_debug(False)
+
+    async def _heartbeat(self) -> None:
+        while True:
+            self._last_beat = time.monotonic()
+            await asyncio.sleep(self.interval)
+            lag = time.monotonic() - self._last_beat - self.interval
+            if lag >= self.threshold:
+                site, blocking_in = self._sample or ("unknown", "unknown")
+                _record(lag * 1000, site, blocking_in)
+            self._sample = None
+
+    def _watch(self) -> None:
+        while not self._stop.wait(self.interval):
+            stalled_for = time.monotonic() - self._last_beat - self.interval
+            if stalled_for < self.threshold or self._sample is not None:
+                continue
+            frame = sys._current_frames().get(self._loop_thread_id)
+            self._sample = attribute_frame(frame)
+
+
+_monitor: LoopMonitor | None = None
+
+
+def start_loop_monitor() -> LoopMonitor | None:
+    """Start the monitor configured in settings (no-op when mode is "off")."""
+    global _monitor
+    from app.config import settings
+
+    if settings.loop_monitor_mode not in ("debug", "watchdog") or _monitor is not None:
+        return _monitor
+    _monitor = LoopMonitor(settings.loop_monitor_mode, settings.loop_block_threshold_ms)
+    _monitor.start()
+    return _monitor
+
+
+async def stop_loop_monitor() -> None:
+    global _monitor
+    if _monitor is not None:
+        await _monitor.stop()
+        _monitor = None
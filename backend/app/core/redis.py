@@ -0,0 +1,22 @@
+"""Shared async Redis connection."""
+
+import redis.asyncio as aioredis
+
+from app.config import settings
+
+_redis: aioredis.Redis | None = None
+
+
+def get_redis() -> aioredis.Redis | None:
+    """Return the process-wide async Redis client, or None if not configured."""
+    global _redis
+    if _redis is None and settings.redis_url:
+        _redis = aioredis.from_url(settings.redis_url, socket_connect_timeout=2, socket_timeout=2)
+    return _redis
+
+
+async def close_redis() -> None:
+    global _redis
+    if _redis is not None:
+        await _redis.aclose()
+        _redis = None
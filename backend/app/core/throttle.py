@@ -0,0 +1,100 @@
+"""Async token-bucket rate limiters for outbound provider calls."""
+
+import asyncio
+import time
+
+import structlog
+from redis.exceptions import RedisError
+
+from app.core.redis import get_redis
+
+logger = structlog.get_logger()
+
+
+class TokenBucket:
+    """Allows ``rate`` acquisitions per second with bursts up to ``capacity``.
+
+    Safe to share between coroutines on one event loop.
+    """
+
+    def __init__(self, rate: float, capacity: float | None = None):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(1.0, rate)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self, tokens: float = 1.0) -> None:
+        """Wait until ``tokens`` are available, then take them."""
+        async with self._lock:
+            while True:
+                self._refill()
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return
+                await asyncio.sleep((tokens - self._tokens) / self.rate)
+
+
+# GCRA over one key: the stored value is the bucket's "theoretical arrival
+# time" in microseconds of Redis server time. Each call reserves its slot and
+# returns how long the caller must wait before using it.
+_GCRA_SCRIPT = """
+local t = redis.call('TIME')
+local now = tonumber(t[1]) * 1000000 + tonumber(t[2])
+local increment = tonumber(ARGV[1])
+local tolerance = tonumber(ARGV[2])
+local tat = tonumber(redis.call('GET', KEYS[1]) or now)
+if tat < now then tat = now end
+local new_tat = tat + increment
+local wait = new_tat - tolerance - now
+if wait < 0 then wait = 0 end
+redis.call('SET', KEYS[1], string.format('%d', new_tat), 'PX', math.ceil((new_tat - now) / 1000) + 1000)
+return wait
+"""
+
+
+class SharedTokenBucket:
+    """A ``TokenBucket`` shared by every process through one Redis key.
+
+    Same interface as ``TokenBucket``. Slots are reserved atomically on the
+    Redis server's clock, so all workers together stay within ``rate``. Falls
+    back to a per-process bucket when Redis is not configured or unreachable.
+    """
+
+    def __init__(self, name: str, rate: float, capacity: float | None = None):
+        self._local = TokenBucket(rate, capacity)
+        self.rate = rate
+        self.capacity = self._local.capacity
+        self.key = f"ratelimit:{name}"
+        self._script = None
+        self._script_redis = None
+
+    async def acquire(self, tokens: float = 1.0) -> None:
+        """Reserve ``tokens`` in the shared bucket and wait until they are due."""
+        redis = get_redis()
+        if redis is None:
+            await self._local.acquire(tokens)
+            return
+        if self._script is None or self._script_redis is not redis:
+            self._script = redis.register_script(_GCRA_SCRIPT)
+            self._script_redis = redis
+
+        interval_us = 1_000_000 / self.rate
+        try:
+            wait_us = await self._script(
+                keys=[self.key],
+                args=[int(interval_us * tokens), int(interval_us * self.capacity)],
+            )
+        except RedisError as e:
+            logger.warning("throttle.shared_bucket_unavailable", key=self.key, error=str(e))
+            await self._local.acquire(tokens)
+            return
+        if wait_us and int(wait_us) > 0:
+            await asyncio.sleep(int(wait_us) / 1_000_000)
@@ -0,0 +1,37 @@
+"""add_company_enrichment_priority
+
+Revision ID: a3c7e9b1d5f2
+Revises: f2a6c8e0b4d3
+Create Date: 2026-10-19 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a3c7e9b1d5f2'
+down_revision: Union[str, Sequence[str], None] = 'f2a6c8e0b4d3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        'companies',
+        sa.Column('enrichment_priority', sa.Integer(), server_default='0', nullable=False),
+    )
+    # Only pending companies are ever claimed; keep the scan to those rows
+    op.create_index(
+        'ix_companies_enrichment_pending',
+        'companies',
+        ['enrichment_priority', 'created_at'],
+        postgresql_where=sa.text("enrichment_status = 'pending'"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_companies_enrichment_pending', table_name='companies')
+    op.drop_column('companies', 'enrichment_priority')
@@ -0,0 +1,66 @@
+"""add_correlation_groups
+
+Revision ID: b8d2f4a6c0e3
+Revises: a3c7e9b1d5f2
+Create Date: 2026-10-19 16:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import ARRAY, UUID
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b8d2f4a6c0e3'
+down_revision: Union[str, Sequence[str], None] = 'a3c7e9b1d5f2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'correlation_groups',
+        sa.Column('id', UUID(as_uuid=True), primary_key=True),
+        sa.Column('company_id', UUID(as_uuid=True), sa.ForeignKey('companies.id', ondelete='CASCADE'), nullable=False),
+        sa.Column('window_start', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('window_end', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('categories', ARRAY(sa.String(50)), server_default='{}', nullable=False),
+        sa.Column('member_count', sa.Integer(), server_default='0', nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    )
+    op.create_index(
+        'ix_correlation_groups_company_window_end', 'correlation_groups', ['company_id', 'window_end']
+    )
+
+    # Materialize the groups existing signals already point at
+    op.execute(
+        """
+        INSERT INTO correlation_groups (id, company_id, window_start, window_end, categories, member_count)
+        SELECT correlation_group_id,
+               (array_agg(company_id ORDER BY created_at))[1],
+               min(created_at),
+               max(created_at),
+               array_agg(DISTINCT signal_category),
+               count(*)
+        FROM signals
+        WHERE correlation_group_id IS NOT NULL
+        GROUP BY correlation_group_id
+        """
+    )
+    op.create_foreign_key(
+        'fk_signals_correlation_group_id',
+        'signals',
+        'correlation_groups',
+        ['correlation_group_id'],
+        ['id'],
+        ondelete='SET NULL',
+    )
+
+
+def downgrade() -> None:
+    op.drop_constraint('fk_signals_correlation_group_id', 'signals', type_='foreignkey')
+    op.drop_index('ix_correlation_groups_company_window_end', table_name='correlation_groups')
+    op.drop_table('correlation_groups')
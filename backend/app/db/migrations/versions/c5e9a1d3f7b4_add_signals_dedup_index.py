@@ -0,0 +1,27 @@
+"""add_signals_dedup_index
+
+Revision ID: c5e9a1d3f7b4
+Revises: b8d2f4a6c0e3
+Create Date: 2026-10-19 17:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c5e9a1d3f7b4'
+down_revision: Union[str, Sequence[str], None] = 'b8d2f4a6c0e3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        'ix_signals_company_type_published', 'signals', ['company_id', 'signal_type', 'source_published_at']
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_signals_company_type_published', table_name='signals')
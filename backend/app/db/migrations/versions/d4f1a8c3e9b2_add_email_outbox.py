@@ -0,0 +1,45 @@
+"""add_email_outbox
+
+Revision ID: d4f1a8c3e9b2
+Revises: c7a2d4e6f8b1
+Create Date: 2026-10-19 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import UUID, JSONB
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd4f1a8c3e9b2'
+down_revision: Union[str, Sequence[str], None] = 'c7a2d4e6f8b1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'email_outbox',
+        sa.Column('id', UUID(as_uuid=True), primary_key=True),
+        sa.Column('kind', sa.String(50), nullable=False),
+        sa.Column('provider', sa.String(50), server_default='resend', nullable=False),
+        sa.Column('idempotency_key', sa.String(255), nullable=False, unique=True),
+        sa.Column('payload', JSONB, nullable=False),
+        sa.Column('status', sa.String(20), server_default='pending', nullable=False),
+        sa.Column('attempt_count', sa.Integer(), server_default='0', nullable=False),
+        sa.Column('next_attempt_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.Column('claimed_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('last_error', sa.Text(), nullable=True),
+        sa.Column('provider_message_id', sa.String(255), nullable=True),
+        sa.Column('alert_history_id', UUID(as_uuid=True), sa.ForeignKey('alert_history.id', ondelete='SET NULL'), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.Column('sent_at', sa.DateTime(timezone=True), nullable=True),
+    )
+    op.create_index('ix_email_outbox_status_next_attempt', 'email_outbox', ['status', 'next_attempt_at'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_email_outbox_status_next_attempt', 'email_outbox')
+    op.drop_table('email_outbox')
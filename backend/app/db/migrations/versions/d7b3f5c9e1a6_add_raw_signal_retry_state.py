@@ -0,0 +1,37 @@
+"""add_raw_signal_retry_state
+
+Revision ID: d7b3f5c9e1a6
+Revises: c5e9a1d3f7b4
+Create Date: 2026-10-19 18:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd7b3f5c9e1a6'
+down_revision: Union[str, Sequence[str], None] = 'c5e9a1d3f7b4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('raw_signals', sa.Column('attempt_count', sa.Integer(), server_default='0', nullable=False))
+    op.add_column('raw_signals', sa.Column('next_attempt_at', sa.DateTime(timezone=True), nullable=True))
+    op.add_column('raw_signals', sa.Column('last_error', sa.Text(), nullable=True))
+    op.create_index(
+        'ix_raw_signals_pending',
+        'raw_signals',
+        ['created_at'],
+        postgresql_where=sa.text("processing_status = 'raw'"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_raw_signals_pending', table_name='raw_signals')
+    op.drop_column('raw_signals', 'last_error')
+    op.drop_column('raw_signals', 'next_attempt_at')
+    op.drop_column('raw_signals', 'attempt_count')
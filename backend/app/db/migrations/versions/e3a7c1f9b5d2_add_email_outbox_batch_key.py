@@ -0,0 +1,28 @@
+"""add_email_outbox_batch_key
+
+Revision ID: e3a7c1f9b5d2
+Revises: d7b3f5c9e1a6
+Create Date: 2026-10-19 19:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e3a7c1f9b5d2'
+down_revision: Union[str, Sequence[str], None] = 'd7b3f5c9e1a6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('email_outbox', sa.Column('batch_key', sa.String(64), nullable=True))
+    op.create_index('ix_email_outbox_batch_key', 'email_outbox', ['batch_key'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_email_outbox_batch_key', table_name='email_outbox')
+    op.drop_column('email_outbox', 'batch_key')
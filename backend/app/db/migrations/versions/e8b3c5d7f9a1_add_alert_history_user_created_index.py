@@ -0,0 +1,25 @@
+"""add_alert_history_user_created_index
+
+Revision ID: e8b3c5d7f9a1
+Revises: d4f1a8c3e9b2
+Create Date: 2026-10-19 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e8b3c5d7f9a1'
+down_revision: Union[str, Sequence[str], None] = 'd4f1a8c3e9b2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_alert_history_user_created', 'alert_history', ['user_id', 'created_at'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_alert_history_user_created', table_name='alert_history')
@@ -0,0 +1,33 @@
+"""add_email_pattern_domain_intel
+
+Revision ID: f2a6c8e0b4d3
+Revises: e8b3c5d7f9a1
+Create Date: 2026-10-19 11:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import ARRAY
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f2a6c8e0b4d3'
+down_revision: Union[str, Sequence[str], None] = 'e8b3c5d7f9a1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('email_patterns', sa.Column('mx_hosts', ARRAY(sa.String(255)), nullable=True))
+    op.add_column('email_patterns', sa.Column('mx_checked_at', sa.DateTime(timezone=True), nullable=True))
+    op.add_column('email_patterns', sa.Column('smtp_blocked', sa.Boolean(), nullable=True))
+    op.add_column('email_patterns', sa.Column('smtp_checked_at', sa.DateTime(timezone=True), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('email_patterns', 'smtp_checked_at')
+    op.drop_column('email_patterns', 'smtp_blocked')
+    op.drop_column('email_patterns', 'mx_checked_at')
+    op.drop_column('email_patterns', 'mx_hosts')
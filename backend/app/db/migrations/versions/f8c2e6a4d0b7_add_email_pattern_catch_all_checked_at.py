@@ -0,0 +1,32 @@
+"""add_email_pattern_catch_all_checked_at
+
+Revision ID: f8c2e6a4d0b7
+Revises: e3a7c1f9b5d2
+Create Date: 2026-10-19 19:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f8c2e6a4d0b7'
+down_revision: Union[str, Sequence[str], None] = 'e3a7c1f9b5d2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        'email_patterns', sa.Column('catch_all_checked_at', sa.DateTime(timezone=True), nullable=True)
+    )
+    # Until now one timestamp covered both probe facts
+    op.execute(
+        "UPDATE email_patterns SET catch_all_checked_at = smtp_checked_at WHERE has_catch_all IS NOT NULL"
+    )
+
+
+def downgrade() -> None:
+    op.drop_column('email_patterns', 'catch_all_checked_at')
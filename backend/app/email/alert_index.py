@@ -0,0 +1,79 @@
+"""In-memory index over realtime alert filters.
+
+Each alert is filed under its most selective filter only — company_ids, then
+signal_types, then states — and alerts with no list filter go into an "open"
+bucket sorted by min_severity_score. Matching a signal touches only the buckets
+it can possibly satisfy, then confirms each candidate with
+``signal_matches_alert``, so cost scales with the number of matches rather than
+with the number of alerts.
+"""
+
+import bisect
+
+from app.models import Alert, Signal
+
+
+def signal_matches_alert(signal: Signal, alert: Alert) -> bool:
+    """Check if a signal matches an alert's filter criteria."""
+    if alert.signal_types and signal.signal_type not in alert.signal_types:
+        return False
+    if signal.confidence_score < alert.min_confidence_score:
+        return False
+    if signal.severity_score < alert.min_severity_score:
+        return False
+    if alert.states and signal.location_state and signal.location_state not in alert.states:
+        return False
+    if alert.company_ids and signal.company_id not in alert.company_ids:
+        return False
+    return True
+
+
+class AlertIndex:
+    """Inverted index of alerts keyed by company, signal type and state."""
+
+    def __init__(self, alerts: list[Alert]):
+        self._position: dict[int, int] = {}
+        self._by_company: dict = {}
+        self._by_type: dict[str, list[Alert]] = {}
+        self._by_state: dict[str, list[Alert]] = {}
+        self._state_scoped: list[Alert] = []
+        open_alerts: list[Alert] = []
+
+        for position, alert in enumerate(alerts):
+            self._position[id(alert)] = position
+            if alert.company_ids:
+                for company_id in alert.company_ids:
+                    self._by_company.setdefault(company_id, []).append(alert)
+            elif alert.signal_types:
+                for signal_type in alert.signal_types:
+                    self._by_type.setdefault(signal_type, []).append(alert)
+            elif alert.states:
+                # A signal without a location passes every state filter
+                self._state_scoped.append(alert)
+                for state in alert.states:
+                    self._by_state.setdefault(state, []).append(alert)
+            else:
+                open_alerts.append(alert)
+
+        open_alerts.sort(key=lambda a: a.min_severity_score or 0)
+        self._open = open_alerts
+        self._open_severity = [a.min_severity_score or 0 for a in open_alerts]
+        self.size = len(alerts)
+
+    def candidates(self, signal: Signal) -> list[Alert]:
+        """Alerts that might match ``signal`` (a superset of the real matches)."""
+        found = list(self._by_company.get(signal.company_id, ()))
+        found.extend(self._by_type.get(signal.signal_type, ()))
+        if signal.location_state:
+            found.extend(self._by_state.get(signal.location_state, ()))
+        else:
+            found.extend(self._state_scoped)
+        cut = bisect.bisect_right(self._open_severity, signal.severity_score)
+        found.extend(self._open[:cut])
+        return found
+
+    def match(self, signal: Signal) -> list[Alert]:
+        """Alerts matching ``signal``, in the order they were indexed."""
+        matched = [a for a in self.candidates(signal) if signal_matches_alert(signal, a)]
+        matched.sort(key=lambda a: self._position[id(a)])
+        return matched
@@ -0,0 +1,179 @@
+"""Daily / weekly digest engine.
+
+Alerts with identical filters share one result: they are grouped by
+``FilterSignature``, each signature runs one query for its top signals (using
+the signals created_at / severity indexes), and its email body is rendered
+once. Users and companies are loaded in bulk, and every digest is queued to
+the email outbox, where the email worker sends them in concurrent batches.
+"""
+
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+
+import structlog
+from sqlalchemy import func, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.email.outbox import build_email, enqueue_emails
+from app.models import Alert, Company, Signal, User, Watchlist
+
+logger = structlog.get_logger()
+
+DIGEST_SIGNAL_LIMIT = 10
+
+
+@dataclass(frozen=True)
+class FilterSignature:
+    """The part of an alert that decides which signals its digest contains."""
+
+    signal_types: tuple = ()
+    states: tuple = ()
+    company_ids: tuple = ()
+    min_confidence_score: int = 0
+    min_severity_score: int = 0
+    watchlist_tenant_id: object = None  # Set only for watchlist_only alerts
+
+
+def alert_signature(alert: Alert) -> FilterSignature:
+    return FilterSignature(
+        signal_types=tuple(sorted(alert.signal_types or ())),
+        states=tuple(sorted(alert.states or ())),
+        company_ids=tuple(sorted(alert.company_ids or (), key=str)),
+        min_confidence_score=alert.min_confidence_score or 0,
+        min_severity_score=alert.min_severity_score or 0,
+        watchlist_tenant_id=alert.tenant_id if alert.watchlist_only else None,
+    )
+
+
+def group_by_signature(alerts: list[Alert]) -> dict[FilterSignature, list[Alert]]:
+    groups: dict[FilterSignature, list[Alert]] = {}
+    for alert in alerts:
+        groups.setdefault(alert_signature(alert), []).append(alert)
+    return groups
+
+
+def signature_query(signature: FilterSignature, cutoff: datetime, limit: int = DIGEST_SIGNAL_LIMIT):
+    """Top signals for a signature since ``cutoff``, each row carrying the total match count."""
+    query = select(Signal, func.count().over().label("total")).where(
+        Signal.created_at >= cutoff,
+        Signal.confidence_score >= signature.min_confidence_score,
+        Signal.severity_score >= signature.min_severity_score,
+    )
+    if signature.signal_types:
+        query = query.where(Signal.signal_type.in_(signature.signal_types))
+    if signature.states:
+        # Signals without a location pass state filters (same as realtime matching)
+        query = query.where(
+            or_(
+                Signal.location_state.is_(None),
+                Signal.location_state == "",
+                Signal.location_state.in_(signature.states),
+            )
+        )
+    if signature.company_ids:
+        query = query.where(Signal.company_id.in_(signature.company_ids))
+    if signature.watchlist_tenant_id is not None:
+        query = query.where(
+            Signal.company_id.in_(
+                select(Watchlist.company_id).where(Watchlist.tenant_id == signature.watchlist_tenant_id)
+            )
+        )
+    return query.order_by(Signal.severity_score.desc(), Signal.created_at.desc()).limit(limit)
+
+
+def render_digest(
+    frequency: str, signals: list[Signal], total: int, company_names: dict
+) -> tuple[str, str]:
+    """Build the (subject, html) of one digest email."""
+    subject = f"[DispoSight] {'Daily' if frequency == 'daily' else 'Weekly'} Intelligence Digest — {total} signals"
+
+    signal_rows = ""
+    for s in signals:
+        color = "#EF4444" if s.severity_score >= 80 else "#F97316" if s.severity_score >= 60 else "#EAB308" if s.severity_score >= 40 else "#22C55E"
+        signal_rows += f"""
+            <tr>
+                <td style="padding: 8px; border-bottom: 1px solid #27272A;">{company_names.get(s.company_id) or '?'}</td>
+                <td style="padding: 8px; border-bottom: 1px solid #27272A;">{s.signal_type}</td>
+                <td style="padding: 8px; border-bottom: 1px solid #27272A; font-family: monospace; color: {color};">{s.severity_score}</td>
+            </tr>
+            """
+
+    html = f"""
+        <div style="font-family: system-ui, sans-serif; max-width: 600px; margin: 0 auto; background: #09090B; color: #FAFAFA; padding: 24px; border-radius: 8px;">
+            <h2 style="color: #10B981;">Intelligence Digest</h2>
+            <p style="color: #A1A1AA;">{total} new signals in the last {'24 hours' if frequency == 'daily' else 'week'}.</p>
+            <table style="width: 100%; border-collapse: collapse;">
+                <tr style="color: #71717A; font-size: 12px;">
+                    <th style="text-align: left; padding: 8px;">Company</th>
+                    <th style="text-align: left; padding: 8px;">Type</th>
+                    <th style="text-align: left; padding: 8px;">Score</th>
+                </tr>
+                {signal_rows}
+            </table>
+            <a href="{settings.frontend_url}/dashboard" style="display: inline-block; background: #10B981; color: #fff; padding: 10px 20px; border-radius: 6px; text-decoration: none; font-weight: 500; margin-top: 16px;">View Dashboard</a>
+        </div>
+        """
+    return subject, html
+
+
+async def send_digest(db: AsyncSession, frequency: str = "daily") -> dict:
+    """Queue digest emails for all users with matching alert frequency."""
+    if not settings.resend_api_key:
+        logger.warning("email.digest_skipped", reason="no_resend_key")
+        return {"queued": 0}
+
+    now = datetime.now(timezone.utc)
+    cutoff = now - timedelta(hours=24 if frequency == "daily" else 168)
+
+    result = await db.execute(
+        select(Alert).where(Alert.frequency == frequency, Alert.is_active == True)
+    )
+    groups = group_by_signature(result.scalars().all())
+    if not groups:
+        return {"queued": 0}
+
+    # One query per distinct filter signature
+    matches: dict[FilterSignature, tuple[list[Signal], int]] = {}
+    for signature in groups:
+        rows = (await db.execute(signature_query(signature, cutoff))).all()
+        if rows:
+            matches[signature] = ([row[0] for row in rows], rows[0][1])
+    if not matches:
+        return {"queued": 0}
+
+    user_ids = {alert.user_id for sig in matches for alert in groups[sig]}
+    user_result = await db.execute(select(User.id, User.email).where(User.id.in_(user_ids)))
+    emails_by_user = dict(user_result.all())
+
+    company_ids = {s.company_id for signals, _ in matches.values() for s in signals}
+    company_result = await db.execute(select(Company.id, Company.name).where(Company.id.in_(company_ids)))
+    company_names = dict(company_result.all())
+
+    period = now.date().isoformat()
+    queued: list[dict] = []
+    for signature, (signals, total) in matches.items():
+        subject, html = render_digest(frequency, signals, total, company_names)
+        for alert in groups[signature]:
+            to = emails_by_user.get(alert.user_id)
+            if not to:
+                continue
+            queued.append(
+                build_email(
+                    kind=f"digest_{frequency}",
+                    idempotency_key=f"digest:{frequency}:{alert.id}:{period}",
+                    to=to,
+                    subject=subject,
+                    html=html,
+                )
+            )
+
+    await enqueue_emails(db, queued)
+    logger.info(
+        "email.digest_queued",
+        frequency=frequency,
+        signatures=len(groups),
+        matched_signatures=len(matches),
+        count=len(queued),
+    )
+    return {"queued": len(queued), "signatures": len(groups)}
@@ -0,0 +1,317 @@
+"""Transactional email outbox.
+
+Producers (realtime alerts, digests) call ``enqueue_emails`` inside their own
+transaction, so an email exists if and only if the signal/AlertHistory row that
+caused it was committed. The email worker drains the table:
+
+  1. claim  — short transaction, ``FOR UPDATE SKIP LOCKED`` so several workers
+              can drain concurrently; rows move pending → sending
+  2. send   — no transaction open; rows are grouped into provider batches and
+              sent concurrently under a per-provider token bucket
+  3. settle — one transaction marks rows sent / pending (backoff) / failed and
+              mirrors the result onto AlertHistory
+
+Every row carries an idempotency key that is forwarded to the provider, so a
+retry after a crash between send and settle never delivers twice. Rows sent
+together are given a batch key at their first claim, committed before the
+send. A reclaimed or retried batch is re-sent with the same rows under the
+same key. Rows that have already been sent on their own stay single.
+"""
+
+import asyncio
+import uuid
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+
+import httpx
+import structlog
+from sqlalchemy import and_, or_, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.core.throttle import TokenBucket
+from app.models import AlertHistory, EmailOutbox
+from app.services.resend_client import RESEND_BATCH_LIMIT, ResendError, resend_client
+
+logger = structlog.get_logger()
+
+MAX_ATTEMPTS = 6
+BASE_RETRY_DELAY = timedelta(seconds=30)
+MAX_RETRY_DELAY = timedelta(hours=1)
+STALE_CLAIM_AFTER = timedelta(minutes=10)  # "sending" rows whose worker died
+SEND_CONCURRENCY = 4
+ENQUEUE_CHUNK = 1000  # Rows per INSERT, well under the driver's bind-parameter limit
+
+_limiters: dict[str, TokenBucket] = {}
+
+
+def _limiter(provider: str) -> TokenBucket:
+    if provider not in _limiters:
+        _limiters[provider] = TokenBucket(settings.resend_requests_per_second)
+    return _limiters[provider]
+
+
+def build_email(
+    *,
+    kind: str,
+    idempotency_key: str,
+    to: str | list[str],
+    subject: str,
+    html: str | None = None,
+    text: str | None = None,
+    alert_history_id: uuid.UUID | None = None,
+) -> dict:
+    """Build one outbox row (as a dict for ``enqueue_emails``)."""
+    payload: dict = {"from": settings.from_email, "to": to, "subject": subject}
+    if html is not None:
+        payload["html"] = html
+    if text is not None:
+        payload["text"] = text
+    return {
+        "id": uuid.uuid4(),
+        "kind": kind,
+        "provider": "resend",
+        "idempotency_key": idempotency_key,
+        "payload": payload,
+        "alert_history_id": alert_history_id,
+    }
+
+
+async def enqueue_emails(db: AsyncSession, rows: list[dict]) -> None:
+    """Insert outbox rows in the caller's transaction. Duplicate keys are ignored."""
+    for i in range(0, len(rows), ENQUEUE_CHUNK):
+        await db.execute(
+            pg_insert(EmailOutbox)
+            .values(rows[i : i + ENQUEUE_CHUNK])
+            .on_conflict_do_nothing(index_elements=["idempotency_key"])
+        )
+
+
+def retry_delay(attempt_count: int) -> timedelta:
+    """Exponential backoff: 30s, 60s, 120s ... capped at 1h."""
+    delay = BASE_RETRY_DELAY * (2 ** max(0, attempt_count - 1))
+    return min(delay, MAX_RETRY_DELAY)
+
+
+@dataclass
+class DeliveryResult:
+    outbox_id: uuid.UUID
+    ok: bool
+    message_id: str | None = None
+    error: str | None = None
+    retryable: bool = True
+    batch_key: str | None = None  # Batch to resend the row in; None sends it on its own
+
+
+def assign_batch_keys(rows: list[EmailOutbox]) -> None:
+    """Group first-attempt rows without a batch into provider-sized batches.
+
+    Retried rows keep whatever they were last sent with: their batch key, or
+    none (their own idempotency key).
+    """
+    by_provider: dict[str, list[EmailOutbox]] = {}
+    for row in rows:
+        if row.batch_key is None and row.attempt_count == 1:
+            by_provider.setdefault(row.provider, []).append(row)
+    for provider_rows in by_provider.values():
+        for i in range(0, len(provider_rows), RESEND_BATCH_LIMIT):
+            chunk = provider_rows[i : i + RESEND_BATCH_LIMIT]
+            if len(chunk) > 1:
+                key = f"batch:{uuid.uuid4().hex}"
+                for row in chunk:
+                    row.batch_key = key
+
+
+async def _send_one(row: EmailOutbox, client, limiter: TokenBucket) -> DeliveryResult:
+    await limiter.acquire()
+    try:
+        result = await client.send(row.payload, idempotency_key=row.idempotency_key)
+        return DeliveryResult(row.id, ok=True, message_id=result.get("id"))
+    except ResendError as e:
+        return DeliveryResult(row.id, ok=False, error=str(e)[:500], retryable=e.retryable)
+    except httpx.HTTPError as e:
+        return DeliveryResult(row.id, ok=False, error=str(e)[:500] or type(e).__name__)
+
+
+async def _send_batch(rows: list[EmailOutbox], key: str, client, limiter: TokenBucket) -> list[DeliveryResult]:
+    await limiter.acquire()
+    try:
+        data = await client.send_batch([r.payload for r in rows], idempotency_key=key)
+        results = []
+        for position, row in enumerate(rows):
+            item = data[position] if position < len(data) else None
+            if item and item.get("id"):
+                results.append(DeliveryResult(row.id, ok=True, message_id=item["id"]))
+            else:
+                # Not acknowledged by the provider: retry on its own, under its own key
+                results.append(DeliveryResult(row.id, ok=False, error="missing from batch response"))
+        return results
+    except ResendError as e:
+        if e.retryable:
+            return [DeliveryResult(r.id, ok=False, error=str(e)[:500], batch_key=key) for r in rows]
+        # One bad payload rejects the whole batch — isolate it with single sends
+        logger.warning("outbox.batch_rejected", size=len(rows), error=str(e))
+        return [await _send_one(r, client, limiter) for r in rows]
+    except httpx.HTTPError as e:
+        return [
+            DeliveryResult(r.id, ok=False, error=str(e)[:500] or type(e).__name__, batch_key=key) for r in rows
+        ]
+
+
+async def send_rows(
+    rows: list[EmailOutbox],
+    client=None,
+    concurrency: int = SEND_CONCURRENCY,
+) -> list[DeliveryResult]:
+    """Send claimed rows by their batch key, ``concurrency`` requests at a time."""
+    client = client or resend_client
+    batches: dict[tuple[str, str], list[EmailOutbox]] = {}
+    singles: list[EmailOutbox] = []
+    for row in rows:
+        if row.batch_key is None:
+            singles.append(row)
+        else:
+            batches.setdefault((row.provider, row.batch_key), []).append(row)
+
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def run_batch(batch: list[EmailOutbox], key: str, limiter: TokenBucket) -> list[DeliveryResult]:
+        async with semaphore:
+            return await _send_batch(batch, key, client, limiter)
+
+    async def run_single(row: EmailOutbox) -> list[DeliveryResult]:
+        async with semaphore:
+            return [await _send_one(row, client, _limiter(row.provider))]
+
+    tasks = [run_batch(batch, key, _limiter(provider)) for (provider, key), batch in batches.items()]
+    tasks.extend(run_single(row) for row in singles)
+
+    results: list[DeliveryResult] = []
+    for chunk_results in await asyncio.gather(*tasks):
+        results.extend(chunk_results)
+    return results
+
+
+async def claim_rows(db: AsyncSession, limit: int) -> list[EmailOutbox]:
+    """Lock up to ``limit`` due rows and mark them as sending. Caller commits."""
+    now = datetime.now(timezone.utc)
+    result = await db.execute(
+        select(EmailOutbox)
+        .where(
+            or_(
+                and_(EmailOutbox.status == "pending", EmailOutbox.next_attempt_at <= now),
+                and_(EmailOutbox.status == "sending", EmailOutbox.claimed_at < now - STALE_CLAIM_AFTER),
+            )
+        )
+        .order_by(EmailOutbox.next_attempt_at)
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+    )
+    rows = list(result.scalars().all())
+
+    # Pull in the rest of any batch the limit cut through, so it is resent whole
+    keys = {row.batch_key for row in rows if row.batch_key is not None}
+    if keys:
+        rest = await db.execute(
+            select(EmailOutbox)
+            .where(
+                EmailOutbox.batch_key.in_(keys),
+                EmailOutbox.id.not_in([row.id for row in rows]),
+                or_(
+                    EmailOutbox.status == "pending",
+                    and_(EmailOutbox.status == "sending", EmailOutbox.claimed_at < now - STALE_CLAIM_AFTER),
+                ),
+            )
+            .with_for_update(skip_locked=True)
+        )
+        rows.extend(rest.scalars().all())
+
+    for row in rows:
+        row.status = "sending"
+        row.claimed_at = now
+        row.attempt_count += 1
+    assign_batch_keys(rows)
+    return rows
+
+
+async def settle_results(db: AsyncSession, rows: list[EmailOutbox], results: list[DeliveryResult]) -> dict:
+    """Persist delivery outcomes on the outbox rows and their AlertHistory entries.
+
+    Uses ORM bulk UPDATE by primary key (executemany), not one statement per row.
+    """
+    now = datetime.now(timezone.utc)
+    by_id = {r.id: r for r in rows}
+    stats = {"sent": 0, "retrying": 0, "failed": 0}
+    outbox_updates: list[dict] = []
+    history_updates: list[dict] = []
+
+    # Every parameter set carries the same keys so the UPDATEs run as one executemany
+    for res in results:
+        row = by_id[res.outbox_id]
+        if res.ok:
+            outbox_updates.append({
+                "id": row.id, "status": "sent", "sent_at": now, "next_attempt_at": row.next_attempt_at,
+                "provider_message_id": res.message_id, "last_error": None, "batch_key": row.batch_key,
+            })
+            history = {"delivery_status": "sent", "delivered_at": now, "error_message": None}
+            stats["sent"] += 1
+        elif res.retryable and row.attempt_count < MAX_ATTEMPTS:
+            outbox_updates.append({
+                "id": row.id, "status": "pending", "sent_at": None,
+                "next_attempt_at": now + retry_delay(row.attempt_count),
+                "provider_message_id": None, "last_error": res.error, "batch_key": res.batch_key,
+            })
+            history = None
+            stats["retrying"] += 1
+        else:
+            outbox_updates.append({
+                "id": row.id, "status": "failed", "sent_at": None, "next_attempt_at": row.next_attempt_at,
+                "provider_message_id": None, "last_error": res.error, "batch_key": row.batch_key,
+            })
+            history = {"delivery_status": "failed", "delivered_at": None, "error_message": res.error}
+            stats["failed"] += 1
+
+        if history and row.alert_history_id:
+            history_updates.append({"id": row.alert_history_id, **history})
+
+    if outbox_updates:
+        await db.execute(update(EmailOutbox), outbox_updates)
+    if history_updates:
+        await db.execute(update(AlertHistory), history_updates)
+
+    return stats
+
+
+async def deliver_pending_emails(batch_size: int | None = None, max_rounds: int = 10) -> dict:
+    """Drain due outbox rows. Each round: claim (commit) → send → settle (commit)."""
+    from app.db.session import async_session_factory
+
+    batch_size = batch_size or settings.email_outbox_batch_size
+    totals = {"sent": 0, "retrying": 0, "failed": 0}
+
+    if not settings.resend_api_key:
+        logger.warning("outbox.skipped", reason="no_resend_key")
+        return totals
+
+    for _ in range(max_rounds):
+        async with async_session_factory() as db:
+            rows = await claim_rows(db, batch_size)
+            await db.commit()
+        if not rows:
+            break
+
+        results = await send_rows(rows)
+
+        async with async_session_factory() as db:
+            stats = await settle_results(db, rows, results)
+            await db.commit()
+
+        for key in totals:
+            totals[key] += stats[key]
+        logger.info("outbox.round_complete", claimed=len(rows), **stats)
+
+        if len(rows) < batch_size:
+            break
+
+    return totals
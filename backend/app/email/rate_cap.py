@@ -0,0 +1,131 @@
+"""Per-user daily cap on realtime alert emails.
+
+Counts live in Redis as sliding-window sorted sets — one member per queued
+alert email, scored by its timestamp — so checking the cap for a whole batch
+of users is one pipelined round trip instead of a ``count(*)`` over
+alert_history per signal × alert. AlertHistory stays the durable audit log:
+a user's window is seeded from it the first time they are checked (or after
+Redis loses the key), and it is the fallback when Redis is unavailable.
+"""
+
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import structlog
+from redis.exceptions import RedisError
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.redis import get_redis
+from app.models import AlertHistory
+
+logger = structlog.get_logger()
+
+RATE_CAP_PER_DAY = 20
+WINDOW = timedelta(hours=24)
+KEY_PREFIX = "ratecap:alert"
+COUNTED_STATUSES = ("queued", "sent")
+
+
+def _key(user_id) -> str:
+    return f"{KEY_PREFIX}:{user_id}"
+
+
+def _seeded_key(user_id) -> str:
+    return f"{KEY_PREFIX}:{user_id}:seeded"
+
+
+async def _history_in_window(db: AsyncSession, user_ids: list) -> dict[uuid.UUID, list[tuple[str, float]]]:
+    """(alert_history id, timestamp) of each counted email per user in the last 24h."""
+    cutoff = datetime.now(timezone.utc) - WINDOW
+    result = await db.execute(
+        select(AlertHistory.user_id, AlertHistory.id, AlertHistory.created_at).where(
+            AlertHistory.user_id.in_(user_ids),
+            AlertHistory.delivery_status.in_(COUNTED_STATUSES),
+            AlertHistory.created_at >= cutoff,
+        )
+    )
+    history: dict[uuid.UUID, list[tuple[str, float]]] = {}
+    for user_id, history_id, created_at in result.all():
+        history.setdefault(user_id, []).append((str(history_id), created_at.timestamp()))
+    return history
+
+
+async def _seed(redis, db: AsyncSession, user_ids: list) -> dict:
+    history = await _history_in_window(db, user_ids)
+    ttl = int(WINDOW.total_seconds())
+    pipe = redis.pipeline(transaction=False)
+    for user_id in user_ids:
+        entries = history.get(user_id, [])
+        pipe.delete(_key(user_id))
+        if entries:
+            pipe.zadd(_key(user_id), dict(entries))
+            pipe.expire(_key(user_id), ttl)
+        pipe.set(_seeded_key(user_id), "1", ex=ttl)
+    await pipe.execute()
+    return {user_id: len(history.get(user_id, [])) for user_id in user_ids}
+
+
+async def remaining_quota(db: AsyncSession, user_ids) -> dict:
+    """Alert emails each user may still receive in the current 24h window."""
+    user_ids = list(dict.fromkeys(user_ids))
+    if not user_ids:
+        return {}
+
+    redis = get_redis()
+    if redis is None:
+        used = {uid: len(entries) for uid, entries in (await _history_in_window(db, user_ids)).items()}
+    else:
+        try:
+            used = await _used_from_redis(redis, db, user_ids)
+        except RedisError as e:
+            logger.warning("rate_cap.redis_unavailable", error=str(e))
+            used = {uid: len(entries) for uid, entries in (await _history_in_window(db, user_ids)).items()}
+
+    return {uid: max(0, RATE_CAP_PER_DAY - used.get(uid, 0)) for uid in user_ids}
+
+
+async def _used_from_redis(redis, db: AsyncSession, user_ids: list) -> dict:
+    window_start = time.time() - WINDOW.total_seconds()
+    pipe = redis.pipeline(transaction=False)
+    for user_id in user_ids:
+        pipe.zremrangebyscore(_key(user_id), "-inf", window_start)
+        pipe.zcard(_key(user_id))
+        pipe.exists(_seeded_key(user_id))
+    replies = await pipe.execute()
+
+    used: dict = {}
+    unseeded = []
+    for i, user_id in enumerate(user_ids):
+        _, count, seeded = replies[3 * i : 3 * i + 3]
+        if seeded:
+            used[user_id] = count
+        else:
+            unseeded.append(user_id)
+
+    if unseeded:
+        used.update(await _seed(redis, db, unseeded))
+    return used
+
+
+async def record_alert_emails(entries: list[tuple[uuid.UUID, uuid.UUID]]) -> None:
+    """Count queued emails, given as (user_id, alert_history_id) pairs, against each user's window.
+
+    Recorded when the email is queued, before the caller commits, so a rolled
+    back batch can only over-count — the cap errs towards sending less.
+    """
+    redis = get_redis()
+    if redis is None or not entries:
+        return
+
+    now = time.time()
+    ttl = int(WINDOW.total_seconds())
+    try:
+        pipe = redis.pipeline(transaction=False)
+        for user_id, history_id in entries:
+            pipe.zadd(_key(user_id), {str(history_id): now})
+            pipe.expire(_key(user_id), ttl)
+        await pipe.execute()
+    except RedisError as e:
+        logger.warning("rate_cap.record_failed", error=str(e), count=len(entries))
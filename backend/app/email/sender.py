@@ -1,101 +1,115 @@
-from datetime import datetime, timedelta, timezone
+import uuid
 
-import resend
 import structlog
-from sqlalchemy import func as sa_func
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.config import settings
+from app.email.alert_index import AlertIndex
+from app.email.outbox import build_email, enqueue_emails
+from app.email.rate_cap import record_alert_emails, remaining_quota
 from app.models import Alert, AlertHistory, Company, Signal, User, Watchlist
 
 logger = structlog.get_logger()
 
-resend.api_key = settings.resend_api_key
 
-RATE_CAP_PER_DAY = 20
-
-
-def _signal_matches_alert(signal: Signal, alert: Alert) -> bool:
-    """Check if a signal matches an alert's filter criteria."""
-    if alert.signal_types and signal.signal_type not in alert.signal_types:
-        return False
-    if signal.confidence_score < alert.min_confidence_score:
-        return False
-    if signal.severity_score < alert.min_severity_score:
-        return False
-    if alert.states and signal.location_state and signal.location_state not in alert.states:
-        return False
-    if alert.company_ids and signal.company_id not in alert.company_ids:
-        return False
-    return True
-
-
-async def _is_rate_capped(db: AsyncSession, user_id) -> bool:
-    """Check if a user has exceeded the daily email rate cap."""
-    cutoff = datetime.now(timezone.utc) - timedelta(hours=24)
-    result = await db.execute(
-        select(sa_func.count())
-        .select_from(AlertHistory)
-        .where(
-            AlertHistory.user_id == user_id,
-            AlertHistory.delivery_status == "sent",
-            AlertHistory.created_at >= cutoff,
-        )
-    )
-    count = result.scalar_one()
-    return count >= RATE_CAP_PER_DAY
+async def match_realtime_alerts(db: AsyncSession, signals: list[Signal]) -> int:
+    """Match a batch of new signals against all active real-time alerts and queue emails.
 
+    Alerts are loaded once into an ``AlertIndex``; watchlist membership, users,
+    companies and rate-cap state (``rate_cap.remaining_quota``) are preloaded
+    in bulk. Emails are written to the outbox in the caller's transaction;
+    delivery happens in the email worker, so this never waits on provider I/O.
+    """
+    if not signals:
+        return 0
+    if not settings.resend_api_key:
+        logger.warning("email.skipped", reason="no_resend_key")
+        return 0
 
-async def match_and_send_realtime_alerts(db: AsyncSession, signal: Signal) -> int:
-    """Match a signal against all active real-time alerts and send emails."""
     result = await db.execute(
         select(Alert).where(Alert.frequency == "realtime", Alert.is_active == True)
     )
-    alerts = result.scalars().all()
-
-    sent = 0
-    for alert in alerts:
-        if not _signal_matches_alert(signal, alert):
-            continue
-
-        # watchlist_only: signal's company must be on the alert owner's tenant watchlist
-        if alert.watchlist_only:
-            wl_result = await db.execute(
-                select(Watchlist.id).where(
-                    Watchlist.tenant_id == alert.tenant_id,
-                    Watchlist.company_id == signal.company_id,
-                ).limit(1)
+    index = AlertIndex(result.scalars().all())
+
+    matches = [(signal, alert) for signal in signals for alert in index.match(signal)]
+    if not matches:
+        return 0
+
+    # watchlist_only: signal's company must be on the alert owner's tenant watchlist
+    watch_tenants = {alert.tenant_id for _, alert in matches if alert.watchlist_only}
+    if watch_tenants:
+        wl_result = await db.execute(
+            select(Watchlist.tenant_id, Watchlist.company_id).where(
+                Watchlist.tenant_id.in_(watch_tenants),
+                Watchlist.company_id.in_({signal.company_id for signal, _ in matches}),
             )
-            if not wl_result.scalar_one_or_none():
-                continue
+        )
+        watched = set(wl_result.all())
+        matches = [
+            (signal, alert) for signal, alert in matches
+            if not alert.watchlist_only or (alert.tenant_id, signal.company_id) in watched
+        ]
+
+    user_result = await db.execute(select(User).where(User.id.in_({alert.user_id for _, alert in matches})))
+    users = {user.id: user for user in user_result.scalars().all()}
+    remaining = await remaining_quota(db, list(users))
+
+    company_result = await db.execute(
+        select(Company.id, Company.name).where(Company.id.in_({signal.company_id for signal, _ in matches}))
+    )
+    company_names = dict(company_result.all())
 
-        user = await db.get(User, alert.user_id)
+    emails: list[dict] = []
+    counted: list[tuple] = []
+    for signal, alert in matches:
+        user = users.get(alert.user_id)
         if not user:
             continue
-
-        if await _is_rate_capped(db, user.id):
+        if remaining[user.id] <= 0:
             logger.warning("email.rate_capped", user_id=str(user.id))
             continue
+        remaining[user.id] -= 1
 
-        await send_signal_alert(db, signal, alert, user)
-        sent += 1
-
-    if sent:
-        logger.info("alerts.realtime_matched", signal_id=str(signal.id), sent=sent)
-
-    return sent
+        subject, html = _render_signal_alert(signal, company_names.get(signal.company_id) or "Unknown Company")
+        history = AlertHistory(
+            id=uuid.uuid4(),
+            alert_id=alert.id,
+            tenant_id=alert.tenant_id,
+            user_id=user.id,
+            signal_id=signal.id,
+            delivery_status="queued",
+            subject=subject,
+        )
+        db.add(history)
+        counted.append((user.id, history.id))
+        emails.append(
+            build_email(
+                kind="signal_alert",
+                idempotency_key=f"alert:{alert.id}:{signal.id}",
+                to=user.email,
+                subject=subject,
+                html=html,
+                alert_history_id=history.id,
+            )
+        )
 
+    if emails:
+        await db.flush()
+        await enqueue_emails(db, emails)
+        await record_alert_emails(counted)
+        logger.info(
+            "alerts.realtime_matched",
+            signals=len(signals),
+            alerts_indexed=index.size,
+            queued=len(emails),
+        )
 
-async def send_signal_alert(db: AsyncSession, signal: Signal, alert: Alert, user: User):
-    """Send a real-time signal alert email."""
-    if not settings.resend_api_key:
-        logger.warning("email.skipped", reason="no_resend_key")
-        return
+    return len(emails)
 
-    company = await db.get(Company, signal.company_id)
-    company_name = company.name if company else "Unknown Company"
 
+def _render_signal_alert(signal: Signal, company_name: str) -> tuple[str, str]:
+    """Build the (subject, html) of a real-time signal alert email."""
     subject = f"[DispoSight] {signal.signal_type.upper()}: {company_name} (Score: {signal.severity_score})"
 
     html = f"""
@@ -127,115 +141,4 @@ async def send_signal_alert(db: AsyncSession, signal: Signal, alert: Alert, user
     </div>
     """
 
-    try:
-        resend.Emails.send({
-            "from": settings.from_email,
-            "to": user.email,
-            "subject": subject,
-            "html": html,
-        })
-
-        history = AlertHistory(
-            alert_id=alert.id,
-            tenant_id=alert.tenant_id,
-            user_id=user.id,
-            signal_id=signal.id,
-            delivery_status="sent",
-            subject=subject,
-            delivered_at=datetime.now(timezone.utc),
-        )
-        db.add(history)
-
-        logger.info("email.sent", user=user.email, signal_id=str(signal.id))
-
-    except Exception as e:
-        history = AlertHistory(
-            alert_id=alert.id,
-            tenant_id=alert.tenant_id,
-            user_id=user.id,
-            signal_id=signal.id,
-            delivery_status="failed",
-            subject=subject,
-            error_message=str(e)[:500],
-        )
-        db.add(history)
-        logger.error("email.failed", user=user.email, error=str(e))
-
-
-async def send_digest(db: AsyncSession, frequency: str = "daily"):
-    """Send digest emails to all users with matching alert frequency."""
-    if not settings.resend_api_key:
-        logger.warning("email.digest_skipped", reason="no_resend_key")
-        return
-
-    hours = 24 if frequency == "daily" else 168
-    cutoff = datetime.now(timezone.utc) - timedelta(hours=hours)
-
-    # Get recent signals
-    result = await db.execute(
-        select(Signal)
-        .where(Signal.created_at >= cutoff)
-        .order_by(Signal.severity_score.desc())
-        .limit(20)
-    )
-    signals = result.scalars().all()
-
-    if not signals:
-        return
-
-    # Get alerts with matching frequency
-    result = await db.execute(
-        select(Alert).where(Alert.frequency == frequency, Alert.is_active == True)
-    )
-    alerts = result.scalars().all()
-
-    for alert in alerts:
-        user = await db.get(User, alert.user_id)
-        if not user:
-            continue
-
-        # Filter signals to only those matching this alert's criteria
-        matched = [s for s in signals if _signal_matches_alert(s, alert)]
-        if not matched:
-            continue
-
-        subject = f"[DispoSight] {'Daily' if frequency == 'daily' else 'Weekly'} Intelligence Digest — {len(matched)} signals"
-
-        signal_rows = ""
-        for s in matched[:10]:
-            company = await db.get(Company, s.company_id)
-            color = "#EF4444" if s.severity_score >= 80 else "#F97316" if s.severity_score >= 60 else "#EAB308" if s.severity_score >= 40 else "#22C55E"
-            signal_rows += f"""
-            <tr>
-                <td style="padding: 8px; border-bottom: 1px solid #27272A;">{company.name if company else '?'}</td>
-                <td style="padding: 8px; border-bottom: 1px solid #27272A;">{s.signal_type}</td>
-                <td style="padding: 8px; border-bottom: 1px solid #27272A; font-family: monospace; color: {color};">{s.severity_score}</td>
-            </tr>
-            """
-
-        html = f"""
-        <div style="font-family: system-ui, sans-serif; max-width: 600px; margin: 0 auto; background: #09090B; color: #FAFAFA; padding: 24px; border-radius: 8px;">
-            <h2 style="color: #10B981;">Intelligence Digest</h2>
-            <p style="color: #A1A1AA;">{len(matched)} new signals in the last {'24 hours' if frequency == 'daily' else 'week'}.</p>
-            <table style="width: 100%; border-collapse: collapse;">
-                <tr style="color: #71717A; font-size: 12px;">
-                    <th style="text-align: left; padding: 8px;">Company</th>
-                    <th style="text-align: left; padding: 8px;">Type</th>
-                    <th style="text-align: left; padding: 8px;">Score</th>
-                </tr>
-                {signal_rows}
-            </table>
-            <a href="{settings.frontend_url}/dashboard" style="display: inline-block; background: #10B981; color: #fff; padding: 10px 20px; border-radius: 6px; text-decoration: none; font-weight: 500; margin-top: 16px;">View Dashboard</a>
-        </div>
-        """
-
-        try:
-            resend.Emails.send({
-                "from": settings.from_email,
-                "to": user.email,
-                "subject": subject,
-                "html": html,
-            })
-            logger.info("email.digest_sent", user=user.email, frequency=frequency)
-        except Exception as e:
-            logger.error("email.digest_failed", user=user.email, error=str(e))
+    return subject, html
@@ -10,9 +10,11 @@ from datetime import datetime, timezone
 from email.utils import parsedate_to_datetime
 
 import feedparser
+import httpx
 import structlog
 from tenacity import retry, stop_after_attempt, wait_exponential
 
+from app.core.blocking import run_blocking
 from app.ingestion.base import BaseCollector
 
 logger = structlog.get_logger()
@@ -46,8 +48,15 @@ class GlobeNewswireCollector(BaseCollector):
 
     @retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, max=16))
     async def _fetch_feed(self, url: str) -> list[dict]:
-        """Parse an RSS feed and return entry dicts."""
-        feed = feedparser.parse(url)
+        """Fetch an RSS feed and return entry dicts.
+
+        feedparser.parse(url) does its own blocking HTTP, so the download goes
+        through httpx and only the parse runs in the thread pool.
+        """
+        async with httpx.AsyncClient(timeout=30, follow_redirects=True) as client:
+            response = await client.get(url)
+            response.raise_for_status()
+        feed = await run_blocking(feedparser.parse, response.content)
         if feed.bozo and not feed.entries:
             raise ValueError(f"Feed parse error: {feed.bozo_exception}")
         return feed.entries
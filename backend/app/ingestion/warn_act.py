@@ -7,6 +7,7 @@ import openpyxl
 import structlog
 from tenacity import retry, stop_after_attempt, wait_exponential
 
+from app.core.blocking import run_blocking
 from app.ingestion.base import BaseCollector
 
 logger = structlog.get_logger()
@@ -40,7 +41,8 @@ class WarnActCollector(BaseCollector):
         # California (existing)
         try:
             xlsx_bytes = await self._fetch_xlsx(CA_WARN_URL)
-            ca_signals = self._parse_california_xlsx(xlsx_bytes)
+            # openpyxl parsing is CPU-bound — keep it off the event loop
+            ca_signals = await run_blocking(self._parse_california_xlsx, xlsx_bytes)
             signals.extend(ca_signals)
             logger.info("warn_act.california_fetched", count=len(ca_signals))
         except Exception as e:
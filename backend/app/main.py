@@ -1,4 +1,5 @@
 import uuid
+from contextlib import asynccontextmanager
 
 import sentry_sdk
 import structlog
@@ -92,12 +93,38 @@ class SecurityHeadersMiddleware(BaseHTTPMiddleware):
         return response
 
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    from app.contacts.browser_pool import browser_pool
+    from app.contacts.page_fetcher import close_http_client
+    from app.core.blocking import shutdown_executor
+    from app.core.jobs import close_job_pool
+    from app.core.loop_monitor import start_loop_monitor, stop_loop_monitor
+    from app.core.redis import close_redis
+    from app.processing.sec_reference import sec_reference
+    from app.services.resend_client import resend_client
+    from app.services.stripe_client import close_stripe_client
+
+    start_loop_monitor()
+    yield
+    await stop_loop_monitor()
+    await resend_client.aclose()
+    await close_http_client()
+    await browser_pool.close()
+    await sec_reference.close()
+    await close_stripe_client()
+    await close_job_pool()
+    await close_redis()
+    shutdown_executor()
+
+
 def create_app() -> FastAPI:
     app = FastAPI(
         title=settings.app_name,
         version="0.1.0",
         docs_url="/api/docs" if settings.debug else None,
         redoc_url=None,
+        lifespan=lifespan,
     )
 
     origins = [settings.frontend_url]
@@ -166,10 +193,10 @@ def create_app() -> FastAPI:
 
         # Check Redis
         try:
-            import redis
-            if settings.redis_url:
-                r = redis.from_url(settings.redis_url, socket_connect_timeout=2)
-                r.ping()
+            from app.core.redis import get_redis
+            r = get_redis()
+            if r is not None:
+                await r.ping()
             else:
                 checks["redis"] = "not configured"
         except Exception as e:
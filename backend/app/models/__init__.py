@@ -12,6 +12,8 @@ from app.models.subscription import Subscription
 from app.models.contact import Contact
 from app.models.email_pattern import EmailPattern
 from app.models.pipeline_activity import PipelineActivity
+from app.models.email_outbox import EmailOutbox
+from app.models.correlation_group import CorrelationGroup
 
 __all__ = [
     "Base",
@@ -28,4 +30,6 @@ __all__ = [
     "Contact",
     "EmailPattern",
     "PipelineActivity",
+    "EmailOutbox",
+    "CorrelationGroup",
 ]
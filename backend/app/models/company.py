@@ -2,7 +2,7 @@ import uuid
 from datetime import datetime
 from decimal import Decimal
 
-from sqlalchemy import DateTime, Integer, Numeric, String, func
+from sqlalchemy import DateTime, Index, Integer, Numeric, String, func, text
 from sqlalchemy.dialects.postgresql import JSONB, UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -11,6 +11,14 @@ from app.models.base import Base
 
 class Company(Base):
     __tablename__ = "companies"
+    __table_args__ = (
+        Index(
+            "ix_companies_enrichment_pending",
+            "enrichment_priority",
+            "created_at",
+            postgresql_where=text("enrichment_status = 'pending'"),
+        ),
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     name: Mapped[str] = mapped_column(String(500), nullable=False)
@@ -31,6 +39,7 @@ class Company(Base):
     last_signal_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
     risk_trend: Mapped[str] = mapped_column(String(20), server_default="stable")
     enrichment_status: Mapped[str] = mapped_column(String(50), server_default="pending")
+    enrichment_priority: Mapped[int] = mapped_column(Integer, server_default="0")
     enriched_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
     contacts_found_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
     metadata_: Mapped[dict] = mapped_column("metadata", JSONB, server_default="{}")
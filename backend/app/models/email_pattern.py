@@ -2,7 +2,7 @@ import uuid
 from datetime import datetime
 
 from sqlalchemy import Boolean, DateTime, String, func
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.dialects.postgresql import ARRAY, UUID
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.models.base import Base
@@ -16,6 +16,11 @@ class EmailPattern(Base):
     pattern: Mapped[str | None] = mapped_column(String(100))
     mx_valid: Mapped[bool | None] = mapped_column(Boolean)
     has_catch_all: Mapped[bool | None] = mapped_column(Boolean)
+    catch_all_checked_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
+    mx_hosts: Mapped[list | None] = mapped_column(ARRAY(String(255)))
+    mx_checked_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
+    smtp_blocked: Mapped[bool | None] = mapped_column(Boolean)
+    smtp_checked_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))  # When smtp_blocked was seen
 
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), server_default=func.now(), nullable=False
@@ -1,6 +1,6 @@
 from datetime import date, datetime
 
-from sqlalchemy import Date, DateTime, Integer, String, Text, func
+from sqlalchemy import Date, DateTime, Index, Integer, String, Text, func, text
 from sqlalchemy.dialects.postgresql import JSONB, UUID
 from sqlalchemy.orm import Mapped, mapped_column
 
@@ -11,6 +11,13 @@ import uuid
 
 class RawSignal(Base):
     __tablename__ = "raw_signals"
+    __table_args__ = (
+        Index(
+            "ix_raw_signals_pending",
+            "created_at",
+            postgresql_where=text("processing_status = 'raw'"),
+        ),
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     source_type: Mapped[str] = mapped_column(String(50), nullable=False)
@@ -24,6 +31,9 @@ class RawSignal(Base):
     content_hash: Mapped[str | None] = mapped_column(String(64))
     processing_status: Mapped[str] = mapped_column(String(50), server_default="raw")
     discard_reason: Mapped[str | None] = mapped_column(String(255))
+    attempt_count: Mapped[int] = mapped_column(Integer, server_default="0", nullable=False)
+    next_attempt_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
+    last_error: Mapped[str | None] = mapped_column(Text)
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), server_default=func.now(), nullable=False
     )
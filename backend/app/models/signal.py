@@ -2,7 +2,7 @@ import uuid
 from datetime import datetime
 from decimal import Decimal
 
-from sqlalchemy import DateTime, ForeignKey, Integer, Numeric, String, Text, func
+from sqlalchemy import DateTime, ForeignKey, Index, Integer, Numeric, String, Text, func
 from sqlalchemy.dialects.postgresql import JSONB, UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -11,6 +11,9 @@ from app.models.base import Base
 
 class Signal(Base):
     __tablename__ = "signals"
+    __table_args__ = (
+        Index("ix_signals_company_type_published", "company_id", "signal_type", "source_published_at"),
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     raw_signal_id: Mapped[uuid.UUID | None] = mapped_column(
@@ -34,7 +37,9 @@ class Signal(Base):
     location_lng: Mapped[Decimal | None] = mapped_column(Numeric(10, 7))
     affected_employees: Mapped[int | None] = mapped_column(Integer)
     extracted_entities: Mapped[dict] = mapped_column(JSONB, server_default="[]")
-    correlation_group_id: Mapped[uuid.UUID | None] = mapped_column(UUID(as_uuid=True))
+    correlation_group_id: Mapped[uuid.UUID | None] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("correlation_groups.id", ondelete="SET NULL")
+    )
     device_estimate: Mapped[int | None] = mapped_column(Integer)
     metadata_: Mapped[dict] = mapped_column("metadata", JSONB, server_default="{}")
     created_at: Mapped[datetime] = mapped_column(
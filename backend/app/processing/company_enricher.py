@@ -3,20 +3,29 @@
 Two-stage enrichment:
   Stage 1 — SEC EDGAR: Match against public company tickers, fetch SIC/industry/state.
   Stage 2 — LLM Fallback: For private companies, estimate employee_count and industry via gpt-4o-mini.
+
+Batches are enriched concurrently. SEC requests are paced by the shared
+sec.gov token bucket in ``sec_reference``. Companies the SEC cannot fully
+enrich are then estimated together, up to LLM_BATCH_SIZE per prompt, with
+those prompts in their own smaller pool. Their recent signals are loaded in
+one query up front so the concurrent tasks never share the database session.
 """
 
 import asyncio
-import re
 from datetime import datetime, timezone
+from uuid import UUID
 
-import httpx
 import structlog
-from sqlalchemy import select
+from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.config import settings
+from app.core.blocking import run_blocking
 from app.models import Company, Signal
+from app.processing.enrichment_queue import claim_order
 from app.processing.llm_client import llm_client
+from app.processing.sec_matcher import SecTickerMatcher
+from app.processing.sec_reference import sec_reference
 
 logger = structlog.get_logger()
 
@@ -34,113 +43,87 @@ SIC_INDUSTRY_MAP = [
     (9100, 9999, "Public Administration", "Public Administration"),
 ]
 
-# Suffixes to strip during normalization
-_SUFFIXES = [
-    ", inc.", ", inc", " inc.", " inc",
-    ", llc", " llc",
-    ", ltd.", ", ltd", " ltd.", " ltd",
-    ", corp.", " corp.", ", corp", " corp",
-    " co.", " co",
-    " company", " companies",
-    " group", " holdings", " international",
-    ", l.p.", " l.p.", " lp",
-    " plc", ", plc",
-    " sa", " ag", " nv", " se",
-    " the",
-]
-
+SIGNAL_CONTEXT_LIMIT = 5
+LLM_BATCH_SIZE = 20  # Companies per firmographics prompt
+LLM_TOKENS_PER_COMPANY = 96  # A reply object is ~40 tokens; headroom so the array is not cut off
+MIN_LLM_CONFIDENCE = 40
+MAX_EMPLOYEE_COUNT = 3_000_000
 
-class CompanyEnricher:
-    """Enriches company records with firmographic data from SEC EDGAR and LLM."""
+LLM_BATCH_PROMPT = """Estimate firmographic data for each numbered company below. Return JSON only.
 
-    def __init__(self, db: AsyncSession):
-        self.db = db
-        self._sec_tickers: dict | None = None
-        self._last_sec_request = 0.0
-
-    async def _rate_limit_sec(self):
-        """Enforce SEC's 10 requests/second rate limit."""
-        now = asyncio.get_event_loop().time()
-        elapsed = now - self._last_sec_request
-        if elapsed < 0.1:
-            await asyncio.sleep(0.1 - elapsed)
-        self._last_sec_request = asyncio.get_event_loop().time()
-
-    async def _fetch_sec_tickers(self) -> dict:
-        """Fetch and cache the SEC company tickers file (~13k public companies)."""
-        if self._sec_tickers is not None:
-            return self._sec_tickers
-
-        url = "https://www.sec.gov/files/company_tickers.json"
-        headers = {"User-Agent": settings.sec_user_agent}
-
-        for attempt in range(3):
-            try:
-                await self._rate_limit_sec()
-                async with httpx.AsyncClient(timeout=30) as client:
-                    resp = await client.get(url, headers=headers)
-                    resp.raise_for_status()
-                    self._sec_tickers = resp.json()
-                    logger.info("enricher.sec_tickers_loaded", count=len(self._sec_tickers))
-                    return self._sec_tickers
-            except Exception as e:
-                logger.warning("enricher.sec_tickers_fetch_failed", attempt=attempt + 1, error=str(e))
-                if attempt < 2:
-                    await asyncio.sleep(2 ** attempt)
-
-        self._sec_tickers = {}
-        return self._sec_tickers
-
-    @staticmethod
-    def _normalize_for_matching(name: str) -> str:
-        """Aggressive normalization for company name matching."""
-        name = name.strip().lower()
-        for suffix in _SUFFIXES:
-            if name.endswith(suffix):
-                name = name[: -len(suffix)]
-        name = re.sub(r"[^\w\s]", "", name)
-        name = re.sub(r"\s+", " ", name).strip()
-        return name
-
-    def _find_sec_match(self, company_name: str, tickers_data: dict) -> dict | None:
-        """Find a matching SEC company by normalized name."""
-        target = self._normalize_for_matching(company_name)
-        if not target or len(target) < 3:
-            return None
+{companies}
 
-        # Build lookup: normalized_name → entry (on first call per batch)
-        best_match = None
+Return ONLY a JSON array (no markdown, no code blocks) with one object per company:
+- "id": the company's number from the list above (integer)
+- "employee_count": estimated number of employees (integer, or null if unknown)
+- "industry": industry category (string, e.g. "Technology", "Manufacturing", "Retail Trade", "Financial Services", "Healthcare")
+- "confidence": your confidence in these estimates (integer 0-100)
 
-        for entry in tickers_data.values():
-            sec_name = entry.get("title", "")
-            sec_normalized = self._normalize_for_matching(sec_name)
+JSON:"""
 
-            # Exact match
-            if sec_normalized == target:
-                return entry
+# Built once per process from the SEC tickers file; see sec_matcher
+_sec_matcher: SecTickerMatcher | None = None
+_sec_matcher_source: dict | None = None
+_sec_matcher_lock = asyncio.Lock()
 
-            # Containment match (only for names >= 5 chars to avoid false positives)
-            if len(target) >= 5 and (target in sec_normalized or sec_normalized in target):
-                if best_match is None or len(sec_normalized) < len(best_match.get("title", "")):
-                    best_match = entry
 
-        return best_match
+class CompanyEnricher:
+    """Enriches company records with firmographic data from SEC EDGAR and LLM."""
 
-    async def _fetch_sec_submissions(self, cik: int) -> dict | None:
-        """Fetch detailed SEC submission data for a company by CIK."""
-        cik_padded = str(cik).zfill(10)
-        url = f"https://data.sec.gov/submissions/CIK{cik_padded}.json"
-        headers = {"User-Agent": settings.sec_user_agent}
+    def __init__(self, db: AsyncSession, llm_concurrency: int | None = None):
+        self.db = db
+        self._llm_slots = asyncio.Semaphore(llm_concurrency or settings.enrichment_llm_concurrency)
+        self._signal_context: dict[UUID, list] = {}
 
-        try:
-            await self._rate_limit_sec()
-            async with httpx.AsyncClient(timeout=30) as client:
-                resp = await client.get(url, headers=headers)
-                resp.raise_for_status()
-                return resp.json()
-        except Exception as e:
-            logger.warning("enricher.sec_submissions_failed", cik=cik, error=str(e))
+    async def _get_sec_matcher(self) -> SecTickerMatcher | None:
+        """Return the process-wide indexed matcher, rebuilding it when the tickers change."""
+        global _sec_matcher, _sec_matcher_source
+        tickers = await sec_reference.tickers()
+        if not tickers:
             return None
+        async with _sec_matcher_lock:
+            if _sec_matcher is None or tickers is not _sec_matcher_source:
+                _sec_matcher = await run_blocking(SecTickerMatcher, tickers)
+                _sec_matcher_source = tickers
+                logger.info("enricher.sec_matcher_built", entries=len(_sec_matcher))
+        return _sec_matcher
+
+    async def preload_signal_context(self, company_ids: list[UUID]) -> None:
+        """Load the most recent signals for every company in one query."""
+        ranked = (
+            select(
+                Signal.company_id,
+                Signal.signal_type,
+                Signal.title,
+                Signal.source_name,
+                Signal.created_at,
+                func.row_number()
+                .over(partition_by=Signal.company_id, order_by=Signal.created_at.desc())
+                .label("rank"),
+            )
+            .where(Signal.company_id.in_(company_ids))
+            .subquery()
+        )
+        result = await self.db.execute(
+            select(ranked)
+            .where(ranked.c.rank <= SIGNAL_CONTEXT_LIMIT)
+            .order_by(ranked.c.company_id, ranked.c.rank)
+        )
+        context: dict[UUID, list] = {company_id: [] for company_id in company_ids}
+        for row in result.all():
+            context[row.company_id].append(row)
+        self._signal_context.update(context)
+
+    async def _recent_signals(self, company: Company) -> list:
+        if company.id in self._signal_context:
+            return self._signal_context[company.id]
+        result = await self.db.execute(
+            select(Signal)
+            .where(Signal.company_id == company.id)
+            .order_by(Signal.created_at.desc())
+            .limit(SIGNAL_CONTEXT_LIMIT)
+        )
+        return list(result.scalars().all())
 
     @staticmethod
     def _map_sic_to_industry(sic_code: str) -> tuple[str | None, str | None]:
@@ -157,11 +140,11 @@ class CompanyEnricher:
 
     async def _enrich_from_sec(self, company: Company) -> bool:
         """Stage 1: Enrich company from SEC EDGAR data. Returns True if enriched."""
-        tickers = await self._fetch_sec_tickers()
-        if not tickers:
+        matcher = await self._get_sec_matcher()
+        if matcher is None:
             return False
 
-        match = self._find_sec_match(company.name, tickers)
+        match = matcher.match(company.name)
         if not match:
             return False
 
@@ -175,7 +158,7 @@ class CompanyEnricher:
             company.cik = str(cik)
 
         # Fetch detailed submissions for SIC code, state, etc.
-        submissions = await self._fetch_sec_submissions(cik)
+        submissions = await sec_reference.submissions(cik)
         if submissions:
             sic_code = submissions.get("sic")
             if sic_code and not company.sic_code:
@@ -199,107 +182,223 @@ class CompanyEnricher:
         )
         return True
 
-    async def _enrich_from_llm(self, company: Company) -> bool:
-        """Stage 2: Enrich company using LLM estimation. Returns True if enriched."""
-        # Gather signal context for this company
-        result = await self.db.execute(
-            select(Signal)
-            .where(Signal.company_id == company.id)
-            .order_by(Signal.created_at.desc())
-            .limit(5)
-        )
-        signals = result.scalars().all()
-
-        signal_context = ""
-        if signals:
-            lines = []
-            for s in signals:
-                lines.append(f"- {s.signal_type}: {s.title} ({s.source_name})")
-            signal_context = "\n".join(lines)
-
-        location_info = ""
+    @staticmethod
+    def _describe(company: Company, signals: list) -> str:
+        lines = [f"Company name: {company.name}"]
         if company.headquarters_city or company.headquarters_state:
             parts = [p for p in [company.headquarters_city, company.headquarters_state] if p]
-            location_info = "Location: " + ", ".join(parts)
+            lines.append("Location: " + ", ".join(parts))
+        if signals:
+            lines.append("Recent signals:")
+            lines.extend(f"- {s.signal_type}: {s.title} ({s.source_name})" for s in signals)
+        return "\n".join(lines)
 
-        prompt_parts = [
-            "Estimate firmographic data for this company. Return JSON only.",
-            "",
-            f"Company name: {company.name}",
-        ]
-        if location_info:
-            prompt_parts.append(location_info)
-        if signal_context:
-            prompt_parts.append(f"Recent signals:\n{signal_context}")
-        prompt_parts.extend([
-            "",
-            'Return ONLY valid JSON with these fields:',
-            '- "employee_count": estimated number of employees (integer, or null if unknown)',
-            '- "industry": industry category (string, e.g. "Technology", "Manufacturing", "Retail Trade", "Financial Services", "Healthcare")',
-            '- "confidence": your confidence in these estimates (integer 0-100)',
-            "",
-            "JSON:",
-        ])
-        prompt = "\n".join(prompt_parts)
+    @staticmethod
+    def _apply_estimate(company: Company, estimate: dict) -> bool:
+        """Copy a validated estimate onto the company. Returns True if it was confident enough."""
+        confidence = estimate["confidence"]
+        if confidence < MIN_LLM_CONFIDENCE:
+            logger.info("enricher.llm_low_confidence", company=company.name, confidence=confidence)
+            return False
+
+        if estimate["employee_count"] and not company.employee_count:
+            company.employee_count = estimate["employee_count"]
+        if estimate["industry"] and not company.industry:
+            company.industry = estimate["industry"]
+
+        logger.info(
+            "enricher.llm_enriched",
+            company=company.name,
+            employee_count=company.employee_count,
+            industry=company.industry,
+            confidence=confidence,
+        )
+        return True
+
+    async def _estimate_chunk(self, companies: list[Company]) -> tuple[set[UUID], set[UUID]]:
+        """One LLM request for up to LLM_BATCH_SIZE companies.
+
+        Returns (ids enriched, ids with no usable reply). A reply that does not
+        parse, usually one cut off at max_tokens, is retried as two halves down
+        to single companies, so one bad reply does not cost the whole chunk.
+        """
+        blocks = []
+        for number, company in enumerate(companies, start=1):
+            signals = await self._recent_signals(company)
+            blocks.append(f"[{number}] {self._describe(company, signals)}")
+        prompt = LLM_BATCH_PROMPT.format(companies="\n\n".join(blocks))
 
         try:
-            result = await llm_client.complete_json(prompt, model="haiku", max_tokens=256)
-            confidence = result.get("confidence", 0)
-            if confidence < 40:
-                logger.info("enricher.llm_low_confidence", company=company.name, confidence=confidence)
-                return False
-
-            employee_count = result.get("employee_count")
-            industry = result.get("industry")
-
-            if employee_count and not company.employee_count:
-                company.employee_count = int(employee_count)
-            if industry and not company.industry:
-                company.industry = str(industry)
-
-            logger.info(
-                "enricher.llm_enriched",
-                company=company.name,
-                employee_count=company.employee_count,
-                industry=company.industry,
-                confidence=confidence,
+            async with self._llm_slots:
+                result = await llm_client.complete_json(
+                    prompt, model="haiku", max_tokens=64 + LLM_TOKENS_PER_COMPANY * len(companies)
+                )
+        except ValueError as e:  # Includes json.JSONDecodeError
+            if len(companies) == 1:
+                logger.warning("enricher.llm_unparseable", company=companies[0].name, error=str(e))
+                return set(), {companies[0].id}
+            logger.info("enricher.llm_unparseable_split", companies=len(companies), error=str(e))
+            middle = len(companies) // 2
+            halves = await asyncio.gather(
+                self._estimate_chunk(companies[:middle]), self._estimate_chunk(companies[middle:])
             )
-            return True
-
+            return halves[0][0] | halves[1][0], halves[0][1] | halves[1][1]
         except Exception as e:
-            logger.warning("enricher.llm_failed", company=company.name, error=str(e))
-            return False
+            logger.warning("enricher.llm_failed", companies=len(companies), error=str(e))
+            return set(), {c.id for c in companies}
+
+        estimates = parse_firmographic_estimates(result, len(companies))
+        if len(estimates) < len(companies):
+            logger.info("enricher.llm_missing_estimates", companies=len(companies), estimates=len(estimates))
+
+        enriched = set()
+        for number, estimate in estimates.items():
+            company = companies[number - 1]
+            if self._apply_estimate(company, estimate):
+                enriched.add(company.id)
+        return enriched, set()
+
+    async def _enrich_batch_from_llm(self, companies: list[Company]) -> tuple[set[UUID], set[UUID]]:
+        """Stage 2: Estimate firmographics in chunked prompts.
+
+        Returns (ids enriched, ids the LLM could not answer for).
+        """
+        chunks = [companies[i : i + LLM_BATCH_SIZE] for i in range(0, len(companies), LLM_BATCH_SIZE)]
+        enriched: set[UUID] = set()
+        unanswered: set[UUID] = set()
+        for ok, failed in await asyncio.gather(*(self._estimate_chunk(chunk) for chunk in chunks)):
+            enriched |= ok
+            unanswered |= failed
+        return enriched, unanswered
+
+    async def _enrich_from_llm(self, company: Company) -> bool | None:
+        """Stage 2 for a single company. True if enriched, None if the LLM gave no answer."""
+        enriched, unanswered = await self._enrich_batch_from_llm([company])
+        return None if company.id in unanswered else company.id in enriched
+
+    @staticmethod
+    def _sec_complete(company: Company, sec_ok: bool) -> bool:
+        # If SEC gave us industry + ticker, that's full enrichment
+        return sec_ok and bool(company.ticker and company.industry)
+
+    @staticmethod
+    def _finish(company: Company, sec_ok: bool, llm_ok: bool) -> str:
+        if CompanyEnricher._sec_complete(company, sec_ok):
+            status = "enriched"
+        elif sec_ok or llm_ok:
+            status = "enriched" if company.industry and (company.employee_count or company.ticker) else "partial"
+        else:
+            status = "not_found"
+        company.enrichment_status = status
+        company.enriched_at = datetime.now(timezone.utc)
+        return status
 
     async def enrich_company(self, company: Company) -> str:
         """Run both enrichment stages. Returns status: enriched/partial/not_found."""
         sec_ok = await self._enrich_from_sec(company)
-
-        # If SEC gave us industry + ticker, that's full enrichment
-        if sec_ok and company.ticker and company.industry:
-            company.enrichment_status = "enriched"
-            company.enriched_at = datetime.now(timezone.utc)
-            return "enriched"
+        if self._sec_complete(company, sec_ok):
+            return self._finish(company, sec_ok, False)
 
         # Try LLM for missing fields (employee_count, industry)
         llm_ok = await self._enrich_from_llm(company)
-
-        if sec_ok or llm_ok:
-            status = "enriched" if company.industry and (company.employee_count or company.ticker) else "partial"
-            company.enrichment_status = status
-            company.enriched_at = datetime.now(timezone.utc)
-            return status
-
-        company.enrichment_status = "not_found"
-        company.enriched_at = datetime.now(timezone.utc)
-        return "not_found"
+        if llm_ok is None:
+            return "errors"  # Left pending for the next run
+        return self._finish(company, sec_ok, llm_ok)
+
+    async def enrich_companies(self, companies: list[Company], concurrency: int | None = None) -> list[str]:
+        """Enrich a batch: SEC lookups concurrently, then the LLM fallback in batched prompts.
+
+        Signal context for the LLM stage is loaded in one query for every
+        company that reaches it.
+
+        Returns one status per company, in order; "errors" where the SEC stage
+        raised or the LLM gave no usable reply. Those companies stay pending.
+        """
+        slots = asyncio.Semaphore(concurrency or settings.enrichment_concurrency)
+
+        async def sec_stage(company: Company) -> bool | None:
+            async with slots:
+                try:
+                    return await self._enrich_from_sec(company)
+                except Exception as e:
+                    logger.error("enricher.company_error", company=company.name, error=str(e))
+                    return None
+
+        sec_results = await asyncio.gather(*(sec_stage(c) for c in companies))
+        needs_llm = [
+            c for c, sec_ok in zip(companies, sec_results)
+            if sec_ok is not None and not self._sec_complete(c, sec_ok)
+        ]
+        llm_enriched: set[UUID] = set()
+        llm_unanswered: set[UUID] = set()
+        if needs_llm:
+            missing = [c.id for c in needs_llm if c.id not in self._signal_context]
+            if missing:
+                await self.preload_signal_context(missing)
+            llm_enriched, llm_unanswered = await self._enrich_batch_from_llm(needs_llm)
+
+        return [
+            "errors"
+            if sec_ok is None or c.id in llm_unanswered
+            else self._finish(c, sec_ok, c.id in llm_enriched)
+            for c, sec_ok in zip(companies, sec_results)
+        ]
 
 
-async def enrich_pending_companies(db: AsyncSession, batch_size: int = 20) -> dict:
-    """Process a batch of pending companies. Returns {enriched, partial, not_found, errors}."""
+def _as_int(value) -> int | None:
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)) and float(value).is_integer():
+        return int(value)
+    if isinstance(value, str) and value.strip().isdigit():
+        return int(value.strip())
+    return None
+
+
+def parse_firmographic_estimates(result, count: int) -> dict[int, dict]:
+    """Validate a batched LLM response, keyed by the 1-based company number.
+
+    Items that are malformed, out of range or duplicated are dropped; an
+    implausible employee_count or industry is cleared rather than trusted.
+    """
+    if isinstance(result, dict):
+        result = result.get("companies", [result] if count == 1 else [])
+    if not isinstance(result, list):
+        return {}
+
+    estimates: dict[int, dict] = {}
+    for item in result:
+        if not isinstance(item, dict):
+            continue
+        number = _as_int(item.get("id")) if count > 1 or "id" in item else 1
+        confidence = _as_int(item.get("confidence"))
+        if number is None or not 1 <= number <= count or number in estimates:
+            continue
+        if confidence is None or not 0 <= confidence <= 100:
+            continue
+
+        employee_count = _as_int(item.get("employee_count"))
+        if employee_count is not None and not 0 < employee_count <= MAX_EMPLOYEE_COUNT:
+            employee_count = None
+        industry = item.get("industry")
+        industry = industry.strip()[:255] if isinstance(industry, str) and industry.strip() else None
+
+        estimates[number] = {
+            "employee_count": employee_count,
+            "industry": industry,
+            "confidence": confidence,
+        }
+    return estimates
+
+
+async def enrich_pending_companies(
+    db: AsyncSession, batch_size: int = 20, concurrency: int | None = None
+) -> dict:
+    """Process the highest-value pending companies concurrently. Returns {enriched, partial, not_found, errors}."""
     result = await db.execute(
         select(Company)
         .where(Company.enrichment_status == "pending")
-        .order_by(Company.created_at)
+        .order_by(claim_order(), Company.created_at)
         .limit(batch_size)
     )
     companies = result.scalars().all()
@@ -310,13 +409,8 @@ async def enrich_pending_companies(db: AsyncSession, batch_size: int = 20) -> di
     enricher = CompanyEnricher(db)
     stats = {"enriched": 0, "partial": 0, "not_found": 0, "errors": 0, "total": len(companies)}
 
-    for company in companies:
-        try:
-            status = await enricher.enrich_company(company)
-            stats[status] = stats.get(status, 0) + 1
-        except Exception as e:
-            stats["errors"] += 1
-            logger.error("enricher.company_error", company=company.name, error=str(e))
+    for status in await enricher.enrich_companies(companies, concurrency=concurrency):
+        stats[status] = stats.get(status, 0) + 1
 
     await db.flush()
 
@@ -324,7 +418,7 @@ async def enrich_pending_companies(db: AsyncSession, batch_size: int = 20) -> di
     return stats
 
 
-async def backfill_all_companies(db: AsyncSession, batch_size: int = 30) -> dict:
+async def backfill_all_companies(db: AsyncSession, batch_size: int = 100) -> dict:
     """Loop through ALL pending companies in batches. Commits after each batch."""
     totals = {"enriched": 0, "partial": 0, "not_found": 0, "errors": 0, "total": 0}
 
@@ -334,6 +428,10 @@ async def backfill_all_companies(db: AsyncSession, batch_size: int = 30) -> dict
 
         if batch_stats["total"] == 0:
             break
+        if batch_stats["errors"] == batch_stats["total"]:
+            # Nothing moved out of pending (e.g. LLM outage); the same batch would come back
+            logger.warning("enricher.backfill_stalled", **batch_stats)
+            break
 
         for key in totals:
             totals[key] += batch_stats[key]
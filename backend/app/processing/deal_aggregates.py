@@ -0,0 +1,60 @@
+"""Per-company signal aggregates that deal scores are computed from.
+
+The opportunity list, contact prefetch and the enrichment queue all rank
+companies by deal score. They share this query shape (Company joined to its
+signals, grouped per company) and the row-to-score step, so a change to the
+inputs of ``compute_deal_score`` is made in one place.
+"""
+
+from datetime import datetime, timezone
+
+from sqlalchemy import distinct, func, select
+
+from app.models import Company, Signal
+from app.processing.deal_scorer import DealScoreResult, compute_deal_score
+
+
+def deal_score_aggregates(*columns):
+    """SELECT of the deal-score inputs per company, plus any extra ``columns``.
+
+    Callers add their own WHERE / HAVING / joins.
+    """
+    return (
+        select(
+            Company.id.label("company_id"),
+            *columns,
+            Company.composite_risk_score,
+            Company.risk_trend,
+            func.count(Signal.id).label("signal_count"),
+            func.coalesce(func.sum(Signal.device_estimate), 0).label("total_device_estimate"),
+            func.max(Signal.created_at).label("latest_signal_at"),
+            func.avg(Signal.confidence_score).label("avg_confidence"),
+            func.avg(Signal.severity_score).label("avg_severity"),
+            func.count(distinct(Signal.source_name)).label("source_diversity"),
+            func.array_agg(distinct(Signal.signal_type)).label("signal_types"),
+            func.array_agg(distinct(Signal.source_name)).label("source_names"),
+        )
+        .join(Signal, Signal.company_id == Company.id)
+        .group_by(Company.id)
+    )
+
+
+def days_since_latest(row, now: datetime) -> int:
+    latest = row.latest_signal_at
+    return (now - latest.replace(tzinfo=timezone.utc)).days if latest else 999
+
+
+def deal_score_from_row(row, now: datetime) -> DealScoreResult:
+    """Deal score for one ``deal_score_aggregates`` row."""
+    return compute_deal_score(
+        avg_severity=float(row.avg_severity or 0),
+        avg_confidence=float(row.avg_confidence or 0),
+        composite_risk_score=row.composite_risk_score or 0,
+        total_devices=int(row.total_device_estimate or 0),
+        source_diversity=int(row.source_diversity or 1),
+        signal_types=list(row.signal_types or []),
+        days_since_latest=days_since_latest(row, now),
+        source_names=list(row.source_names or []),
+        risk_trend=row.risk_trend or "stable",
+        signal_count=row.signal_count,
+    )
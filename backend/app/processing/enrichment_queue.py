@@ -0,0 +1,92 @@
+"""Value-prioritized queue of companies awaiting enrichment.
+
+Pending companies are claimed by expected deal value instead of arrival
+order, so a Chapter 7 filer with thousands of devices is not stuck behind a
+burst of low-value news mentions. A company's priority is recomputed
+whenever the pipeline attaches new signals to it: its rolled-up deal score,
+plus extra weight for device volume and the most urgent event type.
+
+Waiting adds AGING_POINTS_PER_HOUR to the claim order, so even a
+zero-priority company overtakes the highest possible priority within
+MAX_STARVATION_HOURS.
+"""
+
+import math
+from datetime import datetime, timezone
+
+import structlog
+from sqlalchemy import distinct, func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import Company, Signal
+from app.processing.deal_aggregates import deal_score_aggregates, deal_score_from_row
+from app.processing.deal_scorer import URGENCY_MAP
+
+logger = structlog.get_logger()
+
+DEVICE_WEIGHT = 10.0  # Points per decade of estimated devices
+URGENCY_WEIGHT = 2.0  # Multiplies the URGENCY_MAP tier (max 18)
+MAX_PRIORITY = 200
+MAX_STARVATION_HOURS = 24
+AGING_POINTS_PER_HOUR = MAX_PRIORITY / MAX_STARVATION_HOURS
+
+
+def enrichment_priority(deal_score: int, total_devices: int, signal_types: list[str]) -> int:
+    """Expected deal value of enriching a company now, 0..MAX_PRIORITY."""
+    urgency = max((URGENCY_MAP.get(t, 4.0) for t in signal_types), default=0.0)
+    devices = DEVICE_WEIGHT * math.log10(1 + max(0, total_devices))
+    return int(min(MAX_PRIORITY, round(deal_score + URGENCY_WEIGHT * urgency + devices)))
+
+
+def claim_order():
+    """ORDER BY for claiming pending companies: priority plus aging, highest first."""
+    waited_hours = func.extract("epoch", func.now() - Company.created_at) / 3600
+    return (Company.enrichment_priority + waited_hours * AGING_POINTS_PER_HOUR).desc()
+
+
+async def refresh_enrichment_priorities(db: AsyncSession, company_ids) -> int:
+    """Recompute the priority of every still-pending company in ``company_ids``."""
+    company_ids = list(company_ids)
+    if not company_ids:
+        return 0
+
+    result = await db.execute(
+        deal_score_aggregates().where(
+            Company.id.in_(company_ids), Company.enrichment_status == "pending"
+        )
+    )
+
+    now = datetime.now(timezone.utc)
+    params = [
+        {
+            "id": row.company_id,
+            "enrichment_priority": enrichment_priority(
+                deal_score_from_row(row, now).score,
+                int(row.total_device_estimate or 0),
+                list(row.signal_types or []),
+            ),
+        }
+        for row in result.all()
+    ]
+    if params:
+        # One executemany keyed by primary key instead of loading each company
+        await db.execute(update(Company), params)
+    updated = len(params)
+
+    logger.debug("enrichment_queue.priorities_refreshed", companies=updated)
+    return updated
+
+
+async def enrichment_queue_by_source(db: AsyncSession) -> dict[str, tuple[int, datetime | None]]:
+    """Pending companies per signal source: (queue depth, oldest enqueue time)."""
+    result = await db.execute(
+        select(
+            Signal.source_name,
+            func.count(distinct(Company.id)),
+            func.min(Company.created_at),
+        )
+        .join(Company, Signal.company_id == Company.id)
+        .where(Company.enrichment_status == "pending")
+        .group_by(Signal.source_name)
+    )
+    return {source: (depth, oldest) for source, depth, oldest in result.all()}
@@ -1,7 +1,11 @@
 import re
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass
 
 import structlog
-from sqlalchemy import select
+from sqlalchemy import String, any_, bindparam, select
+from sqlalchemy.dialects.postgresql import ARRAY, insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models import Company
@@ -11,14 +15,33 @@ from app.processing.prompts import ENTITY_EXTRACTION_PROMPT
 logger = structlog.get_logger()
 
 
+@dataclass(frozen=True)
+class ResolvedCompany:
+    """What the pipeline needs from a resolved company.
+
+    Companies are never renamed or deleted once created, so a cached entry
+    stays valid; ``employee_count`` is only a fallback for device estimates
+    and may lag enrichment by the life of the worker process.
+    """
+
+    id: uuid.UUID
+    employee_count: int | None
+
+
+# normalized_name -> company, most recently used last
+COMPANY_CACHE_SIZE = 10_000
+_companies: "OrderedDict[str, ResolvedCompany]" = OrderedDict()
+
+
 async def extract_entities(text: str, source_type: str) -> dict:
     """Extract structured entities from raw signal text using LLM."""
     prompt = ENTITY_EXTRACTION_PROMPT.format(text=text[:2000], source_type=source_type)
     try:
-        return await llm_client.complete_json(prompt, model="haiku")
+        result = await llm_client.complete_json(prompt, model="haiku")
     except Exception as e:
         logger.warning("entity_extraction.failed", error=str(e))
         return {}
+    return result if isinstance(result, dict) else {}
 
 
 def normalize_company_name(name: str) -> str:
@@ -93,32 +116,95 @@ def _is_valid_company_name(name: str) -> bool:
     return True
 
 
-async def find_or_create_company(db: AsyncSession, name: str, **kwargs) -> Company:
-    """Find an existing company by normalized name or create a new one.
+def _cache_get(normalized: str) -> ResolvedCompany | None:
+    company = _companies.get(normalized)
+    if company is not None:
+        _companies.move_to_end(normalized)
+    return company
 
-    Raises ValueError if the name is meaningless (e.g. 'Unknown', 'null').
-    """
-    if not _is_valid_company_name(name):
-        raise ValueError(f"Rejected company name: {name!r}")
 
-    normalized = normalize_company_name(name)
+def _cache_put(normalized: str, company: ResolvedCompany) -> None:
+    _companies[normalized] = company
+    _companies.move_to_end(normalized)
+    while len(_companies) > COMPANY_CACHE_SIZE:
+        _companies.popitem(last=False)
 
-    result = await db.execute(
-        select(Company).where(Company.normalized_name == normalized)
-    )
-    company = result.scalar_one_or_none()
 
-    if company:
-        return company
+def clear_company_cache() -> None:
+    _companies.clear()
 
-    company = Company(
-        name=name.strip(),
-        normalized_name=normalized,
-        headquarters_city=_clean_llm_value(kwargs.get("city")),
-        headquarters_state=validate_state_code(_clean_llm_value(kwargs.get("state"))),
-    )
-    db.add(company)
-    await db.flush()
 
-    logger.info("company.created", name=name, normalized=normalized)
-    return company
+def _names_param(names: list[str]):
+    return any_(bindparam("names", names, type_=ARRAY(String)))
+
+
+def _resolved_columns():
+    return select(Company.id, Company.normalized_name, Company.employee_count)
+
+
+def _resolved(row) -> ResolvedCompany:
+    return ResolvedCompany(id=row.id, employee_count=row.employee_count)
+
+
+async def resolve_companies(
+    db: AsyncSession, candidates: list[tuple[str, str | None, str | None]]
+) -> dict[str, ResolvedCompany]:
+    """Find or create the companies for a batch of (name, city, state) candidates.
+
+    Returns {normalized_name: ResolvedCompany}; meaningless names are left out.
+    Names in the in-process cache are answered without touching the database.
+    The rest come from one ``= ANY`` query, and missing ones are created with
+    ``INSERT ... ON CONFLICT (normalized_name) DO NOTHING RETURNING``, so a
+    concurrent worker creating the same company is never an error: rows it
+    won are read back by name.
+    """
+    wanted: dict[str, tuple[str, str | None, str | None]] = {}
+    for name, city, state in candidates:
+        if isinstance(name, str) and _is_valid_company_name(name):
+            wanted.setdefault(normalize_company_name(name), (name, city, state))
+    if not wanted:
+        return {}
+
+    resolved = {n: company for n in wanted if (company := _cache_get(n)) is not None}
+    uncached = [n for n in wanted if n not in resolved]
+    if uncached:
+        result = await db.execute(
+            _resolved_columns().where(Company.normalized_name == _names_param(uncached))
+        )
+        resolved.update((row.normalized_name, _resolved(row)) for row in result.all())
+
+    missing = [n for n in wanted if n not in resolved]
+    if missing:
+        rows = []
+        for normalized in missing:
+            name, city, state = wanted[normalized]
+            rows.append({
+                "id": uuid.uuid4(),
+                "name": name.strip(),
+                "normalized_name": normalized,
+                "headquarters_city": _clean_llm_value(city),
+                "headquarters_state": validate_state_code(_clean_llm_value(state)),
+            })
+        created = await db.execute(
+            insert(Company)
+            .values(rows)
+            .on_conflict_do_nothing(index_elements=[Company.normalized_name])
+            .returning(Company.id, Company.normalized_name, Company.employee_count)
+        )
+        for row in created.all():
+            resolved[row.normalized_name] = _resolved(row)
+            logger.info(
+                "company.created", name=wanted[row.normalized_name][0], normalized=row.normalized_name
+            )
+
+        raced = [n for n in missing if n not in resolved]
+        if raced:
+            result = await db.execute(
+                _resolved_columns().where(Company.normalized_name == _names_param(raced))
+            )
+            resolved.update((row.normalized_name, _resolved(row)) for row in result.all())
+
+    for normalized in uncached:
+        if normalized in resolved:
+            _cache_put(normalized, resolved[normalized])
+    return resolved
@@ -1,25 +1,50 @@
 """Main NLP processing pipeline.
 
 Processes raw signals through: entity extraction → classification → scoring → correlation.
+Correlation, alerting and risk scoring run once per batch rather than per signal.
+
+Database work is kept in short transactions and no transaction is open
+while the LLM runs. A batch is claimed and leased in one transaction,
+extraction runs outside it, companies are resolved and committed, then
+classification runs. Finally every signal is written in its own savepoint
+and the batch steps run in one last transaction.
 """
 
-from datetime import timedelta
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
 
 import structlog
-from sqlalchemy import select, and_
+from sqlalchemy import or_, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.config import settings
 from app.models import RawSignal, Signal
 from app.processing.device_filter import estimate_devices
-from app.processing.entity_extractor import extract_entities, find_or_create_company, _clean_llm_value, validate_state_code
-from app.processing.risk_scorer import update_company_risk_score
+from app.processing.enrichment_queue import refresh_enrichment_priorities
+from app.processing.entity_extractor import (
+    ResolvedCompany,
+    _clean_llm_value,
+    extract_entities,
+    normalize_company_name,
+    resolve_companies,
+    validate_state_code,
+)
+from app.processing.risk_scorer import update_company_risk_scores
 from app.processing.signal_classifier import classify_signal
-from app.email.sender import match_and_send_realtime_alerts
-from app.processing.signal_correlator import correlate_signal
+from app.processing.signal_dedup import DedupCandidate, find_duplicate_signals
+from app.processing.signal_queue import claim_order
+from app.email.sender import match_realtime_alerts
+from app.processing.signal_correlator import correlate_signals
 
 logger = structlog.get_logger()
 
 BATCH_SIZE = 20
+# Retry backoff for raw signals that fail processing: 30m, 1h, 2h, ... capped at a day
+RETRY_BASE_DELAY = timedelta(minutes=30)
+MAX_RETRY_DELAY = timedelta(hours=24)
+# A claimed batch is hidden from other workers this long; if the worker dies it is picked up again
+CLAIM_LEASE = timedelta(minutes=15)
+LAST_ERROR_MAX_LENGTH = 2000
 
 # Normalize LLM-returned signal types to canonical values
 SIGNAL_TYPE_ALIASES: dict[str, str] = {
@@ -43,20 +68,87 @@ SIGNAL_TYPE_ALIASES: dict[str, str] = {
 }
 
 
+@dataclass
+class _PreparedSignal:
+    """A classified raw signal waiting on the batch dedup check."""
+
+    raw: RawSignal
+    entities: dict
+    company_name: str
+    company: ResolvedCompany
+    classification: dict
+    signal_type: str
+    employees: int | None
+    device_estimate: int | None
+
+
 def _normalize_signal_type(raw_type: str) -> str:
     """Map variant signal types to canonical values."""
     return SIGNAL_TYPE_ALIASES.get(raw_type, raw_type)
 
 
-async def process_pending_signals(db: AsyncSession) -> dict:
-    """Process a batch of raw signals through the NLP pipeline."""
+def retry_delay(attempt_count: int) -> timedelta:
+    """Backoff before the next attempt after ``attempt_count`` failures."""
+    return min(RETRY_BASE_DELAY * 2 ** max(attempt_count - 1, 0), MAX_RETRY_DELAY)
+
+
+def record_failure(raw: RawSignal, error: Exception, now: datetime | None = None) -> None:
+    """Schedule a failed raw signal for retry, or dead-letter it after too many failures."""
+    now = now or datetime.now(timezone.utc)
+    raw.attempt_count = (raw.attempt_count or 0) + 1
+    raw.last_error = f"{type(error).__name__}: {error}"[:LAST_ERROR_MAX_LENGTH]
+    if raw.attempt_count >= settings.pipeline_max_attempts:
+        raw.processing_status = "dead_letter"
+        raw.next_attempt_at = None
+        logger.error(
+            "pipeline.signal_dead_lettered",
+            raw_signal_id=str(raw.id),
+            attempts=raw.attempt_count,
+            error=str(error),
+        )
+        return
+    raw.processing_status = "raw"  # Keep for retry
+    raw.next_attempt_at = now + retry_delay(raw.attempt_count)
+    logger.error(
+        "pipeline.signal_error",
+        raw_signal_id=str(raw.id),
+        attempts=raw.attempt_count,
+        retry_at=raw.next_attempt_at.isoformat(),
+        error=str(error),
+    )
+
+
+async def claim_raw_signals(db: AsyncSession, now: datetime, limit: int = BATCH_SIZE) -> list[RawSignal]:
+    """Lease the most urgent due raw signals to this worker and commit.
+
+    Rows are locked (skipping rows another worker is claiming) only for the
+    claim itself. Afterwards the lease, ``next_attempt_at`` pushed
+    CLAIM_LEASE ahead, keeps other workers off them.
+    """
     result = await db.execute(
         select(RawSignal)
-        .where(RawSignal.processing_status == "raw")
-        .order_by(RawSignal.created_at)
-        .limit(BATCH_SIZE)
+        .where(
+            RawSignal.processing_status == "raw",
+            or_(RawSignal.next_attempt_at.is_(None), RawSignal.next_attempt_at <= now),
+        )
+        .order_by(claim_order(), RawSignal.created_at)
+        .limit(limit)
+        .with_for_update(skip_locked=True)
     )
-    raw_signals = result.scalars().all()
+    raw_signals = list(result.scalars().all())
+    for raw in raw_signals:
+        raw.next_attempt_at = now + CLAIM_LEASE
+    await db.commit()
+    return raw_signals
+
+
+async def process_pending_signals(db: AsyncSession) -> dict:
+    """Process a batch of raw signals through the NLP pipeline.
+
+    Commits its own work in short transactions; see the module docstring.
+    """
+    now = datetime.now(timezone.utc)
+    raw_signals = await claim_raw_signals(db, now)
 
     if not raw_signals:
         return {"processed": 0}
@@ -65,28 +157,48 @@ async def process_pending_signals(db: AsyncSession) -> dict:
     errors = 0
     dedup_count = 0
     companies_to_update = set()
+    new_signals: list[Signal] = []
 
+    # Step 1: Entity extraction (LLM, no transaction open)
+    extracted = []
     for raw in raw_signals:
-        try:
-            # Step 1: Entity extraction
-            entities = await extract_entities(raw.raw_text or raw.company_name, raw.source_type)
-            company_name = entities.get("company_name", raw.company_name)
-            summary = entities.get("summary", raw.raw_text)
+        entities = await extract_entities(raw.raw_text or raw.company_name, raw.source_type)
+        extracted.append((raw, entities, entities.get("company_name", raw.company_name)))
 
-            # Step 2: Find or create company
+    # Step 2: Find or create every company in the batch at once. If the batch
+    # fails, resolve one raw at a time so a single bad name only fails its own raw.
+    def company_key(entities: dict, company_name) -> tuple:
+        return (company_name, entities.get("location_city"), entities.get("location_state"))
+
+    try:
+        async with db.begin_nested():
+            companies = await resolve_companies(db, [company_key(e, name) for _, e, name in extracted])
+    except Exception as batch_err:
+        logger.warning("pipeline.company_batch_error", raw_signals=len(extracted), error=str(batch_err))
+        companies, resolved = {}, []
+        for raw, entities, company_name in extracted:
             try:
-                company = await find_or_create_company(
-                    db,
-                    company_name,
-                    city=entities.get("location_city"),
-                    state=entities.get("location_state"),
-                )
-            except ValueError:
+                async with db.begin_nested():
+                    companies.update(await resolve_companies(db, [company_key(entities, company_name)]))
+                resolved.append((raw, entities, company_name))
+            except Exception as e:
+                errors += 1
+                record_failure(raw, e, now)
+        extracted = resolved
+    await db.commit()
+
+    prepared = []
+    for raw, entities, company_name in extracted:
+        try:
+            company = (
+                companies.get(normalize_company_name(company_name)) if isinstance(company_name, str) else None
+            )
+            if company is None:
                 raw.processing_status = "discarded"
                 logger.info("pipeline.skipped_bad_company", raw_signal_id=str(raw.id), name=company_name)
                 continue
 
-            # Step 3: Classification
+            # Step 3: Classification (LLM, no transaction open)
             classification = await classify_signal(
                 raw.raw_text or raw.company_name,
                 company_name,
@@ -116,21 +228,38 @@ async def process_pending_signals(db: AsyncSession) -> dict:
                 employees = min(employees, 5000)
 
             device_estimate = estimate_devices(signal_type, employees)
-
-            # Step 5b: Dedup check — skip if same company+type within 2-day window
-            window_start = raw.created_at - timedelta(days=2)
-            window_end = raw.created_at + timedelta(days=2)
-            existing = await db.execute(
-                select(Signal.id).where(
-                    and_(
-                        Signal.company_id == company.id,
-                        Signal.signal_type == signal_type,
-                        Signal.source_published_at >= window_start,
-                        Signal.source_published_at <= window_end,
-                    )
-                ).limit(1)
+            prepared.append(
+                _PreparedSignal(
+                    raw, entities, company_name, company, classification, signal_type, employees, device_estimate
+                )
             )
-            if existing.scalar_one_or_none() is not None:
+
+        except Exception as e:
+            errors += 1
+            record_failure(raw, e, now)
+
+    # Step 5b: Dedup — same company+type within 2 days, in the table or earlier in this batch
+    try:
+        duplicates = await find_duplicate_signals(
+            db,
+            [
+                DedupCandidate(p.company.id, p.signal_type, p.raw.created_at)
+                for p in prepared
+            ],
+        )
+    except Exception as e:
+        # Nothing wrong with the signals themselves: they are retried once the lease lapses
+        errors += len(prepared)
+        logger.error("pipeline.dedup_error", raw_signals=len(prepared), error=str(e))
+        prepared, duplicates = [], set()
+
+    for position, p in enumerate(prepared):
+        raw, entities, company_name, company = p.raw, p.entities, p.company_name, p.company
+        classification, signal_type, employees, device_estimate = (
+            p.classification, p.signal_type, p.employees, p.device_estimate
+        )
+        try:
+            if position in duplicates:
                 raw.processing_status = "discarded"
                 raw.discard_reason = "duplicate_signal"
                 dedup_count += 1
@@ -142,14 +271,15 @@ async def process_pending_signals(db: AsyncSession) -> dict:
                 )
                 continue
 
-            # Step 6: Create processed signal
+            # Step 6: Create processed signal, in its own savepoint so a failure
+            # only loses this one
             signal = Signal(
                 raw_signal_id=raw.id,
                 company_id=company.id,
                 signal_type=signal_type,
                 signal_category=classification.get("signal_category", "news"),
                 title=f"{company_name}: {raw.event_type}",
-                summary=summary,
+                summary=entities.get("summary", raw.raw_text),
                 confidence_score=classification.get("confidence_score", 50),
                 severity_score=classification.get("severity_score", 50),
                 source_name=raw.source_type,
@@ -160,25 +290,15 @@ async def process_pending_signals(db: AsyncSession) -> dict:
                 affected_employees=employees,
                 device_estimate=device_estimate,
             )
-            db.add(signal)
-            await db.flush()
-
-            # Step 7: Correlation
-            await correlate_signal(db, signal)
-
-            # Step 8: Real-time email alerts
-            try:
-                await match_and_send_realtime_alerts(db, signal)
-            except Exception as alert_err:
-                logger.error(
-                    "pipeline.alert_error",
-                    signal_id=str(signal.id),
-                    error=str(alert_err),
-                )
+            async with db.begin_nested():
+                db.add(signal)
+                await db.flush()
 
             # Mark raw signal as processed
             raw.processing_status = "processed"
+            raw.next_attempt_at = None
             companies_to_update.add(company.id)
+            new_signals.append(signal)
             processed += 1
 
             logger.info(
@@ -189,22 +309,45 @@ async def process_pending_signals(db: AsyncSession) -> dict:
                 confidence=signal.confidence_score,
                 severity=signal.severity_score,
                 device_estimate=device_estimate,
+                queue_wait_seconds=int((now - raw.created_at).total_seconds()),
             )
 
         except Exception as e:
-            raw.processing_status = "raw"  # Keep for retry
             errors += 1
-            logger.error(
-                "pipeline.signal_error",
-                raw_signal_id=str(raw.id),
-                error=str(e),
-            )
+            record_failure(raw, e, now)
+
+    # Step 7: Correlation — the whole batch in a few set-based statements
+    try:
+        async with db.begin_nested():
+            await correlate_signals(db, new_signals)
+    except Exception as corr_err:
+        logger.error("pipeline.correlation_error", signals=len(new_signals), error=str(corr_err))
+
+    # Step 8: Real-time email alerts — matched once for the whole batch and
+    # queued to the outbox (sent by the email worker)
+    try:
+        async with db.begin_nested():
+            await match_realtime_alerts(db, new_signals)
+    except Exception as alert_err:
+        logger.error("pipeline.alert_error", signals=len(new_signals), error=str(alert_err))
 
     # Step 9: Update company risk scores
-    for company_id in companies_to_update:
-        await update_company_risk_score(db, company_id)
+    try:
+        async with db.begin_nested():
+            await update_company_risk_scores(db, companies_to_update)
+    except Exception as risk_err:
+        logger.error("pipeline.risk_score_error", companies=len(companies_to_update), error=str(risk_err))
+
+    # Step 10: Re-rank affected companies still waiting for enrichment
+    try:
+        async with db.begin_nested():
+            await refresh_enrichment_priorities(db, companies_to_update)
+    except Exception as priority_err:
+        logger.error(
+            "pipeline.enrichment_priority_error", companies=len(companies_to_update), error=str(priority_err)
+        )
 
-    await db.flush()
+    await db.commit()
 
     logger.info(
         "pipeline.batch_complete",
@@ -1,8 +1,19 @@
-import math
+"""Company composite risk scores.
+
+Scores are computed set-based: one aggregate query over the signal columns
+the formula needs returns, per company, the time-decayed weighted average
+of signal scores, the number of categories, the signal count and the
+recent/older split. No ``Signal`` rows are hydrated. The remaining
+arithmetic (diversity and velocity multipliers, trend) is a cheap pass over
+those aggregates.
+"""
+
+import uuid
+from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
 
 import structlog
-from sqlalchemy import select
+from sqlalchemy import DateTime, Float, case, cast, func, literal, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models import Company, Signal
@@ -16,80 +27,160 @@ CATEGORY_WEIGHTS = {
     "filing": 0.8,
     "news": 0.6,
 }
+DEFAULT_CATEGORY_WEIGHT = 0.5
 
+SCORE_WINDOW = timedelta(days=60)
+TREND_WINDOW = timedelta(days=14)
+DECAY_DAYS = 21
+MIN_DECAY = 0.1
+REFRESH_CHUNK_SIZE = 1000  # Companies per statement batch / commit in the nightly refresh
 
-async def update_company_risk_score(db: AsyncSession, company_id) -> int:
-    """Recalculate composite risk score for a company based on recent signals."""
-    company = await db.get(Company, company_id)
-    if not company:
-        return 0
 
-    # Get signals from last 60 days
-    cutoff = datetime.now(timezone.utc) - timedelta(days=60)
-    result = await db.execute(
-        select(Signal)
-        .where(Signal.company_id == company_id, Signal.created_at >= cutoff)
-        .order_by(Signal.created_at.desc())
-    )
-    signals = result.scalars().all()
+@dataclass
+class RiskScore:
+    composite: int
+    trend: str
+    signal_count: int
+    last_signal_at: datetime | None
 
-    if not signals:
+
+def composite_from_aggregates(base_score: float, categories: int, signal_count: int) -> int:
+    """Apply the diversity and velocity multipliers to a weighted base score."""
+    # Category diversity multiplier (multi-source confirmation)
+    diversity_multiplier = 1.0 + (categories - 1) * 0.15
+    # Velocity multiplier (many signals in short time)
+    velocity_multiplier = min(1.5, 1.0 + signal_count * 0.05)
+    return int(min(100, base_score * diversity_multiplier * velocity_multiplier))
+
+
+def trend_from_counts(recent: int, older: int) -> str:
+    if recent > older:
+        return "rising"
+    if recent < older:
+        return "declining"
+    return "stable"
+
+
+def _aggregate_query(now: datetime, company_ids=None):
+    now_param = literal(now, DateTime(timezone=True))
+    age_days = func.greatest(1, func.floor(func.extract("epoch", now_param - Signal.created_at) / 86400.0))
+    time_decay = func.greatest(MIN_DECAY, func.exp(-age_days / float(DECAY_DAYS)))
+    category_weight = case(CATEGORY_WEIGHTS, value=Signal.signal_category, else_=DEFAULT_CATEGORY_WEIGHT)
+    weight = cast(time_decay * category_weight, Float)
+    score = cast(Signal.confidence_score + Signal.severity_score, Float) / 2.0
+
+    query = (
+        select(
+            Signal.company_id,
+            (func.sum(score * weight) / func.nullif(func.sum(weight), 0)).label("base_score"),
+            func.count(func.distinct(Signal.signal_category)).label("categories"),
+            func.count().label("signal_count"),
+            func.count().filter(Signal.created_at >= now - TREND_WINDOW).label("recent_count"),
+            func.max(Signal.created_at).label("last_signal_at"),
+        )
+        .where(Signal.created_at >= now - SCORE_WINDOW)
+        .group_by(Signal.company_id)
+    )
+    if company_ids is not None:
+        query = query.where(Signal.company_id.in_(company_ids))
+    return query
+
+
+async def compute_risk_scores(
+    db: AsyncSession, company_ids=None, now: datetime | None = None
+) -> dict[uuid.UUID, RiskScore]:
+    """Risk scores for every company with signals in the window (or just ``company_ids``)."""
+    now = now or datetime.now(timezone.utc)
+    if company_ids is not None:
+        company_ids = list(company_ids)
+        if not company_ids:
+            return {}
+
+    result = await db.execute(_aggregate_query(now, company_ids))
+    scores = {}
+    for row in result.all():
+        scores[row.company_id] = RiskScore(
+            composite=composite_from_aggregates(float(row.base_score or 0), row.categories, row.signal_count),
+            trend=trend_from_counts(row.recent_count, row.signal_count - row.recent_count),
+            signal_count=row.signal_count,
+            last_signal_at=row.last_signal_at,
+        )
+    return scores
+
+
+def _apply(company: Company, score: RiskScore | None) -> int:
+    if score is None:
         company.composite_risk_score = 0
         company.risk_trend = "stable"
         company.signal_count = 0
         return 0
-
-    # Weighted average of signal scores with time decay
+    company.composite_risk_score = score.composite
+    company.risk_trend = score.trend
+    company.signal_count = score.signal_count
+    company.last_signal_at = score.last_signal_at
+    return score.composite
+
+
+async def update_company_risk_scores(db: AsyncSession, company_ids) -> dict[uuid.UUID, int]:
+    """Recalculate composite risk scores for a set of companies in one query."""
+    company_ids = list(company_ids)
+    scores = await compute_risk_scores(db, company_ids)
+
+    updated = {}
+    for company_id in company_ids:
+        company = await db.get(Company, company_id)
+        if not company:
+            continue
+        score = scores.get(company_id)
+        updated[company_id] = _apply(company, score)
+        if score is not None:
+            logger.info(
+                "risk_scorer.updated",
+                company=company.name,
+                score=score.composite,
+                trend=score.trend,
+                signal_count=score.signal_count,
+            )
+    return updated
+
+
+async def refresh_all_risk_scores(db: AsyncSession, chunk_size: int = REFRESH_CHUNK_SIZE) -> int:
+    """Rescore every company with signals, a chunk of companies per round trip.
+
+    Each chunk is one aggregate query plus one bulk UPDATE, then a commit.
+    """
     now = datetime.now(timezone.utc)
-    total_weight = 0
-    weighted_score = 0
-    categories = set()
-
-    for signal in signals:
-        age_days = max(1, (now - signal.created_at).days)
-        time_decay = max(0.1, math.exp(-age_days / 21))
-
-        category_weight = CATEGORY_WEIGHTS.get(signal.signal_category, 0.5)
-        weight = time_decay * category_weight
-
-        score = (signal.confidence_score + signal.severity_score) / 2
-        weighted_score += score * weight
-        total_weight += weight
-        categories.add(signal.signal_category)
-
-    base_score = weighted_score / total_weight if total_weight > 0 else 0
-
-    # Category diversity multiplier (multi-source confirmation)
-    diversity_multiplier = 1.0 + (len(categories) - 1) * 0.15
-    # Velocity multiplier (many signals in short time)
-    velocity_multiplier = min(1.5, 1.0 + len(signals) * 0.05)
-
-    composite = int(min(100, base_score * diversity_multiplier * velocity_multiplier))
-
-    # Determine trend
-    recent_cutoff = now - timedelta(days=14)
-    recent_signals = [s for s in signals if s.created_at >= recent_cutoff]
-    older_signals = [s for s in signals if s.created_at < recent_cutoff]
-
-    if len(recent_signals) > len(older_signals):
-        trend = "rising"
-    elif len(recent_signals) < len(older_signals):
-        trend = "declining"
-    else:
-        trend = "stable"
-
-    company.composite_risk_score = composite
-    company.risk_trend = trend
-    company.signal_count = len(signals)
-    company.last_signal_at = signals[0].created_at
-
-    logger.info(
-        "risk_scorer.updated",
-        company=company.name,
-        score=composite,
-        trend=trend,
-        signal_count=len(signals),
-        categories=list(categories),
-    )
-
-    return composite
+    refreshed = 0
+    last_id = None
+    while True:
+        query = select(Company.id).where(Company.signal_count > 0).order_by(Company.id).limit(chunk_size)
+        if last_id is not None:
+            query = query.where(Company.id > last_id)
+        company_ids = (await db.execute(query)).scalars().all()
+        if not company_ids:
+            break
+
+        scores = await compute_risk_scores(db, company_ids, now=now)
+        params = []
+        for company_id in company_ids:
+            score = scores.get(company_id)
+            if score is None:
+                params.append(
+                    {"id": company_id, "composite_risk_score": 0, "risk_trend": "stable", "signal_count": 0}
+                )
+            else:
+                params.append({
+                    "id": company_id,
+                    "composite_risk_score": score.composite,
+                    "risk_trend": score.trend,
+                    "signal_count": score.signal_count,
+                    "last_signal_at": score.last_signal_at,
+                })
+        await db.execute(update(Company), params)
+        await db.commit()
+
+        refreshed += len(company_ids)
+        last_id = company_ids[-1]
+        logger.info("risk_scorer.refresh_progress", companies=refreshed)
+
+    return refreshed
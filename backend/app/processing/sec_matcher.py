@@ -0,0 +1,112 @@
+"""Indexed matcher from company names to SEC ``company_tickers.json`` entries.
+
+Normalizes every SEC title once and answers lookups from two indexes
+instead of scanning all ~13k entries per company:
+
+- an exact dict from normalized title to entries (in file order);
+- a character-trigram inverted index for "target contained in title".
+
+"Title contained in target" is answered by looking up the substrings of the
+(short) target in the exact dict. Results are identical to the original
+linear scan, including its tie-breaking: the first exact match wins,
+otherwise containing entries are folded in file order, keeping a candidate
+whose normalized length is shorter than the current best's raw title.
+"""
+
+import re
+
+# Suffixes to strip during normalization
+_SUFFIXES = [
+    ", inc.", ", inc", " inc.", " inc",
+    ", llc", " llc",
+    ", ltd.", ", ltd", " ltd.", " ltd",
+    ", corp.", " corp.", ", corp", " corp",
+    " co.", " co",
+    " company", " companies",
+    " group", " holdings", " international",
+    ", l.p.", " l.p.", " lp",
+    " plc", ", plc",
+    " sa", " ag", " nv", " se",
+    " the",
+]
+
+_NON_WORD = re.compile(r"[^\w\s]")
+_WHITESPACE = re.compile(r"\s+")
+
+MIN_TARGET_LEN = 3
+MIN_CONTAINMENT_LEN = 5  # Containment only for names >= 5 chars to avoid false positives
+NGRAM = 3
+
+
+def normalize_company_name(name: str) -> str:
+    """Aggressive normalization for company name matching."""
+    name = name.strip().lower()
+    for suffix in _SUFFIXES:
+        if name.endswith(suffix):
+            name = name[: -len(suffix)]
+    name = _NON_WORD.sub("", name)
+    name = _WHITESPACE.sub(" ", name).strip()
+    return name
+
+
+def _ngrams(text: str) -> set[str]:
+    return {text[i : i + NGRAM] for i in range(len(text) - NGRAM + 1)}
+
+
+class SecTickerMatcher:
+    """Prebuilt lookup over the SEC tickers file. Build once, query many times."""
+
+    def __init__(self, tickers_data: dict):
+        self._entries: list[dict] = list(tickers_data.values())
+        self._normalized: list[str] = [normalize_company_name(e.get("title", "")) for e in self._entries]
+
+        self._exact: dict[str, list[int]] = {}
+        self._postings: dict[str, list[int]] = {}
+        for position, normalized in enumerate(self._normalized):
+            self._exact.setdefault(normalized, []).append(position)
+            for gram in _ngrams(normalized):
+                self._postings.setdefault(gram, []).append(position)
+        self._title_lengths = sorted({len(n) for n in self._exact})
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _titles_containing(self, target: str) -> set[int]:
+        grams = sorted(_ngrams(target), key=lambda g: len(self._postings.get(g, ())))
+        if not grams:
+            return set()
+        candidates = set(self._postings.get(grams[0], ()))
+        for gram in grams[1:]:
+            if not candidates:
+                break
+            candidates.intersection_update(self._postings.get(gram, ()))
+        return {p for p in candidates if target in self._normalized[p]}
+
+    def _titles_within(self, target: str) -> set[int]:
+        found: set[int] = set()
+        for length in self._title_lengths:
+            if length > len(target):
+                break
+            for start in range(len(target) - length + 1):
+                found.update(self._exact.get(target[start : start + length], ()))
+        return found
+
+    def match(self, company_name: str) -> dict | None:
+        """Find the SEC entry for ``company_name``, or None."""
+        target = normalize_company_name(company_name)
+        if not target or len(target) < MIN_TARGET_LEN:
+            return None
+
+        exact = self._exact.get(target)
+        if exact:
+            return self._entries[exact[0]]
+
+        if len(target) < MIN_CONTAINMENT_LEN:
+            return None
+
+        best_match = None
+        for position in sorted(self._titles_containing(target) | self._titles_within(target)):
+            entry = self._entries[position]
+            if best_match is None or len(self._normalized[position]) < len(best_match.get("title", "")):
+                best_match = entry
+        return best_match
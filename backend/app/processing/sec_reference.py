@@ -0,0 +1,189 @@
+"""Local, conditionally refreshed store of SEC reference data.
+
+Holds ``company_tickers.json`` and a trimmed copy of each CIK's submissions
+document on disk, shared by every worker process on the host. Each file
+keeps the ETag / Last-Modified the SEC sent with it; once a file is older
+than its max age it is revalidated with ``If-None-Match`` /
+``If-Modified-Since``, so a 304 costs a few hundred bytes and the body is
+only downloaded when the SEC data actually changed.
+
+The tickers file is loaded once per process and kept in memory; files are
+written atomically (temp file + rename) so concurrent workers never read a
+partial document. When the SEC is unreachable a stale local copy is used.
+Requests from every worker draw on one Redis-backed token bucket so the
+fleet as a whole stays within the SEC's fair-access rate.
+"""
+
+import asyncio
+import json
+import os
+import time
+from pathlib import Path
+
+import httpx
+import structlog
+
+from app.config import settings
+from app.core.blocking import run_blocking
+from app.core.throttle import SharedTokenBucket
+
+logger = structlog.get_logger()
+
+TICKERS_URL = "https://www.sec.gov/files/company_tickers.json"
+SUBMISSIONS_URL = "https://data.sec.gov/submissions/CIK{cik}.json"
+TICKERS_MAX_AGE = 24 * 3600
+SUBMISSIONS_MAX_AGE = 30 * 24 * 3600
+SEC_REQUESTS_PER_SECOND = 10.0  # SEC fair-access limit, across all workers
+TICKERS_ATTEMPTS = 3
+
+
+def _trim_submissions(data: dict) -> dict:
+    """Keep only the firmographic fields enrichment reads (the full document is MBs)."""
+    business = (data.get("addresses") or {}).get("business") or {}
+    return {
+        "cik": data.get("cik"),
+        "name": data.get("name"),
+        "tickers": data.get("tickers") or [],
+        "sic": data.get("sic"),
+        "sicDescription": data.get("sicDescription"),
+        "stateOfIncorporation": data.get("stateOfIncorporation"),
+        "addresses": {"business": {"stateOrCountry": business.get("stateOrCountry")}},
+    }
+
+
+def _read_json(path: Path) -> dict | None:
+    try:
+        with path.open("rb") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _write_json(path: Path, data: dict) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    with tmp.open("w", encoding="utf-8") as f:
+        json.dump(data, f, separators=(",", ":"))
+    os.replace(tmp, path)
+
+
+class SecReferenceStore:
+    """On-disk SEC tickers + submissions, revalidated with conditional requests."""
+
+    def __init__(self, root: str | Path | None = None, client: httpx.AsyncClient | None = None):
+        self.root = Path(root or settings.sec_reference_dir)
+        self._client = client
+        self._owns_client = client is None
+        self._bucket = SharedTokenBucket("sec.gov", SEC_REQUESTS_PER_SECOND)
+        self._tickers: dict | None = None
+        self._tickers_meta: dict = {}
+        self._tickers_lock = asyncio.Lock()
+        self.requests = 0
+
+    @property
+    def _tickers_path(self) -> Path:
+        return self.root / "company_tickers.json"
+
+    @property
+    def _tickers_meta_path(self) -> Path:
+        return self.root / "company_tickers.meta.json"
+
+    def _submissions_path(self, cik: str) -> Path:
+        return self.root / "submissions" / f"CIK{cik}.json"
+
+    def _get_client(self) -> httpx.AsyncClient:
+        if self._client is None:
+            self._client = httpx.AsyncClient(timeout=30, headers={"User-Agent": settings.sec_user_agent})
+        return self._client
+
+    async def close(self) -> None:
+        if self._client is not None and self._owns_client:
+            await self._client.aclose()
+            self._client = None
+
+    async def _conditional_get(self, url: str, meta: dict) -> httpx.Response:
+        headers = {}
+        if meta.get("etag"):
+            headers["If-None-Match"] = meta["etag"]
+        if meta.get("last_modified"):
+            headers["If-Modified-Since"] = meta["last_modified"]
+        await self._bucket.acquire()
+        self.requests += 1
+        resp = await self._get_client().get(url, headers=headers)
+        if resp.status_code != 304:
+            resp.raise_for_status()
+        return resp
+
+    @staticmethod
+    def _validators(resp: httpx.Response, now: float) -> dict:
+        return {
+            "etag": resp.headers.get("etag"),
+            "last_modified": resp.headers.get("last-modified"),
+            "checked_at": now,
+        }
+
+    async def tickers(self) -> dict:
+        """The SEC tickers file (~13k public companies); {} if never obtainable."""
+        async with self._tickers_lock:
+            now = time.time()
+            if self._tickers is not None and now - self._tickers_meta.get("checked_at", 0) < TICKERS_MAX_AGE:
+                return self._tickers
+
+            # Another worker may have refreshed the shared copy since we loaded ours
+            disk_meta = await run_blocking(_read_json, self._tickers_meta_path) or {}
+            if self._tickers is None or disk_meta.get("etag") != self._tickers_meta.get("etag"):
+                data = await run_blocking(_read_json, self._tickers_path)
+                if data is not None:
+                    self._tickers, self._tickers_meta = data, disk_meta
+            if self._tickers is not None and now - self._tickers_meta.get("checked_at", 0) < TICKERS_MAX_AGE:
+                return self._tickers
+
+            meta = self._tickers_meta if self._tickers is not None else {}
+            for attempt in range(TICKERS_ATTEMPTS):
+                try:
+                    resp = await self._conditional_get(TICKERS_URL, meta)
+                    break
+                except (httpx.HTTPError, ValueError) as e:
+                    logger.warning("sec_reference.tickers_fetch_failed", attempt=attempt + 1, error=str(e))
+                    if attempt < TICKERS_ATTEMPTS - 1:
+                        await asyncio.sleep(2 ** attempt)
+            else:
+                # Unreachable: serve whatever we have, stale or not
+                return self._tickers or {}
+
+            validators = self._validators(resp, now)
+            if resp.status_code == 304:
+                self._tickers_meta = {**self._tickers_meta, "checked_at": now}
+                logger.debug("sec_reference.tickers_not_modified")
+            else:
+                self._tickers = resp.json()
+                self._tickers_meta = validators
+                await run_blocking(_write_json, self._tickers_path, self._tickers)
+                logger.info("sec_reference.tickers_updated", count=len(self._tickers))
+            await run_blocking(_write_json, self._tickers_meta_path, self._tickers_meta)
+            return self._tickers
+
+    async def submissions(self, cik: int | str) -> dict | None:
+        """Trimmed submissions document for ``cik``, or None if unavailable."""
+        cik = str(cik).zfill(10)
+        path = self._submissions_path(cik)
+        cached = await run_blocking(_read_json, path)
+        now = time.time()
+        if cached and now - cached.get("checked_at", 0) < SUBMISSIONS_MAX_AGE:
+            return cached["data"]
+
+        try:
+            resp = await self._conditional_get(SUBMISSIONS_URL.format(cik=cik), cached or {})
+        except (httpx.HTTPError, ValueError) as e:
+            logger.warning("sec_reference.submissions_failed", cik=cik, error=str(e))
+            return cached["data"] if cached else None
+
+        if resp.status_code == 304 and cached:
+            record = {**cached, "checked_at": now}
+        else:
+            record = {**self._validators(resp, now), "data": _trim_submissions(resp.json())}
+        await run_blocking(_write_json, path, record)
+        return record["data"]
+
+
+sec_reference = SecReferenceStore()
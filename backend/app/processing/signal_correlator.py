@@ -2,67 +2,167 @@
 
 Links signals about the same company from multiple sources into correlation groups.
 Multi-source confirmation significantly elevates risk scoring.
+
+A whole pipeline batch is correlated at once. One aggregate query over each
+company's last CORRELATION_WINDOW_DAYS of signals (served by the
+``(company_id, created_at)`` index) says which categories are already
+present and which group is most recent. The batch is replayed against those
+aggregates in memory, and the outcome is written with a few set-based
+statements: new ``correlation_groups`` rows, one UPDATE attaching every
+ungrouped signal in the window, and one UPDATE refreshing group stats.
 """
 
 import uuid
+from dataclasses import dataclass, field
 from datetime import datetime, timedelta, timezone
 
 import structlog
-from sqlalchemy import select
+from sqlalchemy import bindparam, func, insert, select, update
+from sqlalchemy.dialects.postgresql import aggregate_order_by, array_agg
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm.attributes import set_committed_value
 
-from app.models import Signal
+from app.models import CorrelationGroup, Signal
 
 logger = structlog.get_logger()
 
 CORRELATION_WINDOW_DAYS = 14
 
 
-async def correlate_signal(db: AsyncSession, signal: Signal) -> uuid.UUID | None:
-    """Find or create a correlation group for this signal."""
-    # Look for recent signals about the same company from different sources
-    cutoff = datetime.now(timezone.utc) - timedelta(days=CORRELATION_WINDOW_DAYS)
+@dataclass
+class _CompanyWindow:
+    """What the correlator knows about a company's recent signals."""
+
+    signal_count: int = 0
+    categories: set[str] = field(default_factory=set)
+    group_id: uuid.UUID | None = None
+
+
+def assign_group(window: _CompanyWindow, new_categories: list[str]) -> tuple[uuid.UUID | None, bool]:
+    """Replay new signals (in arrival order) against a company's window.
 
+    A signal correlates when it joins an existing group, or when it brings a
+    category the window does not have yet. Returns (group_id, is_new_group);
+    group_id is None when nothing correlated.
+    """
+    count, categories = window.signal_count, set(window.categories)
+    for category in new_categories:
+        if window.group_id is not None:
+            return window.group_id, False
+        if count and category not in categories:
+            return uuid.uuid4(), True
+        categories.add(category)
+        count += 1
+    return None, False
+
+
+async def _load_windows(
+    db: AsyncSession, company_ids: list[uuid.UUID], exclude_ids: list[uuid.UUID], cutoff: datetime
+) -> dict[uuid.UUID, _CompanyWindow]:
+    latest_group = array_agg(
+        aggregate_order_by(Signal.correlation_group_id, Signal.created_at.desc())
+    ).filter(Signal.correlation_group_id.is_not(None))
     result = await db.execute(
-        select(Signal)
+        select(
+            Signal.company_id,
+            func.count().label("signal_count"),
+            func.array_agg(func.distinct(Signal.signal_category)).label("categories"),
+            latest_group[1].label("group_id"),
+        )
         .where(
-            Signal.company_id == signal.company_id,
-            Signal.id != signal.id,
+            Signal.company_id.in_(company_ids),
             Signal.created_at >= cutoff,
+            Signal.id.not_in(exclude_ids),
         )
-        .order_by(Signal.created_at.desc())
+        .group_by(Signal.company_id)
     )
-    related = result.scalars().all()
+    return {
+        row.company_id: _CompanyWindow(row.signal_count, set(row.categories or []), row.group_id)
+        for row in result.all()
+    }
 
-    if not related:
-        return None
 
-    # Check if any related signal already has a correlation group
-    existing_group = None
-    for s in related:
-        if s.correlation_group_id:
-            existing_group = s.correlation_group_id
-            break
+async def correlate_signals(db: AsyncSession, signals: list[Signal]) -> dict[uuid.UUID, uuid.UUID]:
+    """Attach a batch of new, flushed signals to correlation groups.
 
-    # Different source category = strong correlation
-    related_categories = {s.signal_category for s in related}
-    if signal.signal_category not in related_categories or existing_group:
-        group_id = existing_group or uuid.uuid4()
-        signal.correlation_group_id = group_id
+    Returns {company_id: group_id} for every company whose signals correlated.
+    """
+    if not signals:
+        return {}
 
-        # Update related signals without a group
-        for s in related:
-            if not s.correlation_group_id:
-                s.correlation_group_id = group_id
+    cutoff = datetime.now(timezone.utc) - timedelta(days=CORRELATION_WINDOW_DAYS)
+    by_company: dict[uuid.UUID, list[Signal]] = {}
+    for signal in signals:
+        by_company.setdefault(signal.company_id, []).append(signal)
+
+    windows = await _load_windows(db, list(by_company), [s.id for s in signals], cutoff)
+
+    assignments: dict[uuid.UUID, uuid.UUID] = {}
+    new_groups = []
+    for company_id, company_signals in by_company.items():
+        window = windows.get(company_id, _CompanyWindow())
+        group_id, is_new = assign_group(window, [s.signal_category for s in company_signals])
+        if group_id is None:
+            continue
+        assignments[company_id] = group_id
+        if is_new:
+            now = datetime.now(timezone.utc)
+            new_groups.append({"id": group_id, "company_id": company_id, "window_start": now, "window_end": now})
+
+    if not assignments:
+        return {}
+
+    if new_groups:
+        await db.execute(insert(CorrelationGroup), new_groups)
+
+    # Every ungrouped signal in the window joins, including this batch's
+    signal_table = Signal.__table__
+    await db.execute(
+        update(signal_table)
+        .where(
+            signal_table.c.company_id == bindparam("b_company_id"),
+            signal_table.c.created_at >= cutoff,
+            signal_table.c.correlation_group_id.is_(None),
+        )
+        .values(correlation_group_id=bindparam("b_group_id")),
+        [{"b_company_id": c, "b_group_id": g} for c, g in assignments.items()],
+    )
+    for company_id, group_id in assignments.items():
+        for signal in by_company[company_id]:
+            if signal.correlation_group_id is None:
+                set_committed_value(signal, "correlation_group_id", group_id)
+
+    group_ids = list(set(assignments.values()))
+    stats = (
+        select(
+            Signal.correlation_group_id.label("group_id"),
+            func.min(Signal.created_at).label("window_start"),
+            func.max(Signal.created_at).label("window_end"),
+            func.array_agg(func.distinct(Signal.signal_category)).label("categories"),
+            func.count().label("member_count"),
+        )
+        .where(Signal.correlation_group_id.in_(group_ids))
+        .group_by(Signal.correlation_group_id)
+        .subquery()
+    )
+    await db.execute(
+        update(CorrelationGroup)
+        .where(CorrelationGroup.id == stats.c.group_id)
+        .values(
+            window_start=stats.c.window_start,
+            window_end=stats.c.window_end,
+            categories=stats.c.categories,
+            member_count=stats.c.member_count,
+            updated_at=func.now(),
+        )
+        .execution_options(synchronize_session=False)
+    )
 
+    for company_id, group_id in assignments.items():
         logger.info(
             "correlation.group_formed",
-            company_id=str(signal.company_id),
+            company_id=str(company_id),
             group_id=str(group_id),
-            signal_count=len(related) + 1,
-            categories=list(related_categories | {signal.signal_category}),
+            new_signals=len(by_company[company_id]),
         )
-
-        return group_id
-
-    return None
+    return assignments
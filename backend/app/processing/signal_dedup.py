@@ -0,0 +1,82 @@
+"""Duplicate-signal detection for a pipeline batch.
+
+A new signal is a duplicate when a signal for the same company and type was
+published within DEDUP_WINDOW of it. The whole batch is checked at once: its
+(company_id, signal_type, window) tuples form a small derived table joined
+against ``signals`` in one statement (served by the
+``(company_id, signal_type, source_published_at)`` index). Candidates are
+then replayed in batch order, so two raws in the same batch describing the
+same event keep only the first.
+"""
+
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any
+
+from sqlalchemy import Integer, and_, literal, select, union_all
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import Signal
+
+DEDUP_WINDOW = timedelta(days=2)
+
+
+@dataclass
+class DedupCandidate:
+    company_id: Any
+    signal_type: str
+    published_at: datetime
+
+
+def duplicate_signals_query(candidates: list[DedupCandidate]):
+    """Positions of the candidates that already have a signal within the window."""
+    signals = Signal.__table__
+    window_type = signals.c.source_published_at.type
+    rows = [
+        select(
+            literal(position, Integer).label("position"),
+            literal(candidate.company_id, signals.c.company_id.type).label("company_id"),
+            literal(candidate.signal_type, signals.c.signal_type.type).label("signal_type"),
+            literal(candidate.published_at - DEDUP_WINDOW, window_type).label("window_start"),
+            literal(candidate.published_at + DEDUP_WINDOW, window_type).label("window_end"),
+        )
+        for position, candidate in enumerate(candidates)
+    ]
+    batch = (union_all(*rows) if len(rows) > 1 else rows[0]).subquery("candidates")
+    return (
+        select(batch.c.position)
+        .join(
+            signals,
+            and_(
+                signals.c.company_id == batch.c.company_id,
+                signals.c.signal_type == batch.c.signal_type,
+                signals.c.source_published_at >= batch.c.window_start,
+                signals.c.source_published_at <= batch.c.window_end,
+            ),
+        )
+        .distinct()
+    )
+
+
+def duplicates_within_batch(candidates: list[DedupCandidate], existing: set[int]) -> set[int]:
+    """Add candidates that repeat an earlier, kept candidate of the same batch."""
+    duplicates = set(existing)
+    kept: dict[tuple, list[datetime]] = {}
+    for position, candidate in enumerate(candidates):
+        if position in duplicates:
+            continue
+        key = (candidate.company_id, candidate.signal_type)
+        earlier = kept.setdefault(key, [])
+        if any(abs(candidate.published_at - published) <= DEDUP_WINDOW for published in earlier):
+            duplicates.add(position)
+        else:
+            earlier.append(candidate.published_at)
+    return duplicates
+
+
+async def find_duplicate_signals(db: AsyncSession, candidates: list[DedupCandidate]) -> set[int]:
+    """Positions in ``candidates`` that should not become signals."""
+    if not candidates:
+        return set()
+    result = await db.execute(duplicate_signals_query(candidates))
+    return duplicates_within_batch(candidates, set(result.scalars().all()))
@@ -0,0 +1,73 @@
+"""Priority queue of raw signals awaiting processing.
+
+Raw signals are claimed by source trust and event urgency instead of
+arrival order, so a CourtListener Chapter 7 filing or a WARN closure is not
+stuck behind a burst of GDELT headlines. A raw's priority is its source's
+SOURCE_WEIGHTS trust plus URGENCY_WEIGHT times the URGENCY_MAP tier of the
+collector's event type, computed in SQL at claim time.
+
+Waiting adds AGING_POINTS_PER_HOUR to the claim order, so even the
+lowest-priority raw overtakes a fresh raw of the highest priority within
+MAX_STARVATION_HOURS.
+"""
+
+from datetime import datetime, timedelta
+
+from sqlalchemy import case, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import RawSignal, Signal
+from app.processing.deal_scorer import URGENCY_MAP
+from app.processing.signal_classifier import SOURCE_WEIGHTS
+
+DEFAULT_SOURCE_WEIGHT = 50  # Same default the classifier applies
+DEFAULT_URGENCY = 4.0  # Same default the deal scorer applies
+URGENCY_WEIGHT = 2.5  # Multiplies the URGENCY_MAP tier (max 18)
+MAX_PRIORITY = max(SOURCE_WEIGHTS.values()) + URGENCY_WEIGHT * max(URGENCY_MAP.values())
+MIN_PRIORITY = min(DEFAULT_SOURCE_WEIGHT, *SOURCE_WEIGHTS.values()) + URGENCY_WEIGHT * min(
+    DEFAULT_URGENCY, *URGENCY_MAP.values()
+)
+MAX_STARVATION_HOURS = 6
+AGING_POINTS_PER_HOUR = (MAX_PRIORITY - MIN_PRIORITY) / MAX_STARVATION_HOURS
+WAIT_METRICS_WINDOW = timedelta(hours=24)
+
+
+def raw_signal_priority(source_type: str, event_type: str) -> float:
+    """Claim priority of a raw signal before aging, MIN_PRIORITY..MAX_PRIORITY."""
+    trust = SOURCE_WEIGHTS.get(source_type, DEFAULT_SOURCE_WEIGHT)
+    return trust + URGENCY_WEIGHT * URGENCY_MAP.get(event_type, DEFAULT_URGENCY)
+
+
+def claim_score(source_type: str, event_type: str, waited_hours: float) -> float:
+    """What ``claim_order`` ranks by, for a raw that has waited ``waited_hours``."""
+    return raw_signal_priority(source_type, event_type) + waited_hours * AGING_POINTS_PER_HOUR
+
+
+def claim_order():
+    """ORDER BY for claiming raw signals: priority plus aging, highest first."""
+    trust = case(SOURCE_WEIGHTS, value=RawSignal.source_type, else_=DEFAULT_SOURCE_WEIGHT)
+    urgency = case(URGENCY_MAP, value=RawSignal.event_type, else_=DEFAULT_URGENCY)
+    waited_hours = func.extract("epoch", func.now() - RawSignal.created_at) / 3600
+    return (trust + URGENCY_WEIGHT * urgency + waited_hours * AGING_POINTS_PER_HOUR).desc()
+
+
+async def raw_queue_by_source(db: AsyncSession) -> dict[str, tuple[int, datetime | None]]:
+    """Raw signals awaiting processing per source: (queue depth, oldest arrival)."""
+    result = await db.execute(
+        select(RawSignal.source_type, func.count(), func.min(RawSignal.created_at))
+        .where(RawSignal.processing_status == "raw")
+        .group_by(RawSignal.source_type)
+    )
+    return {source: (depth, oldest) for source, depth, oldest in result.all()}
+
+
+async def queue_wait_by_source(db: AsyncSession, now: datetime) -> dict[str, tuple[float, float]]:
+    """Per source, (average, max) seconds from collection to signal over the last day."""
+    waited = func.extract("epoch", Signal.created_at - RawSignal.created_at)
+    result = await db.execute(
+        select(RawSignal.source_type, func.avg(waited), func.max(waited))
+        .join(Signal, Signal.raw_signal_id == RawSignal.id)
+        .where(Signal.created_at >= now - WAIT_METRICS_WINDOW)
+        .group_by(RawSignal.source_type)
+    )
+    return {source: (float(avg), float(worst)) for source, avg, worst in result.all()}
@@ -23,9 +23,19 @@ class ContactOut(BaseModel):
     model_config = {"from_attributes": True}
 
 
+class ContactDiscoveryProgress(BaseModel):
+    state: str  # "queued" | "scraping" | "extracting" | "validating" | "done" | "failed"
+    found: int | None = None
+    validated: int | None = None
+    error: str | None = None
+    updated_at: datetime | None = None
+
+
 class ContactsResponse(BaseModel):
     contacts: list[ContactOut]
     company_id: UUID
     company_name: str
-    status: str  # "found" | "none_found" | "no_domain"
+    status: str  # "found" | "none_found" | "no_domain" | "pending" | "failed"
     total: int
+    job_id: str | None = None
+    progress: ContactDiscoveryProgress | None = None
@@ -25,3 +25,9 @@ class PipelineHealthItem(BaseModel):
     last_run_duration_ms: int | None = None
     error_count: int
     last_error: str | None = None
+    enrichment_queue_depth: int = 0  # Companies from this source awaiting enrichment
+    enrichment_oldest_wait_seconds: int | None = None
+    raw_queue_depth: int = 0  # Raw signals from this source awaiting processing
+    raw_oldest_wait_seconds: int | None = None
+    avg_queue_wait_seconds: int | None = None  # Collection to signal, last 24h
+    max_queue_wait_seconds: int | None = None
@@ -0,0 +1,99 @@
+"""Async Resend client over a pooled httpx.AsyncClient.
+
+Replaces the blocking ``resend.Emails.send`` SDK call inside async handlers.
+Talks to the Resend REST API directly so sends share one connection pool and
+never occupy the event loop for a network round trip.
+"""
+
+import httpx
+import structlog
+from tenacity import (
+    retry,
+    retry_if_exception,
+    stop_after_attempt,
+    wait_exponential,
+)
+
+from app.config import settings
+
+logger = structlog.get_logger()
+
+RESEND_BATCH_LIMIT = 100  # Max emails per POST /emails/batch
+RETRYABLE_STATUS = frozenset({429, 500, 502, 503, 504})
+
+
+class ResendError(Exception):
+    """Non-2xx response (or exhausted retries) from the Resend API."""
+
+    def __init__(self, message: str, status_code: int | None = None):
+        super().__init__(message)
+        self.status_code = status_code
+
+    @property
+    def retryable(self) -> bool:
+        return self.status_code is None or self.status_code in RETRYABLE_STATUS
+
+
+def _should_retry(exc: BaseException) -> bool:
+    if isinstance(exc, httpx.TransportError):
+        return True
+    return isinstance(exc, ResendError) and exc.retryable
+
+
+class ResendClient:
+    """Minimal async client for the Resend emails endpoints."""
+
+    def __init__(self, api_key: str | None = None, base_url: str | None = None, timeout: float = 10.0):
+        self._api_key = api_key
+        self._base_url = base_url
+        self._timeout = timeout
+        self._client: httpx.AsyncClient | None = None
+
+    @property
+    def configured(self) -> bool:
+        return bool(self._api_key or settings.resend_api_key)
+
+    def _get_client(self) -> httpx.AsyncClient:
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                base_url=self._base_url or settings.resend_api_url,
+                timeout=httpx.Timeout(self._timeout, connect=5.0),
+                limits=httpx.Limits(max_connections=20, max_keepalive_connections=10),
+                headers={"Authorization": f"Bearer {self._api_key or settings.resend_api_key}"},
+            )
+        return self._client
+
+    @retry(
+        retry=retry_if_exception(_should_retry),
+        stop=stop_after_attempt(3),
+        wait=wait_exponential(multiplier=0.5, max=8),
+        reraise=True,
+    )
+    async def _post(self, path: str, payload, idempotency_key: str | None):
+        headers = {"Idempotency-Key": idempotency_key} if idempotency_key else None
+        response = await self._get_client().post(path, json=payload, headers=headers)
+        if response.status_code >= 400:
+            raise ResendError(
+                f"Resend {path} failed: {response.status_code} {response.text[:200]}",
+                status_code=response.status_code,
+            )
+        return response.json()
+
+    async def send(self, params: dict, idempotency_key: str | None = None) -> dict:
+        """Send one email. ``params`` uses Resend's field names (from, to, subject, html/text)."""
+        return await self._post("/emails", params, idempotency_key)
+
+    async def send_batch(self, emails: list[dict], idempotency_key: str | None = None) -> list[dict]:
+        """Send up to RESEND_BATCH_LIMIT emails in one request. Returns one {id} per email."""
+        if len(emails) > RESEND_BATCH_LIMIT:
+            raise ValueError(f"Resend batch limit is {RESEND_BATCH_LIMIT}, got {len(emails)}")
+        result = await self._post("/emails/batch", emails, idempotency_key)
+        return result.get("data", []) if isinstance(result, dict) else result
+
+    async def aclose(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+resend_client = ResendClient()
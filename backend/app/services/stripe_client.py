@@ -0,0 +1,62 @@
+"""Async Stripe access for request handlers.
+
+Uses stripe-python's native ``*_async`` methods on a ``StripeClient`` backed by
+``stripe.HTTPXClient``, so every billing call shares one pooled
+httpx.AsyncClient instead of blocking the event loop. Stripe retries network
+errors itself (with idempotency keys on POSTs) up to ``max_network_retries``.
+"""
+
+import stripe
+
+from app.config import settings
+
+_client: stripe.StripeClient | None = None
+_http_client: stripe.HTTPXClient | None = None
+
+
+def get_stripe_client() -> stripe.StripeClient:
+    """Return the process-wide async-capable StripeClient."""
+    global _client, _http_client
+    if _client is None:
+        _http_client = stripe.HTTPXClient(timeout=settings.stripe_timeout_seconds)
+        base_addresses = {"api": settings.stripe_api_base} if settings.stripe_api_base else None
+        _client = stripe.StripeClient(
+            settings.stripe_secret_key,
+            http_client=_http_client,
+            max_network_retries=2,
+            base_addresses=base_addresses,
+        )
+    return _client
+
+
+async def create_customer(email: str | None, name: str | None, metadata: dict) -> stripe.Customer:
+    params: dict = {"metadata": metadata}
+    if email:
+        params["email"] = email
+    if name:
+        params["name"] = name
+    return await get_stripe_client().v1.customers.create_async(params)
+
+
+async def create_checkout_session(**params) -> stripe.checkout.Session:
+    return await get_stripe_client().v1.checkout.sessions.create_async(params)
+
+
+async def create_subscription(**params) -> stripe.Subscription:
+    return await get_stripe_client().v1.subscriptions.create_async(params)
+
+
+async def retrieve_subscription(subscription_id: str) -> stripe.Subscription:
+    return await get_stripe_client().v1.subscriptions.retrieve_async(subscription_id)
+
+
+async def create_portal_session(**params) -> stripe.billing_portal.Session:
+    return await get_stripe_client().v1.billing_portal.sessions.create_async(params)
+
+
+async def close_stripe_client() -> None:
+    global _client, _http_client
+    if _http_client is not None:
+        await _http_client.close_async()
+    _client = None
+    _http_client = None
@@ -0,0 +1,58 @@
+"""Dedicated arq worker that drains the transactional email outbox.
+
+Runs on its own queue so slow provider I/O never competes with ingestion or
+signal processing:
+
+    arq app.workers.email_worker.EmailWorkerSettings
+
+Producers enqueue ``deliver_email_outbox`` after committing outbox rows; the
+per-minute cron picks up retries and anything enqueued while the worker was down.
+"""
+
+from arq import cron
+from arq.connections import RedisSettings
+
+from app.config import settings
+
+EMAIL_QUEUE_NAME = "arq:email"
+
+
+async def deliver_email_outbox(ctx):
+    from app.email.outbox import deliver_pending_emails
+
+    return await deliver_pending_emails()
+
+
+async def kick_email_outbox(ctx) -> None:
+    """Wake the email worker from another worker's job (after outbox rows commit)."""
+    redis = ctx.get("redis")
+    if redis is None:
+        return
+    # Concurrent drains are safe: claims use FOR UPDATE SKIP LOCKED
+    await redis.enqueue_job("deliver_email_outbox", _queue_name=EMAIL_QUEUE_NAME)
+
+
+async def startup(ctx):
+    from app.core.loop_monitor import start_loop_monitor
+
+    start_loop_monitor()
+
+
+async def shutdown(ctx):
+    from app.core.loop_monitor import stop_loop_monitor
+    from app.services.resend_client import resend_client
+
+    await stop_loop_monitor()
+    await resend_client.aclose()
+
+
+class EmailWorkerSettings:
+    redis_settings = RedisSettings.from_dsn(settings.redis_url)
+    queue_name = EMAIL_QUEUE_NAME
+    on_startup = startup
+    on_shutdown = shutdown
+    functions = [deliver_email_outbox]
+    cron_jobs = [
+        cron(deliver_email_outbox, minute=set(range(60)), unique=True),
+    ]
+    max_jobs = 2
@@ -2,16 +2,14 @@
 
 import json
 
-import resend
 import structlog
 from sqlalchemy import text
 
 from app.config import settings
+from app.services.resend_client import resend_client
 
 logger = structlog.get_logger()
 
-resend.api_key = settings.resend_api_key
-
 
 async def run_security_audit(ctx):
     """Run all security checks, store results, and alert admins on failures."""
@@ -48,7 +46,7 @@ async def run_security_audit(ctx):
         check_lines = "\n".join(f"  - [{c.severity}] {c.name}: {c.message}" for c in failed_checks)
 
         try:
-            resend.Emails.send({
+            await resend_client.send({
                 "from": settings.from_email,
                 "to": admin_list,
                 "subject": f"[DispoSight] Security Audit FAILED — {len(failed_checks)} issue(s)",
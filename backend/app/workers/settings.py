@@ -1,7 +1,8 @@
-from arq import cron
+from arq import cron, func
 from arq.connections import RedisSettings
 
 from app.config import settings
+from app.workers.email_worker import kick_email_outbox
 
 
 async def collect_warn_act(ctx):
@@ -66,7 +67,8 @@ async def process_raw_signals(ctx):
     async with async_session_factory() as db:
         result = await process_pending_signals(db)
         await db.commit()
-        return result
+    await kick_email_outbox(ctx)
+    return result
 
 
 async def enrich_companies(ctx):
@@ -84,48 +86,77 @@ async def backfill_company_enrichment(ctx):
     from app.processing.company_enricher import backfill_all_companies
 
     async with async_session_factory() as db:
-        result = await backfill_all_companies(db, batch_size=30)
+        result = await backfill_all_companies(db, batch_size=100)
         return result
 
 
 async def refresh_all_risk_scores(ctx):
-    from sqlalchemy import select
-
     from app.db.session import async_session_factory
-    from app.models import Company
-    from app.processing.risk_scorer import update_company_risk_score
+    from app.processing.risk_scorer import refresh_all_risk_scores as refresh_scores
 
     async with async_session_factory() as db:
-        result = await db.execute(
-            select(Company.id).where(Company.signal_count > 0)
-        )
-        company_ids = result.scalars().all()
+        updated = await refresh_scores(db)
+        return {"companies_refreshed": updated}
 
-        updated = 0
-        for company_id in company_ids:
-            await update_company_risk_score(db, company_id)
-            updated += 1
 
-        await db.commit()
-        return {"companies_refreshed": updated}
+async def discover_company_contacts(ctx, company_id: str, budget_hour: str | None = None):
+    from app.contacts.jobs import run_discovery_job
+    from app.contacts.prefetch import run_prefetch_job
+
+    if budget_hour is not None:
+        # Queued by prefetch: metered against that hour's budgets
+        return await run_prefetch_job(company_id, budget_hour)
+    return await run_discovery_job(company_id)
+
+
+async def prefetch_top_contacts(ctx):
+    from app.contacts.prefetch import prefetch_contacts
+
+    return await prefetch_contacts()
 
 
 async def send_daily_digest(ctx):
     from app.db.session import async_session_factory
-    from app.email.sender import send_digest
+    from app.email.digest import send_digest
 
     async with async_session_factory() as db:
         await send_digest(db, frequency="daily")
         await db.commit()
+    await kick_email_outbox(ctx)
 
 
 async def send_weekly_digest(ctx):
     from app.db.session import async_session_factory
-    from app.email.sender import send_digest
+    from app.email.digest import send_digest
 
     async with async_session_factory() as db:
         await send_digest(db, frequency="weekly")
         await db.commit()
+    await kick_email_outbox(ctx)
+
+
+async def startup(ctx):
+    from app.core.loop_monitor import start_loop_monitor
+
+    start_loop_monitor()
+
+
+async def shutdown(ctx):
+    from app.contacts.browser_pool import browser_pool
+    from app.contacts.page_fetcher import close_http_client
+    from app.core.blocking import shutdown_executor
+    from app.core.loop_monitor import stop_loop_monitor
+    from app.core.redis import close_redis
+    from app.processing.sec_reference import sec_reference
+    from app.services.resend_client import resend_client
+
+    await stop_loop_monitor()
+    await resend_client.aclose()
+    await close_http_client()
+    await browser_pool.close()
+    await sec_reference.close()
+    await close_redis()
+    shutdown_executor()
 
 
 async def run_security_audit_job(ctx):
@@ -135,6 +166,8 @@ async def run_security_audit_job(ctx):
 
 class WorkerSettings:
     redis_settings = RedisSettings.from_dsn(settings.redis_url)
+    on_startup = startup
+    on_shutdown = shutdown
     functions = [
         collect_warn_act,
         collect_gdelt_news,
@@ -145,6 +178,9 @@ class WorkerSettings:
         enrich_companies,
         backfill_company_enrichment,
         refresh_all_risk_scores,
+        # No stored result, so a finished company can be re-queued at once
+        func(discover_company_contacts, keep_result=0),
+        prefetch_top_contacts,
         send_daily_digest,
         send_weekly_digest,
         run_security_audit_job,
@@ -158,6 +194,7 @@ class WorkerSettings:
         cron(process_raw_signals, hour=None, minute={10, 40}),
         cron(enrich_companies, hour={2, 8, 14, 20}, minute=30),
         cron(refresh_all_risk_scores, hour=5, minute=0),  # Daily 5am UTC
+        cron(prefetch_top_contacts, hour={6, 7, 8, 9}, minute=50),  # Off-peak: overnight in the US
         cron(send_daily_digest, hour=13, minute=0),
         cron(send_weekly_digest, weekday=1, hour=13, minute=0),
         cron(run_security_audit_job, hour={0, 6, 12, 18}, minute=15),  # Every 6 hours
@@ -0,0 +1,127 @@
+"""Benchmark: pooled Playwright browser vs. launching Chromium per company.
+
+Serves synthetic team pages (with images and web fonts) from a local HTTP
+server and renders them for N "companies" both ways, with the same number
+of companies in flight on each side, printing pages/second.
+
+    uv run python scripts/bench_browser_pool.py --companies 20 --paths 3
+
+Requires Chromium: ``uv run playwright install chromium``.
+"""
+
+import argparse
+import asyncio
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.contacts.browser_pool import STRIP_CHROME_JS, USER_AGENT, BrowserPool
+
+PAGE = """<html><head>
+<link rel="stylesheet" href="/font.css"></head><body>
+<nav>Home | About</nav>
+<h1>Our Leadership</h1>
+{people}
+<footer>&copy; Example Co</footer>
+</body></html>"""
+
+PERSON = '<div><img src="/img/{i}.jpg"><p>Person {i} — Vice President of Operations</p></div>'
+
+
+class _Handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.startswith("/img/"):
+            body, ctype = b"\xff\xd8" + b"\0" * 50_000, "image/jpeg"
+        elif self.path == "/font.css":
+            body, ctype = b"body { font-family: sans-serif; }", "text/css"
+        else:
+            people = "\n".join(PERSON.format(i=i) for i in range(12))
+            body, ctype = PAGE.format(people=people).encode(), "text/html"
+        self.send_response(200)
+        self.send_header("Content-Type", ctype)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+async def _launch_per_company(base_url: str, paths: list[str]) -> int:
+    """The previous behaviour: a new Chromium for every company."""
+    from playwright.async_api import async_playwright
+
+    rendered = 0
+    async with async_playwright() as p:
+        browser = await p.chromium.launch(headless=True)
+        context = await browser.new_context(user_agent=USER_AGENT)
+        page = await context.new_page()
+        for path in paths:
+            await page.goto(f"{base_url}{path}", timeout=10000, wait_until="networkidle")
+            await page.evaluate(STRIP_CHROME_JS)
+            if await page.evaluate("document.body.innerText"):
+                rendered += 1
+        await browser.close()
+    return rendered
+
+
+async def _pooled(pool: BrowserPool, base_url: str, paths: list[str]) -> int:
+    text = await pool.scrape(base_url, paths, max_chars=10**9)
+    return text.count("\n--- ")
+
+
+async def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--companies", type=int, default=20)
+    parser.add_argument("--paths", type=int, default=3)
+    parser.add_argument("--concurrency", type=int, default=3)
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_port}"
+    paths = [f"/team{i}" for i in range(args.paths)]
+
+    # Warm-up render: fails fast if Chromium is missing and evens out cold disk caches
+    await _launch_per_company(base_url, paths[:1])
+
+    # Both sides render the same companies at the same concurrency
+    slots = asyncio.Semaphore(args.concurrency)
+
+    async def launch_one() -> int:
+        async with slots:
+            return await _launch_per_company(base_url, paths)
+
+    start = time.perf_counter()
+    counts = await asyncio.gather(*(launch_one() for _ in range(args.companies)))
+    launch_elapsed = time.perf_counter() - start
+    pages = sum(counts)
+    print(
+        f"launch-per-company (x{args.concurrency} browsers): {pages} pages in {launch_elapsed:.1f}s = "
+        f"{pages / launch_elapsed:.1f} pages/s"
+    )
+
+    pool = BrowserPool(max_contexts=args.concurrency)
+    try:
+        start = time.perf_counter()
+        counts = await asyncio.gather(*(_pooled(pool, base_url, paths) for _ in range(args.companies)))
+        pool_elapsed = time.perf_counter() - start
+    finally:
+        await pool.close()
+    pages = sum(counts)
+    print(
+        f"pooled (x{args.concurrency} contexts): {pages} pages in {pool_elapsed:.1f}s = "
+        f"{pages / pool_elapsed:.1f} pages/s, browser launches: {pool.launches}"
+    )
+    print(f"speedup: {launch_elapsed / pool_elapsed:.1f}x")
+
+    server.shutdown()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
@@ -0,0 +1,183 @@
+"""In-memory stand-ins for the database session and Redis shared by the tests."""
+
+from contextlib import asynccontextmanager
+
+from redis.exceptions import ConnectionError as RedisConnectionError
+
+
+class StandInResult:
+    """Rows returned by a stand-in ``execute``."""
+
+    def __init__(self, rows=()):
+        self._rows = list(rows)
+
+    def all(self):
+        return list(self._rows)
+
+    def scalars(self):
+        return self
+
+    def scalar_one_or_none(self):
+        return self._rows[0] if self._rows else None
+
+
+class StandInSession:
+    """Records statements and answers them in order from ``results``.
+
+    Once ``results`` runs out every statement is answered with ``rows``.
+    Subclasses override ``respond`` to answer by statement. Tracks whether a
+    transaction is open the way SQLAlchemy's autobegin would, and drops
+    objects added inside a savepoint that rolls back.
+    """
+
+    def __init__(self, rows=(), results=(), objects=None):
+        self.rows = list(rows)
+        self.results = [list(r) for r in results]
+        self.objects = dict(objects or {})
+        self.statements: list[tuple] = []
+        self.added: list = []
+        self.commits = 0
+        self.rollbacks = 0
+        self.savepoints = 0
+        self.flushed = False
+        self.in_transaction = False
+
+    def respond(self, statement, params):
+        return self.results.pop(0) if self.results else self.rows
+
+    async def execute(self, statement, params=None):
+        self.in_transaction = True
+        self.statements.append((statement, params))
+        return StandInResult(self.respond(statement, params))
+
+    async def get(self, model, ident):
+        self.in_transaction = True
+        return self.objects.get(ident)
+
+    def add(self, obj):
+        self.in_transaction = True
+        self.added.append(obj)
+
+    async def flush(self):
+        self.in_transaction = True
+        self.flushed = True
+
+    async def commit(self):
+        self.in_transaction = False
+        self.commits += 1
+
+    async def rollback(self):
+        self.in_transaction = False
+        self.rollbacks += 1
+
+    @asynccontextmanager
+    async def begin_nested(self):
+        self.in_transaction = True
+        self.savepoints += 1
+        mark = len(self.added)
+        try:
+            yield
+        except Exception:
+            del self.added[mark:]  # Rolled-back savepoint drops its pending objects
+            raise
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+class StandInRedis:
+    """In-memory strings, hashes and sorted sets, with pipelines.
+
+    With ``fail`` set every command raises a connection error.
+    """
+
+    def __init__(self, fail: bool = False):
+        self.strings: dict[str, object] = {}
+        self.hashes: dict[str, dict[bytes, bytes]] = {}
+        self.zsets: dict[str, dict[str, float]] = {}
+        self.fail = fail
+        self.round_trips = 0
+
+    def _run(self, name, args, kwargs):
+        return getattr(self, f"_{name}")(*args, **kwargs)
+
+    def _check(self):
+        if self.fail:
+            raise RedisConnectionError("down")
+        self.round_trips += 1
+
+    def pipeline(self, transaction: bool = True):
+        return _Pipeline(self)
+
+    async def get(self, key):
+        self._check()
+        return self.strings.get(key)
+
+    async def hgetall(self, key):
+        self._check()
+        return dict(self.hashes.get(key, {}))
+
+    async def mget(self, keys):
+        self._check()
+        return [self.strings.get(key) for key in keys]
+
+    async def delete(self, *keys):
+        self._check()
+        return sum(self._delete(key) for key in keys)
+
+    def _set(self, key, value, ex=None):
+        self.strings[key] = value
+        return True
+
+    def _incrby(self, key, amount):
+        self.strings[key] = int(self.strings.get(key) or 0) + amount
+        return self.strings[key]
+
+    def _expire(self, key, ttl):
+        return True
+
+    def _exists(self, key):
+        return int(key in self.strings or key in self.hashes or key in self.zsets)
+
+    def _delete(self, key):
+        found = self._exists(key)
+        for store in (self.strings, self.hashes, self.zsets):
+            store.pop(key, None)
+        return found
+
+    def _hset(self, key, mapping):
+        encoded = {k.encode(): str(v).encode() for k, v in mapping.items()}
+        self.hashes.setdefault(key, {}).update(encoded)
+        return len(encoded)
+
+    def _zadd(self, key, mapping):
+        self.zsets.setdefault(key, {}).update(mapping)
+        return len(mapping)
+
+    def _zcard(self, key):
+        return len(self.zsets.get(key, {}))
+
+    def _zremrangebyscore(self, key, low, high):
+        zset = self.zsets.get(key, {})
+        kept = {m: s for m, s in zset.items() if s > float(high)}
+        self.zsets[key] = kept
+        return len(zset) - len(kept)
+
+
+class _Pipeline:
+    def __init__(self, redis: StandInRedis):
+        self.redis = redis
+        self.ops = []
+
+    def __getattr__(self, name):
+        def queue(*args, **kwargs):
+            self.ops.append((name, args, kwargs))
+            return self
+        return queue
+
+    async def execute(self):
+        self.redis._check()
+        return [self.redis._run(name, args, kwargs) for name, args, kwargs in self.ops]
@@ -0,0 +1,91 @@
+"""Tests for the in-memory realtime alert index."""
+
+import random
+import uuid
+from types import SimpleNamespace
+
+from app.email.alert_index import AlertIndex, signal_matches_alert
+
+COMPANIES = [uuid.uuid4() for _ in range(6)]
+TYPES = ["layoff", "facility_shutdown", "bankruptcy_ch11", "liquidation"]
+STATES = ["CA", "TX", "NY", "OH"]
+
+
+def _alert(**kw):
+    defaults = dict(
+        id=uuid.uuid4(),
+        signal_types=[],
+        states=[],
+        company_ids=[],
+        min_confidence_score=0,
+        min_severity_score=0,
+    )
+    defaults.update(kw)
+    return SimpleNamespace(**defaults)
+
+
+def _signal(**kw):
+    defaults = dict(
+        company_id=COMPANIES[0],
+        signal_type="layoff",
+        location_state="CA",
+        confidence_score=70,
+        severity_score=60,
+    )
+    defaults.update(kw)
+    return SimpleNamespace(**defaults)
+
+
+def _random_alert(rng: random.Random):
+    return _alert(
+        signal_types=rng.sample(TYPES, rng.choice([0, 0, 1, 2])),
+        states=rng.sample(STATES, rng.choice([0, 0, 1, 2])),
+        company_ids=rng.sample(COMPANIES, rng.choice([0, 0, 0, 1, 2])),
+        min_confidence_score=rng.choice([0, 40, 60, 80]),
+        min_severity_score=rng.choice([0, 30, 50, 70, 90]),
+    )
+
+
+def _random_signal(rng: random.Random):
+    return _signal(
+        company_id=rng.choice(COMPANIES),
+        signal_type=rng.choice(TYPES),
+        location_state=rng.choice(STATES + [None]),
+        confidence_score=rng.randint(0, 100),
+        severity_score=rng.randint(0, 100),
+    )
+
+
+class TestAlertIndex:
+    def test_matches_brute_force(self):
+        rng = random.Random(42)
+        alerts = [_random_alert(rng) for _ in range(300)]
+        index = AlertIndex(alerts)
+        for _ in range(500):
+            signal = _random_signal(rng)
+            expected = [a for a in alerts if signal_matches_alert(signal, a)]
+            assert index.match(signal) == expected
+
+    def test_company_scoped_alert_not_a_candidate_for_other_companies(self):
+        scoped = _alert(company_ids=[COMPANIES[1]])
+        index = AlertIndex([scoped])
+        assert index.candidates(_signal(company_id=COMPANIES[2])) == []
+        assert index.match(_signal(company_id=COMPANIES[1])) == [scoped]
+
+    def test_open_alerts_pruned_by_severity(self):
+        low, high = _alert(min_severity_score=10), _alert(min_severity_score=90)
+        index = AlertIndex([high, low])
+        assert index.candidates(_signal(severity_score=50)) == [low]
+
+    def test_signal_without_state_matches_state_filtered_alert(self):
+        alert = _alert(states=["TX"])
+        index = AlertIndex([alert])
+        assert index.match(_signal(location_state=None)) == [alert]
+        assert index.match(_signal(location_state="CA")) == []
+
+    def test_preserves_alert_order(self):
+        a = _alert(signal_types=["layoff"])
+        b = _alert()
+        c = _alert(company_ids=[COMPANIES[0]])
+        index = AlertIndex([a, b, c])
+        assert index.match(_signal()) == [a, b, c]
@@ -0,0 +1,140 @@
+"""Tests for the pooled Playwright browser (against stand-in browser objects)."""
+
+import asyncio
+from types import SimpleNamespace
+
+from app.contacts.browser_pool import BrowserPool, _block_heavy_resources
+
+
+class StandInPage:
+    def __init__(self, texts: dict[str, str]):
+        self.texts = texts
+        self.url = ""
+
+    async def goto(self, url, **kwargs):
+        self.url = url
+
+    async def evaluate(self, script):
+        if script == "document.body.innerText":
+            return self.texts.get(self.url.rsplit("/", 1)[-1], "")
+        return None
+
+
+class StandInContext:
+    def __init__(self, browser):
+        self.browser = browser
+        self.routes = []
+        self.closed = False
+
+    async def route(self, pattern, handler):
+        self.routes.append((pattern, handler))
+
+    async def new_page(self):
+        return StandInPage(self.browser.texts)
+
+    async def close(self):
+        self.closed = True
+        self.browser.open_contexts -= 1
+
+
+class StandInBrowser:
+    def __init__(self, texts):
+        self.texts = texts
+        self.connected = True
+        self.open_contexts = 0
+        self.peak_contexts = 0
+
+    def is_connected(self):
+        return self.connected
+
+    async def new_context(self, **kwargs):
+        if not self.connected:
+            raise RuntimeError("Target closed")
+        self.open_contexts += 1
+        self.peak_contexts = max(self.peak_contexts, self.open_contexts)
+        await asyncio.sleep(0.01)
+        return StandInContext(self)
+
+    async def close(self):
+        self.connected = False
+
+
+class StandInPlaywright:
+    def __init__(self, texts=None):
+        self.browsers: list[StandInBrowser] = []
+        self.chromium = self
+        self.texts = texts or {}
+
+    async def launch(self, **kwargs):
+        browser = StandInBrowser(self.texts)
+        self.browsers.append(browser)
+        return browser
+
+    async def stop(self):
+        pass
+
+
+def _pool(max_contexts=2, texts=None) -> tuple[BrowserPool, StandInPlaywright]:
+    pool = BrowserPool(max_contexts=max_contexts)
+    pw = StandInPlaywright(texts)
+    pool._playwright = pw
+    return pool, pw
+
+
+class TestBrowserPool:
+    async def test_reuses_one_browser_with_fresh_contexts(self):
+        pool, pw = _pool(texts={"team": "Jane Doe, Chief Executive Officer " * 5})
+        results = await asyncio.gather(*(pool.scrape("https://acme.test", ["/team"]) for _ in range(6)))
+        assert all("--- /team ---" in r for r in results)
+        assert pool.launches == 1
+        assert pw.browsers[0].open_contexts == 0
+
+    async def test_concurrency_cap(self):
+        pool, pw = _pool(max_contexts=2)
+        await asyncio.gather(*(pool.scrape("https://acme.test", ["/team"]) for _ in range(8)))
+        assert pw.browsers[0].peak_contexts == 2
+
+    async def test_relaunches_after_crash(self):
+        pool, pw = _pool()
+        await pool.scrape("https://acme.test", ["/team"])
+        pw.browsers[0].connected = False
+        await pool.scrape("https://acme.test", ["/team"])
+        assert pool.launches == 2
+        assert len(pw.browsers) == 2
+
+    async def test_context_blocks_heavy_resources(self):
+        pool, _ = _pool()
+        async with pool.context() as ctx:
+            assert ctx.routes == [("**/*", _block_heavy_resources)]
+        assert ctx.closed
+
+    async def test_route_handler(self):
+        calls = []
+
+        def route(resource_type):
+            async def abort():
+                calls.append(("abort", resource_type))
+
+            async def continue_():
+                calls.append(("continue", resource_type))
+
+            return SimpleNamespace(request=SimpleNamespace(resource_type=resource_type), abort=abort, continue_=continue_)
+
+        for kind in ("image", "font", "media", "document", "script"):
+            await _block_heavy_resources(route(kind))
+        assert calls == [
+            ("abort", "image"),
+            ("abort", "font"),
+            ("abort", "media"),
+            ("continue", "document"),
+            ("continue", "script"),
+        ]
+
+    async def test_unavailable_browser_returns_empty(self):
+        pool, pw = _pool()
+
+        async def fail(**kwargs):
+            raise RuntimeError("Executable doesn't exist")
+
+        pw.launch = fail
+        assert await pool.scrape("https://acme.test", ["/team"]) == ""
@@ -0,0 +1,121 @@
+"""Tests for batched company resolution with the in-process company cache."""
+
+import uuid
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.sql.dml import Insert
+
+from app.models import Company
+from app.processing import entity_extractor
+from app.processing.entity_extractor import ResolvedCompany, clear_company_cache, resolve_companies
+from tests.conftest import StandInSession
+
+
+@pytest.fixture(autouse=True)
+def fresh_cache():
+    clear_company_cache()
+    yield
+    clear_company_cache()
+
+
+class CompaniesSession(StandInSession):
+    """A companies table keyed by normalized name; ``rival`` rows appear mid-insert."""
+
+    def __init__(self, existing=(), rival=()):
+        super().__init__()
+        self.companies = {c.normalized_name: c for c in existing}
+        self.rival = {c.normalized_name: c for c in rival}
+
+    def names(self, position):
+        return self.statements[position][0].compile().params["names"]
+
+    def respond(self, statement, params):
+        if isinstance(statement, Insert):
+            # Another worker committed these names first: ON CONFLICT DO NOTHING
+            self.companies.update(self.rival)
+            created = []
+            for row in statement._multi_values[0]:
+                values = {col.key if hasattr(col, "key") else col: v for col, v in row.items()}
+                if values["normalized_name"] in self.companies:
+                    continue
+                company = Company(**values)
+                self.companies[company.normalized_name] = company
+                created.append(company)
+            return created
+        names = set(statement.compile().params["names"])
+        return [c for c in self.companies.values() if c.normalized_name in names]
+
+
+def _company(name: str) -> Company:
+    return Company(id=uuid.uuid4(), name=name, normalized_name=entity_extractor.normalize_company_name(name))
+
+
+class TestResolveCompanies:
+    async def test_one_lookup_and_one_insert_for_a_batch(self):
+        acme = _company("Acme Inc")
+        db = CompaniesSession(existing=[acme])
+        resolved = await resolve_companies(
+            db,
+            [("Acme, Inc.", None, None), ("Globex LLC", "Springfield", "il"), ("ACME INC", None, None)],
+        )
+
+        assert resolved["acme"] == ResolvedCompany(acme.id, None)
+        assert db.companies["globex"].headquarters_state == "IL"
+        assert resolved["globex"].id == db.companies["globex"].id
+        assert len(db.statements) == 2
+        assert sorted(db.names(0)) == ["acme", "globex"]
+
+    async def test_meaningless_names_are_skipped(self):
+        db = CompaniesSession()
+        assert await resolve_companies(db, [("Unknown", None, None), (None, None, None)]) == {}
+        assert db.statements == []
+
+    async def test_cached_names_skip_the_database(self):
+        acme = _company("Acme")
+        acme.employee_count = 1200
+        db = CompaniesSession(existing=[acme])
+        await resolve_companies(db, [("Acme", None, None)])
+
+        db.statements.clear()
+        resolved = await resolve_companies(db, [("Acme", None, None), ("Globex", None, None)])
+        assert resolved["acme"] == ResolvedCompany(acme.id, 1200)
+        # Only the uncached name is looked up
+        assert db.names(0) == ["globex"]
+
+        db.statements.clear()
+        await resolve_companies(db, [("Acme", None, None), ("Globex", None, None)])
+        assert db.statements == []
+
+    async def test_concurrent_insert_is_read_back_not_an_error(self):
+        rival = _company("Initech")
+        db = CompaniesSession(rival=[rival])
+        resolved = await resolve_companies(db, [("Initech", None, None)])
+
+        assert resolved["initech"].id == rival.id
+        # lookup, insert (conflict), read back by name
+        assert len(db.statements) == 3
+
+    async def test_insert_compiles_to_on_conflict_returning(self):
+        db = CompaniesSession()
+        await resolve_companies(db, [("Acme", None, None), ("Globex", None, None)])
+
+        insert = db.statements[1][0]
+        assert isinstance(insert, Insert)
+        sql = str(insert.compile(dialect=postgresql.dialect()))
+        assert sql.endswith(
+            "ON CONFLICT (normalized_name) DO NOTHING "
+            "RETURNING companies.id, companies.normalized_name, companies.employee_count"
+        )
+        assert "WHERE companies.normalized_name = ANY (%(names)s::VARCHAR[])" in str(
+            db.statements[0][0].compile(dialect=postgresql.dialect())
+        )
+
+    async def test_cache_is_bounded(self):
+        with patch.object(entity_extractor, "COMPANY_CACHE_SIZE", 2):
+            for name in ("alpha", "bravo", "charlie"):
+                entity_extractor._cache_put(name, ResolvedCompany(uuid.uuid4(), None))
+        assert entity_extractor._cache_get("alpha") is None
+        assert entity_extractor._cache_get("charlie") is not None
+
@@ -0,0 +1,150 @@
+"""Tests for background contact discovery jobs and their progress reporting."""
+
+import uuid
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from app.contacts import jobs
+from app.contacts.jobs import discovery_job_id, enqueue_discovery, get_progress, set_progress
+from tests.conftest import StandInRedis, StandInSession
+
+
+class StandInPool:
+    def __init__(self):
+        self.job_ids: set[str] = set()
+        self.enqueued: list[tuple] = []
+
+    async def enqueue_job(self, function, *args, _job_id=None, **kwargs):
+        if _job_id in self.job_ids:
+            return None
+        self.job_ids.add(_job_id)
+        self.enqueued.append((function, args, _job_id))
+        return SimpleNamespace(job_id=_job_id)
+
+
+@pytest.fixture
+def redis():
+    redis = StandInRedis()
+    with patch.object(jobs, "get_redis", return_value=redis):
+        yield redis
+
+
+@pytest.fixture
+def pool():
+    pool = StandInPool()
+    with patch.object(jobs, "get_job_pool", AsyncMock(return_value=pool)):
+        yield pool
+
+
+class TestProgress:
+    async def test_round_trip(self, redis):
+        company_id = uuid.uuid4()
+        await set_progress(company_id, "validating", found=4, validated=1)
+        progress = await get_progress(company_id)
+        assert progress["state"] == "validating"
+        assert progress["found"] == "4"
+        assert "updated_at" in progress
+
+    async def test_replace_clears_stale_fields(self, redis):
+        company_id = uuid.uuid4()
+        await set_progress(company_id, "failed", error="TimeoutError")
+        await set_progress(company_id, "queued", replace=True)
+        assert "error" not in await get_progress(company_id)
+
+    async def test_redis_errors_are_swallowed(self):
+        with patch.object(jobs, "get_redis", return_value=StandInRedis(fail=True)):
+            await set_progress(uuid.uuid4(), "scraping")
+            assert await get_progress(uuid.uuid4()) is None
+
+
+class TestEnqueue:
+    async def test_duplicate_requests_coalesce(self, redis, pool):
+        company_id = uuid.uuid4()
+        first = await enqueue_discovery(company_id)
+        second = await enqueue_discovery(company_id)
+        assert first == second == discovery_job_id(company_id)
+        assert pool.enqueued == [("discover_company_contacts", (str(company_id),), first)]
+        assert (await get_progress(company_id))["state"] == "queued"
+
+    async def test_finished_job_can_be_requeued(self, redis, pool):
+        company_id = uuid.uuid4()
+        await enqueue_discovery(company_id)
+        await set_progress(company_id, "done", found=0)
+        pool.job_ids.clear()  # keep_result=0: arq forgets finished jobs
+        await enqueue_discovery(company_id)
+        assert len(pool.enqueued) == 2
+
+    async def test_enqueue_failure_withdraws_queued_state(self, redis):
+        company_id = uuid.uuid4()
+        unreachable = AsyncMock(side_effect=OSError("connection refused"))
+        with patch.object(jobs, "get_job_pool", unreachable):
+            with pytest.raises(OSError):
+                await enqueue_discovery(company_id)
+        # The caller runs discovery inline; nothing should report it as pending
+        assert await get_progress(company_id) is None
+
+
+class TestRunDiscoveryJob:
+    async def test_commits_and_reports_each_stage(self, redis):
+        company = SimpleNamespace(id=uuid.uuid4(), name="Acme", domain="acme.test")
+        session = StandInSession(objects={company.id: company})
+        seen = []
+
+        async def pipeline(db, company, on_progress):
+            for state, counts in [("scraping", {}), ("extracting", {}), ("validating", {"found": 2, "validated": 1})]:
+                await on_progress(state, **counts)
+                seen.append((state, db.commits))
+            return ["a", "b"]
+
+        with (
+            patch.object(jobs, "async_session_factory", return_value=session),
+            patch.object(jobs, "get_or_discover_contacts", side_effect=pipeline),
+        ):
+            result = await jobs.run_discovery_job(str(company.id))
+
+        assert result == {"company_id": str(company.id), "contacts": 2}
+        assert seen == [("scraping", 1), ("extracting", 2), ("validating", 3)]
+        assert (await get_progress(company.id))["state"] == "done"
+
+    async def test_failure_is_reported(self, redis):
+        company = SimpleNamespace(id=uuid.uuid4(), name="Acme", domain="acme.test")
+        session = StandInSession(objects={company.id: company})
+        with (
+            patch.object(jobs, "async_session_factory", return_value=session),
+            patch.object(jobs, "get_or_discover_contacts", AsyncMock(side_effect=TimeoutError())),
+        ):
+            with pytest.raises(TimeoutError):
+                await jobs.run_discovery_job(str(company.id))
+        assert session.rollbacks == 1
+        progress = await get_progress(company.id)
+        assert progress["state"] == "failed"
+        assert progress["error"] == "TimeoutError"
+
+    async def test_failure_after_checkpoint_leaves_company_retryable(self, redis):
+        company = SimpleNamespace(
+            id=uuid.uuid4(), name="Acme", domain="acme.test", industry=None, contacts_found_at=None
+        )
+        session = StandInSession(objects={company.id: company})
+        committed = []
+
+        async def commit():
+            session.commits += 1
+            committed.append(company.contacts_found_at)
+
+        async def scrape_then_fail(db, company, on_progress):
+            await on_progress("scraping")
+            raise TimeoutError()
+
+        session.commit = commit
+        with (
+            patch.object(jobs, "async_session_factory", return_value=session),
+            patch("app.contacts.pipeline.find_contacts_for_company", side_effect=scrape_then_fail),
+        ):
+            with pytest.raises(TimeoutError):
+                await jobs.run_discovery_job(str(company.id))
+
+        assert committed == [None]  # The scraping checkpoint did not persist an attempt
+        assert company.contacts_found_at is None
+        assert (await get_progress(company.id))["state"] == "failed"
@@ -0,0 +1,207 @@
+"""Tests for off-peak contact prefetch under hourly budgets."""
+
+import uuid
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from app.config import settings
+from app.contacts import prefetch
+from app.contacts.prefetch import (
+    LLM_CALLS_PER_COMPANY,
+    MAX_PREFETCH_FAILURES,
+    SMTP_PROBES_PER_COMPANY,
+    HourlyBudget,
+    budget_hour,
+    rank_candidates,
+)
+from app.contacts.smtp_session import probe_meter
+from tests.conftest import StandInRedis, StandInSession
+
+NOW = datetime(2026, 3, 2, 8, tzinfo=timezone.utc)
+
+
+def _row(devices: int, days_ago: int, signal_types=("layoff",)):
+    return SimpleNamespace(
+        company_id=uuid.uuid4(),
+        composite_risk_score=50,
+        risk_trend="stable",
+        signal_count=2,
+        total_device_estimate=devices,
+        latest_signal_at=NOW - timedelta(days=days_ago),
+        avg_confidence=80,
+        avg_severity=70,
+        source_diversity=1,
+        signal_types=list(signal_types),
+        source_names=["warn_act"],
+    )
+
+
+class TestRanking:
+    def test_best_deal_first(self):
+        small, big, stale = _row(50, 2), _row(5000, 2), _row(5000, 300)
+        ranked = rank_candidates([small, stale, big], NOW)
+        assert ranked[0][0] == big.company_id
+        assert [score for _, score in ranked] == sorted((s for _, s in ranked), reverse=True)
+
+
+class TestHourlyBudget:
+    async def test_charges_current_hour(self):
+        redis = StandInRedis()
+        budget = HourlyBudget(redis, "llm", 10)
+        await budget.charge(3)
+        await budget.charge(0)
+        assert await budget.remaining() == 7
+
+    async def test_negative_charge_refunds(self):
+        redis = StandInRedis()
+        budget = HourlyBudget(redis, "smtp", 100)
+        await budget.charge(45)
+        await budget.charge(-25)
+        assert await budget.remaining() == 80
+
+
+@pytest.fixture
+def env():
+    redis = StandInRedis()
+    companies = [(uuid.uuid4(), 90 - i) for i in range(5)]
+    queued = []
+
+    async def fake_queue(company_id, **job_kwargs):
+        queued.append((company_id, job_kwargs))
+        return True
+
+    with (
+        patch.object(prefetch, "get_redis", return_value=redis),
+        patch.object(prefetch, "async_session_factory", return_value=StandInSession()),
+        patch.object(prefetch, "select_prefetch_candidates", AsyncMock(return_value=companies)),
+        patch.object(prefetch, "queue_discovery", side_effect=fake_queue),
+    ):
+        yield SimpleNamespace(redis=redis, companies=companies, queued=queued)
+
+
+def _used(redis, resource):
+    return redis.strings.get(f"prefetch:budget:{resource}:{budget_hour()}", 0)
+
+
+class TestPrefetch:
+    async def test_queues_under_discovery_job_with_budget_hour(self, env):
+        with patch.multiple(settings, contact_prefetch_llm_per_hour=100, contact_prefetch_smtp_per_hour=1000):
+            stats = await prefetch.prefetch_contacts()
+        assert stats["queued"] == 5
+        assert [c for c, _ in env.queued] == [c for c, _ in env.companies]
+        assert all(kwargs == {"budget_hour": budget_hour()} for _, kwargs in env.queued)
+        # Worst case reserved for every queued company
+        assert _used(env.redis, "llm") == 5 * LLM_CALLS_PER_COMPANY
+        assert _used(env.redis, "smtp") == 5 * SMTP_PROBES_PER_COMPANY
+
+    async def test_stops_when_smtp_budget_runs_out(self, env):
+        with patch.multiple(settings, contact_prefetch_llm_per_hour=100, contact_prefetch_smtp_per_hour=100):
+            stats = await prefetch.prefetch_contacts()
+        # 100 probes hold two 45-probe reservations
+        assert stats["queued"] == 2
+        assert stats["budget_exhausted"] is True
+
+    async def test_stops_when_llm_budget_runs_out(self, env):
+        with patch.multiple(settings, contact_prefetch_llm_per_hour=3, contact_prefetch_smtp_per_hour=1000):
+            stats = await prefetch.prefetch_contacts()
+        assert stats["queued"] == 1
+
+    async def test_already_queued_company_is_refunded(self, env):
+        busy = env.companies[0][0]
+
+        async def queue(company_id, **job_kwargs):
+            return company_id != busy
+
+        with (
+            patch.object(prefetch, "queue_discovery", side_effect=queue),
+            patch.multiple(settings, contact_prefetch_llm_per_hour=100, contact_prefetch_smtp_per_hour=1000),
+        ):
+            stats = await prefetch.prefetch_contacts()
+        assert stats["skipped"] == 1
+        assert stats["queued"] == 4
+        assert _used(env.redis, "smtp") == 4 * SMTP_PROBES_PER_COMPANY
+
+    async def test_queue_failure_refunds_and_stops(self, env):
+        with (
+            patch.object(prefetch, "queue_discovery", AsyncMock(side_effect=ConnectionError())),
+            patch.multiple(settings, contact_prefetch_llm_per_hour=100, contact_prefetch_smtp_per_hour=1000),
+        ):
+            stats = await prefetch.prefetch_contacts()
+        assert stats["queued"] == 0
+        assert _used(env.redis, "llm") == 0
+
+    async def test_skips_companies_that_keep_failing(self, env):
+        stuck = env.companies[0][0]
+        env.redis.strings[f"prefetch:failures:{stuck}"] = MAX_PREFETCH_FAILURES
+        env.redis.strings[f"prefetch:failures:{env.companies[1][0]}"] = MAX_PREFETCH_FAILURES - 1
+        with patch.multiple(settings, contact_prefetch_llm_per_hour=100, contact_prefetch_smtp_per_hour=1000):
+            stats = await prefetch.prefetch_contacts(limit=2)
+        assert stats["candidates"] == 2
+        assert [c for c, _ in env.queued] == [c for c, _ in env.companies[1:3]]
+
+    async def test_no_redis_skips(self):
+        with patch.object(prefetch, "get_redis", return_value=None):
+            assert await prefetch.prefetch_contacts() == {"skipped": "no_redis"}
+
+
+class TestPrefetchJob:
+    async def _reserve(self, redis, hour):
+        llm, smtp = prefetch._budgets(redis)
+        await llm.charge(LLM_CALLS_PER_COMPANY, hour)
+        await smtp.charge(SMTP_PROBES_PER_COMPANY, hour)
+
+    async def test_settles_reservation_to_actual_usage(self):
+        redis = StandInRedis()
+        hour = budget_hour()
+        await self._reserve(redis, hour)
+
+        async def fake_job(company_id, on_progress=None):
+            await on_progress("extracting")
+            probe_meter.get().rcpts += 20
+            return {"company_id": company_id, "contacts": 3}
+
+        with (
+            patch.object(prefetch, "get_redis", return_value=redis),
+            patch.object(prefetch, "run_discovery_job", side_effect=fake_job),
+        ):
+            result = await prefetch.run_prefetch_job("abc", hour)
+        assert result["contacts"] == 3
+        assert _used(redis, "llm") == 1
+        assert _used(redis, "smtp") == 20
+
+    async def test_failed_job_still_charges_what_it_used(self):
+        redis = StandInRedis()
+        hour = budget_hour(NOW)
+        await self._reserve(redis, hour)
+
+        async def failing_job(company_id, on_progress=None):
+            await on_progress("extracting")
+            raise TimeoutError()
+
+        with (
+            patch.object(prefetch, "get_redis", return_value=redis),
+            patch.object(prefetch, "run_discovery_job", side_effect=failing_job),
+            pytest.raises(TimeoutError),
+        ):
+            await prefetch.run_prefetch_job("abc", hour)
+        # Settled against the hour it was reserved in, not the current one
+        assert redis.strings[f"prefetch:budget:llm:{hour}"] == 1
+        assert redis.strings[f"prefetch:budget:smtp:{hour}"] == 0
+        assert redis.strings["prefetch:failures:abc"] == 1
+
+    async def test_success_clears_failure_count(self):
+        redis = StandInRedis()
+        redis.strings["prefetch:failures:abc"] = 1
+
+        async def fake_job(company_id, on_progress=None):
+            return {"company_id": company_id, "contacts": 0}
+
+        with (
+            patch.object(prefetch, "get_redis", return_value=redis),
+            patch.object(prefetch, "run_discovery_job", side_effect=fake_job),
+        ):
+            await prefetch.run_prefetch_job("abc", budget_hour())
+        assert "prefetch:failures:abc" not in redis.strings
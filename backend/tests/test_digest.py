@@ -0,0 +1,92 @@
+"""Tests for digest signature grouping, candidate queries and rendering."""
+
+import uuid
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+from sqlalchemy.dialects import postgresql
+
+from app.email.digest import (
+    alert_signature,
+    group_by_signature,
+    render_digest,
+    signature_query,
+)
+
+TENANT_A, TENANT_B = uuid.uuid4(), uuid.uuid4()
+
+
+def _alert(**kw):
+    defaults = dict(
+        id=uuid.uuid4(),
+        tenant_id=TENANT_A,
+        user_id=uuid.uuid4(),
+        signal_types=[],
+        states=[],
+        company_ids=[],
+        min_confidence_score=50,
+        min_severity_score=0,
+        watchlist_only=False,
+    )
+    defaults.update(kw)
+    return SimpleNamespace(**defaults)
+
+
+def _sql(query) -> str:
+    return str(query.compile(dialect=postgresql.dialect()))
+
+
+class TestSignatures:
+    def test_identical_filters_share_a_group(self):
+        a = _alert(signal_types=["layoff", "plant_closing"], states=["CA"])
+        b = _alert(signal_types=["plant_closing", "layoff"], states=["CA"], tenant_id=TENANT_B)
+        c = _alert(signal_types=["layoff"])
+        groups = group_by_signature([a, b, c])
+        assert len(groups) == 2
+        assert groups[alert_signature(a)] == [a, b]
+
+    def test_watchlist_alerts_grouped_per_tenant(self):
+        a = _alert(watchlist_only=True, tenant_id=TENANT_A)
+        b = _alert(watchlist_only=True, tenant_id=TENANT_B)
+        c = _alert(watchlist_only=True, tenant_id=TENANT_A)
+        groups = group_by_signature([a, b, c])
+        assert len(groups) == 2
+        assert groups[alert_signature(a)] == [a, c]
+
+    def test_tenant_ignored_without_watchlist(self):
+        assert alert_signature(_alert(tenant_id=TENANT_A)) == alert_signature(_alert(tenant_id=TENANT_B))
+
+
+class TestSignatureQuery:
+    cutoff = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+    def test_unfiltered_signature(self):
+        sql = _sql(signature_query(alert_signature(_alert()), self.cutoff))
+        assert "count(*) OVER ()" in sql
+        assert "signal_type IN" not in sql
+        assert "watchlists" not in sql
+        assert "LIMIT" in sql
+
+    def test_filters_pushed_into_sql(self):
+        company = uuid.uuid4()
+        signature = alert_signature(
+            _alert(signal_types=["layoff"], states=["CA"], company_ids=[company], watchlist_only=True)
+        )
+        sql = _sql(signature_query(signature, self.cutoff))
+        assert "signals.signal_type IN" in sql
+        assert "signals.location_state IS NULL" in sql
+        assert "signals.company_id IN" in sql
+        assert "FROM watchlists" in sql
+
+
+class TestRenderDigest:
+    def test_subject_uses_total_and_rows_use_names(self):
+        company = uuid.uuid4()
+        signals = [
+            SimpleNamespace(company_id=company, signal_type="layoff", severity_score=85),
+            SimpleNamespace(company_id=uuid.uuid4(), signal_type="liquidation", severity_score=30),
+        ]
+        subject, html = render_digest("weekly", signals, 37, {company: "Acme Corp"})
+        assert subject == "[DispoSight] Weekly Intelligence Digest — 37 signals"
+        assert "Acme Corp" in html and "?" in html
+        assert "#EF4444" in html and "#22C55E" in html
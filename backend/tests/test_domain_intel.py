@@ -0,0 +1,183 @@
+"""Tests for the per-domain MX / catch-all / SMTP-blocked cache."""
+
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+
+import dns.resolver
+import pytest
+
+from app.contacts import domain_intel, email_validator
+from app.contacts.domain_intel import DomainIntel
+from app.contacts.pattern_inference import PatternModel
+
+NOW = datetime(2026, 3, 1, tzinfo=timezone.utc)
+
+
+class TestFreshness:
+    def test_positive_mx_outlives_negative(self):
+        found = DomainIntel(domain="a.test", mx_hosts=["mx.a.test"], mx_valid=True, mx_checked_at=NOW - timedelta(days=3))
+        missing = DomainIntel(domain="b.test", mx_valid=False, mx_checked_at=NOW - timedelta(days=3))
+        assert found.mx_fresh(NOW)
+        assert not missing.mx_fresh(NOW)
+
+    def test_unknown_is_not_fresh(self):
+        intel = DomainIntel(domain="a.test")
+        assert not intel.mx_fresh(NOW)
+        assert not intel.catch_all_known(NOW)
+        assert not intel.blocked(NOW)
+
+    def test_catch_all_and_block_ttls(self):
+        intel = DomainIntel(
+            domain="a.test",
+            has_catch_all=False,
+            catch_all_checked_at=NOW - timedelta(days=2),
+            smtp_blocked=True,
+            smtp_checked_at=NOW - timedelta(days=2),
+        )
+        assert intel.catch_all_known(NOW)
+        assert not intel.blocked(NOW)
+        intel.smtp_checked_at = NOW - timedelta(hours=2)
+        assert intel.blocked(NOW)
+
+    async def test_blocked_probe_does_not_renew_catch_all(self):
+        intel = DomainIntel(domain="a.test", has_catch_all=True, catch_all_checked_at=NOW - timedelta(days=31))
+        with patch.object(domain_intel, "_persist", AsyncMock()):
+            await domain_intel.record_probe(None, intel, smtp_blocked=True)
+        domain_intel.clear_memory()
+        assert intel.blocked(datetime.now(timezone.utc))
+        assert intel.catch_all_checked_at == NOW - timedelta(days=31)
+        assert not intel.catch_all_known(datetime.now(timezone.utc))
+
+
+class TestMemoryTier:
+    def setup_method(self):
+        domain_intel.clear_memory()
+
+    def teardown_method(self):
+        domain_intel.clear_memory()
+
+    def test_lru_eviction(self):
+        with patch.object(domain_intel, "MEMORY_MAX_DOMAINS", 2):
+            domain_intel._memory_put(DomainIntel(domain="a.test"), NOW)
+            domain_intel._memory_put(DomainIntel(domain="b.test"), NOW)
+            domain_intel._memory_get("a.test", NOW)
+            domain_intel._memory_put(DomainIntel(domain="c.test"), NOW)
+        assert domain_intel._memory_get("b.test", NOW) is None
+        assert domain_intel._memory_get("a.test", NOW) is not None
+
+    def test_entries_expire(self):
+        domain_intel._memory_put(DomainIntel(domain="a.test"), NOW)
+        assert domain_intel._memory_get("a.test", NOW + domain_intel.MEMORY_TTL) is None
+
+    async def test_second_lookup_skips_db_and_dns(self):
+        resolve = AsyncMock(return_value=(["mx.a.test"], True))
+        load = AsyncMock(return_value=DomainIntel(domain="a.test"))
+        with (
+            patch.object(domain_intel, "resolve_mx", resolve),
+            patch.object(domain_intel, "_load", load),
+            patch.object(domain_intel, "_persist", AsyncMock()) as persist,
+        ):
+            first = await domain_intel.get_domain_intel(None, "a.test")
+            second = await domain_intel.get_domain_intel(None, "a.test")
+        assert first is second
+        assert second.mx_hosts == ["mx.a.test"]
+        assert resolve.await_count == 1
+        assert load.await_count == 1
+        assert persist.await_count == 1
+
+    async def test_transient_dns_failure_keeps_known_hosts(self):
+        stale = DomainIntel(
+            domain="a.test", mx_hosts=["mx.a.test"], mx_valid=True, mx_checked_at=NOW - timedelta(days=30)
+        )
+        with (
+            patch.object(domain_intel, "resolve_mx", AsyncMock(return_value=([], False))),
+            patch.object(domain_intel, "_load", AsyncMock(return_value=stale)),
+            patch.object(domain_intel, "_persist", AsyncMock()) as persist,
+        ):
+            intel = await domain_intel.get_domain_intel(None, "a.test")
+        assert intel.mx_hosts == ["mx.a.test"]
+        assert intel.mx_valid is True
+        persist.assert_not_awaited()
+
+    async def test_transient_dns_failure_not_persisted(self):
+        with (
+            patch.object(domain_intel, "resolve_mx", AsyncMock(return_value=([], False))),
+            patch.object(domain_intel, "_load", AsyncMock(return_value=DomainIntel(domain="a.test"))),
+            patch.object(domain_intel, "_persist", AsyncMock()) as persist,
+        ):
+            intel = await domain_intel.get_domain_intel(None, "a.test")
+        assert intel.mx_hosts == []
+        assert intel.mx_valid is None
+        persist.assert_not_awaited()
+
+
+class TestResolveMx:
+    async def test_nxdomain_is_definitive(self):
+        with patch("dns.asyncresolver.resolve", AsyncMock(side_effect=dns.resolver.NXDOMAIN)):
+            assert await domain_intel.resolve_mx("nope.test") == ([], True)
+
+    async def test_timeout_is_not_definitive(self):
+        with patch("dns.asyncresolver.resolve", AsyncMock(side_effect=dns.exception.Timeout)):
+            assert await domain_intel.resolve_mx("slow.test") == ([], False)
+
+    async def test_servfail_is_not_definitive(self):
+        with patch("dns.asyncresolver.resolve", AsyncMock(side_effect=dns.resolver.NoNameservers)):
+            assert await domain_intel.resolve_mx("broken.test") == ([], False)
+
+    async def test_sorted_by_preference(self):
+        answers = [
+            SimpleNamespace(preference=20, exchange="mx2.a.test."),
+            SimpleNamespace(preference=10, exchange="mx1.a.test."),
+        ]
+        with patch("dns.asyncresolver.resolve", AsyncMock(return_value=answers)):
+            assert await domain_intel.resolve_mx("a.test") == (["mx1.a.test", "mx2.a.test"], True)
+
+
+class TestWaterfallUsesIntel:
+    contact = SimpleNamespace(first_name="Jane", last_name="Doe")
+
+    @pytest.fixture
+    def no_smtp(self):
+        with patch.object(email_validator, "SmtpSession", side_effect=AssertionError("SMTP should be skipped")):
+            yield
+
+    async def _run(self, intel: DomainIntel):
+        with (
+            patch.object(email_validator, "get_domain_intel", AsyncMock(return_value=intel)),
+            patch.object(email_validator, "record_probe", AsyncMock()) as record,
+            patch.object(email_validator, "infer_patterns", AsyncMock(return_value=PatternModel().infer(""))),
+        ):
+            result = await email_validator.waterfall_validate(self.contact, "acme.test", None)
+        return result, record
+
+    async def test_no_mx_is_invalid(self, no_smtp):
+        (status, email, _), _ = await self._run(DomainIntel(domain="acme.test", mx_valid=False))
+        assert (status, email) == ("invalid", None)
+
+    async def test_known_catch_all_skips_smtp(self, no_smtp):
+        intel = DomainIntel(
+            domain="acme.test",
+            mx_hosts=["mx.acme.test"],
+            mx_valid=True,
+            has_catch_all=True,
+            catch_all_checked_at=datetime.now(timezone.utc),
+            pattern="flast",
+        )
+        (status, email, pattern), record = await self._run(intel)
+        assert (status, email, pattern) == ("risky", "jdoe@acme.test", "flast")
+        record.assert_not_awaited()
+
+    async def test_known_blocked_uses_pattern_fallback(self, no_smtp):
+        intel = DomainIntel(
+            domain="acme.test",
+            mx_hosts=["mx.acme.test"],
+            mx_valid=True,
+            smtp_blocked=True,
+            smtp_checked_at=datetime.now(timezone.utc),
+            pattern="first.last",
+        )
+        (status, email, pattern), _ = await self._run(intel)
+        assert email == "jane.doe@acme.test"
+        assert pattern == "first.last"
+        assert status == "unverified"
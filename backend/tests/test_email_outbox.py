@@ -0,0 +1,176 @@
+"""Tests for the email outbox send path and token-bucket throttle."""
+
+import time
+import uuid
+from datetime import timedelta
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+
+from app.config import settings
+from app.core.throttle import TokenBucket
+from app.email import outbox
+from app.email.outbox import assign_batch_keys, build_email, retry_delay, send_rows
+from app.services.resend_client import ResendError
+
+
+def _row(n: int, provider: str = "resend", attempt_count: int = 1):
+    return SimpleNamespace(
+        id=uuid.uuid4(),
+        provider=provider,
+        idempotency_key=f"alert:{n}",
+        attempt_count=attempt_count,
+        batch_key=None,
+        payload={"to": f"user{n}@example.com", "subject": f"s{n}", "html": "<p>x</p>"},
+    )
+
+
+class FakeClient:
+    def __init__(
+        self,
+        batch_error: ResendError | None = None,
+        bad_recipients: set[str] = frozenset(),
+        short_by: int = 0,
+    ):
+        self.batch_error = batch_error
+        self.short_by = short_by
+        self.bad_recipients = bad_recipients
+        self.batches: list[tuple[list[dict], str]] = []
+        self.singles: list[tuple[dict, str]] = []
+
+    async def send(self, params, idempotency_key=None):
+        self.singles.append((params, idempotency_key))
+        if params["to"] in self.bad_recipients:
+            raise ResendError("invalid recipient", status_code=422)
+        return {"id": f"msg-{len(self.singles)}"}
+
+    async def send_batch(self, emails, idempotency_key=None):
+        self.batches.append((emails, idempotency_key))
+        if self.batch_error:
+            raise self.batch_error
+        return [{"id": f"batch-{i}"} for i in range(len(emails) - self.short_by)]
+
+
+@pytest.fixture(autouse=True)
+def _fast_limiter():
+    outbox._limiters.clear()
+    with patch.multiple(settings, resend_requests_per_second=1000.0):
+        yield
+    outbox._limiters.clear()
+
+
+class TestRetryDelay:
+    def test_exponential(self):
+        assert retry_delay(1) == timedelta(seconds=30)
+        assert retry_delay(2) == timedelta(seconds=60)
+        assert retry_delay(3) == timedelta(seconds=120)
+
+    def test_capped(self):
+        assert retry_delay(20) == timedelta(hours=1)
+
+
+class TestBuildEmail:
+    def test_payload_fields(self):
+        row = build_email(kind="signal_alert", idempotency_key="alert:a:b", to="x@y.com", subject="Hi", html="<b>")
+        assert row["idempotency_key"] == "alert:a:b"
+        assert row["provider"] == "resend"
+        assert row["payload"]["from"] == settings.from_email
+        assert row["payload"]["html"] == "<b>"
+        assert "text" not in row["payload"]
+
+
+class TestSendRows:
+    async def test_batches_up_to_provider_limit(self):
+        rows = [_row(i) for i in range(150)]
+        assign_batch_keys(rows)
+        client = FakeClient()
+        results = await send_rows(rows, client=client)
+
+        assert sorted(len(emails) for emails, _ in client.batches) == [50, 100]
+        assert not client.singles
+        assert len(results) == 150 and all(r.ok for r in results)
+        assert {r.outbox_id for r in results} == {r.id for r in rows}
+
+    async def test_batch_idempotency_key_is_stable(self):
+        rows = [_row(i) for i in range(3)]
+        assign_batch_keys(rows)
+        first, second = FakeClient(), FakeClient()
+        await send_rows(rows, client=first)
+
+        # Reclaimed after a crash between send and settle, possibly alongside new rows
+        for row in rows:
+            row.attempt_count += 1
+        reclaimed = list(reversed(rows)) + [_row(9)]
+        assign_batch_keys(reclaimed)
+        await send_rows(reclaimed, client=second)
+
+        assert first.batches[0][1] == second.batches[0][1]
+        assert len(second.batches[0][0]) == 3
+        assert [key for _, key in second.singles] == ["alert:9"]
+
+    async def test_retried_rows_without_batch_stay_single(self):
+        rows = [_row(i, attempt_count=2) for i in range(3)]
+        assign_batch_keys(rows)
+        client = FakeClient()
+        await send_rows(rows, client=client)
+        assert not client.batches
+        assert sorted(key for _, key in client.singles) == ["alert:0", "alert:1", "alert:2"]
+
+    async def test_short_batch_response_is_retried_singly(self):
+        rows = [_row(i) for i in range(3)]
+        assign_batch_keys(rows)
+        client = FakeClient(short_by=1)
+        results = {r.outbox_id: r for r in await send_rows(rows, client=client)}
+
+        assert results[rows[0].id].ok and results[rows[1].id].ok
+        missing = results[rows[2].id]
+        assert not missing.ok and missing.retryable
+        assert missing.message_id is None
+        assert missing.batch_key is None
+
+    async def test_single_row_uses_row_key(self):
+        rows = [_row(7)]
+        client = FakeClient()
+        results = await send_rows(rows, client=client)
+        assert client.singles[0][1] == "alert:7"
+        assert results[0].message_id == "msg-1"
+
+    async def test_rejected_batch_falls_back_to_single_sends(self):
+        rows = [_row(i) for i in range(3)]
+        assign_batch_keys(rows)
+        client = FakeClient(
+            batch_error=ResendError("bad payload", status_code=422),
+            bad_recipients={"user1@example.com"},
+        )
+        results = {r.outbox_id: r for r in await send_rows(rows, client=client)}
+
+        assert len(client.singles) == 3
+        assert results[rows[0].id].ok and results[rows[2].id].ok
+        bad = results[rows[1].id]
+        assert not bad.ok and not bad.retryable
+
+    async def test_retryable_batch_error_marks_all_retryable(self):
+        rows = [_row(i) for i in range(3)]
+        assign_batch_keys(rows)
+        client = FakeClient(batch_error=ResendError("rate limited", status_code=429))
+        results = await send_rows(rows, client=client)
+
+        assert not client.singles
+        assert all(not r.ok and r.retryable for r in results)
+        assert {r.batch_key for r in results} == {rows[0].batch_key}
+
+
+class TestTokenBucket:
+    def test_rejects_non_positive_rate(self):
+        with pytest.raises(ValueError):
+            TokenBucket(0)
+
+    async def test_burst_then_throttle(self):
+        bucket = TokenBucket(rate=20, capacity=2)
+        start = time.monotonic()
+        for _ in range(4):
+            await bucket.acquire()
+        elapsed = time.monotonic() - start
+        # 2 tokens available immediately, the next 2 arrive at 20/s
+        assert 0.08 <= elapsed < 0.5
@@ -0,0 +1,305 @@
+"""Tests for concurrent, batched company enrichment and the shared SEC rate limit."""
+
+import asyncio
+import json
+import re
+import uuid
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+
+from app.core.throttle import SharedTokenBucket
+from app.models import Company
+from app.processing import company_enricher
+from app.processing.company_enricher import (
+    CompanyEnricher,
+    enrich_pending_companies,
+    parse_firmographic_estimates,
+)
+from tests.conftest import StandInRedis, StandInSession
+
+
+class ScriptRedis(StandInRedis):
+    """Runs the GCRA script's logic in Python against a controllable clock."""
+
+    def __init__(self, fail: bool = False):
+        super().__init__(fail)
+        self.now_us = 1_000_000_000
+
+    def register_script(self, source: str):
+        async def run(keys, args):
+            self._check()
+            increment, tolerance = int(args[0]), int(args[1])
+            tat = max(self.strings.get(keys[0], self.now_us), self.now_us)
+            self.strings[keys[0]] = tat + increment
+            return max(0, tat + increment - tolerance - self.now_us)
+        return run
+
+
+async def _sleeps(buckets: list[SharedTokenBucket], redis: ScriptRedis) -> list[float]:
+    slept: list[float] = []
+
+    async def record(seconds):
+        slept.append(round(seconds, 3))
+
+    with (
+        patch("app.core.throttle.get_redis", return_value=redis),
+        patch("app.core.throttle.asyncio.sleep", side_effect=record),
+    ):
+        for bucket in buckets:
+            await bucket.acquire()
+    return slept
+
+
+class TestSharedTokenBucket:
+    async def test_burst_then_paced_at_rate(self):
+        bucket = SharedTokenBucket("sec.gov", rate=10, capacity=2)
+        slept = await _sleeps([bucket] * 4, ScriptRedis())
+        assert slept == [0.1, 0.2]
+
+    async def test_processes_draw_on_one_bucket(self):
+        redis = ScriptRedis()
+        worker_a = SharedTokenBucket("sec.gov", rate=10, capacity=1)
+        worker_b = SharedTokenBucket("sec.gov", rate=10, capacity=1)
+        slept = await _sleeps([worker_a, worker_b, worker_a], redis)
+        assert slept == [0.1, 0.2]
+        assert list(redis.strings) == ["ratelimit:sec.gov"]
+
+    async def test_falls_back_to_local_bucket_when_redis_fails(self):
+        bucket = SharedTokenBucket("sec.gov", rate=10, capacity=2)
+        bucket._local.acquire = AsyncMock()
+        await _sleeps([bucket] * 3, ScriptRedis(fail=True))
+        assert bucket._local.acquire.await_count == 3
+
+    async def test_local_bucket_without_redis(self):
+        bucket = SharedTokenBucket("sec.gov", rate=10)
+        bucket._local.acquire = AsyncMock()
+        with patch("app.core.throttle.get_redis", return_value=None):
+            await bucket.acquire()
+        bucket._local.acquire.assert_awaited_once()
+
+
+def _session(companies: list[Company], signal_rows: list | None = None) -> StandInSession:
+    """Answers the pending-companies select, then the signal-context preload."""
+    return StandInSession(results=[companies, signal_rows or []])
+
+
+def _companies(n: int) -> list[Company]:
+    return [Company(id=uuid.uuid4(), name=f"Company {i}", enrichment_status="pending") for i in range(n)]
+
+
+class Peak:
+    def __init__(self):
+        self.active = 0
+        self.peak = 0
+
+    async def hold(self, seconds: float = 0.02):
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        await asyncio.sleep(seconds)
+        self.active -= 1
+
+
+def _sec_match(company: Company) -> None:
+    company.ticker, company.industry = "TCKR", "Manufacturing"
+
+
+def _estimates_for(prompt: str, **fields) -> list[dict]:
+    numbers = [int(n) for n in re.findall(r"^\[(\d+)\]", prompt, re.M)]
+    estimate = {"employee_count": 120, "industry": "Retail Trade", "confidence": 80, **fields}
+    return [{"id": n, **estimate} for n in numbers]
+
+
+class TestEnrichPendingCompanies:
+    async def test_sec_lookups_run_concurrently_up_to_limit(self):
+        companies = _companies(8)
+        peak = Peak()
+
+        async def from_sec(self, company):
+            await peak.hold()
+            _sec_match(company)
+            return True
+
+        db = _session(companies)
+        with patch.object(CompanyEnricher, "_enrich_from_sec", from_sec):
+            stats = await enrich_pending_companies(db, batch_size=8, concurrency=3)
+
+        assert stats == {"enriched": 8, "partial": 0, "not_found": 0, "errors": 0, "total": 8}
+        assert peak.peak == 3
+        # Fully SEC-enriched: no signal context needed
+        assert len(db.statements) == 1 and db.flushed
+
+    async def test_one_failure_does_not_stop_the_batch(self):
+        companies = _companies(3)
+
+        async def from_sec(self, company):
+            if company is companies[1]:
+                raise RuntimeError("boom")
+            _sec_match(company)
+            return True
+
+        with patch.object(CompanyEnricher, "_enrich_from_sec", from_sec):
+            stats = await enrich_pending_companies(_session(companies), concurrency=3)
+
+        assert stats["enriched"] == 2 and stats["errors"] == 1
+        assert companies[1].enrichment_status == "pending"
+
+    async def test_llm_fallback_batches_companies_per_prompt(self):
+        companies = _companies(45)
+        prompts: list[str] = []
+
+        async def complete_json(prompt, **kwargs):
+            prompts.append(prompt)
+            return _estimates_for(prompt)
+
+        db = _session(companies)
+        with (
+            patch.object(CompanyEnricher, "_enrich_from_sec", AsyncMock(return_value=False)),
+            patch.object(company_enricher.llm_client, "complete_json", complete_json),
+        ):
+            stats = await enrich_pending_companies(db, batch_size=45)
+
+        assert len(prompts) == 3  # 20 + 20 + 5
+        assert stats["enriched"] == 45
+        assert all(c.employee_count == 120 and c.industry == "Retail Trade" for c in companies)
+        assert len(db.statements) == 2  # pending select + one signal-context query
+
+    async def test_llm_fallback_has_its_own_smaller_pool(self):
+        companies = _companies(6)
+        peak = Peak()
+
+        async def complete_json(prompt, **kwargs):
+            await peak.hold()
+            return _estimates_for(prompt)
+
+        with (
+            patch.object(company_enricher, "LLM_BATCH_SIZE", 1),
+            patch.object(company_enricher.settings, "enrichment_llm_concurrency", 2),
+            patch.object(CompanyEnricher, "_enrich_from_sec", AsyncMock(return_value=False)),
+            patch.object(company_enricher.llm_client, "complete_json", complete_json),
+        ):
+            stats = await enrich_pending_companies(_session(companies), concurrency=6)
+
+        assert peak.peak == 2
+        assert stats["enriched"] == 6
+
+    async def test_estimates_map_back_by_number(self):
+        companies = _companies(3)
+
+        async def complete_json(prompt, **kwargs):
+            return [
+                {"id": 3, "employee_count": 900, "industry": "Healthcare", "confidence": 90},
+                {"id": 1, "employee_count": 15, "industry": "Retail Trade", "confidence": 20},
+            ]
+
+        with (
+            patch.object(CompanyEnricher, "_enrich_from_sec", AsyncMock(return_value=False)),
+            patch.object(company_enricher.llm_client, "complete_json", complete_json),
+        ):
+            stats = await enrich_pending_companies(_session(companies))
+
+        assert companies[2].employee_count == 900 and companies[2].industry == "Healthcare"
+        assert companies[0].employee_count is None  # low confidence
+        assert [c.enrichment_status for c in companies] == ["not_found", "not_found", "enriched"]
+        assert stats["not_found"] == 2
+
+    async def test_failed_request_leaves_companies_pending(self):
+        companies = _companies(2)
+        with (
+            patch.object(CompanyEnricher, "_enrich_from_sec", AsyncMock(return_value=False)),
+            patch.object(
+                company_enricher.llm_client, "complete_json", AsyncMock(side_effect=TimeoutError())
+            ),
+        ):
+            stats = await enrich_pending_companies(_session(companies))
+        assert stats["errors"] == 2 and stats["not_found"] == 0
+        assert all(c.enrichment_status == "pending" for c in companies)
+
+    async def test_truncated_reply_is_split_and_retried(self):
+        companies = _companies(4)
+        calls: list[int] = []
+
+        async def complete_json(prompt, **kwargs):
+            numbers = [int(n) for n in re.findall(r"^\[(\d+)\]", prompt, re.M)]
+            calls.append(len(numbers))
+            reply = json.dumps(_estimates_for(prompt))
+            if len(numbers) > 2:
+                reply = reply[:60]  # Cut off at max_tokens mid-array
+            return json.loads(reply)
+
+        with (
+            patch.object(CompanyEnricher, "_enrich_from_sec", AsyncMock(return_value=False)),
+            patch.object(company_enricher.llm_client, "complete_json", complete_json),
+        ):
+            stats = await enrich_pending_companies(_session(companies))
+
+        # The truncated four-company reply is retried as two halves
+        assert calls == [4, 2, 2]
+        assert stats["enriched"] == 4
+        assert all(c.employee_count == 120 for c in companies)
+
+    async def test_single_unparseable_company_stays_pending(self):
+        companies = _companies(3)
+
+        async def complete_json(prompt, **kwargs):
+            if "Company 1" in prompt:
+                raise json.JSONDecodeError("Expecting value", "[", 1)
+            return _estimates_for(prompt)
+
+        with (
+            patch.object(CompanyEnricher, "_enrich_from_sec", AsyncMock(return_value=False)),
+            patch.object(company_enricher.llm_client, "complete_json", complete_json),
+        ):
+            stats = await enrich_pending_companies(_session(companies))
+
+        assert [c.enrichment_status for c in companies] == ["enriched", "pending", "enriched"]
+        assert stats["errors"] == 1
+
+    async def test_preloaded_signals_feed_the_prompt(self):
+        company = _companies(1)[0]
+        row = SimpleNamespace(
+            company_id=company.id, signal_type="layoff", title="Plant closing", source_name="warn_act"
+        )
+        prompts: list[str] = []
+
+        async def complete_json(prompt, **kwargs):
+            prompts.append(prompt)
+            return []
+
+        with (
+            patch.object(CompanyEnricher, "_enrich_from_sec", AsyncMock(return_value=False)),
+            patch.object(company_enricher.llm_client, "complete_json", complete_json),
+        ):
+            await enrich_pending_companies(_session([company], [row]))
+
+        assert "[1] Company name: Company 0" in prompts[0]
+        assert "- layoff: Plant closing (warn_act)" in prompts[0]
+
+
+class TestParseFirmographicEstimates:
+    def test_drops_malformed_out_of_range_and_duplicate_items(self):
+        result = [
+            {"id": 1, "employee_count": 50, "industry": " Retail Trade ", "confidence": 70},
+            {"id": 1, "employee_count": 99, "industry": "Other", "confidence": 99},
+            {"id": 4, "employee_count": 10, "industry": "X", "confidence": 80},
+            {"id": "2", "employee_count": "1200", "industry": "Healthcare", "confidence": 75.0},
+            {"id": 3, "industry": "Technology", "confidence": "high"},
+            "not an object",
+            {"id": True, "confidence": 90},
+        ]
+        assert parse_firmographic_estimates(result, 3) == {
+            1: {"employee_count": 50, "industry": "Retail Trade", "confidence": 70},
+            2: {"employee_count": 1200, "industry": "Healthcare", "confidence": 75},
+        }
+
+    def test_implausible_fields_are_cleared(self):
+        result = [{"id": 1, "employee_count": -5, "industry": "", "confidence": 60}]
+        assert parse_firmographic_estimates(result, 1) == {
+            1: {"employee_count": None, "industry": None, "confidence": 60}
+        }
+
+    def test_accepts_wrapped_array_and_bare_single_object(self):
+        wrapped = {"companies": [{"id": 2, "employee_count": 10, "industry": "Mining", "confidence": 50}]}
+        assert list(parse_firmographic_estimates(wrapped, 2)) == [2]
+        single = {"employee_count": 10, "industry": "Mining", "confidence": 50}
+        assert list(parse_firmographic_estimates(single, 1)) == [1]
+        assert parse_firmographic_estimates("nope", 3) == {}
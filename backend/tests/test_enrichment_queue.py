@@ -0,0 +1,90 @@
+"""Tests for the value-prioritized enrichment queue."""
+
+import uuid
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql
+
+from app.models import Company
+from app.processing.enrichment_queue import (
+    AGING_POINTS_PER_HOUR,
+    MAX_PRIORITY,
+    MAX_STARVATION_HOURS,
+    claim_order,
+    enrichment_priority,
+    refresh_enrichment_priorities,
+)
+from tests.conftest import StandInSession
+
+
+def _row(company_id, devices: int, signal_types: list[str], source: str):
+    return SimpleNamespace(
+        company_id=company_id,
+        composite_risk_score=60,
+        risk_trend="rising",
+        signal_count=2,
+        total_device_estimate=devices,
+        latest_signal_at=datetime.now(timezone.utc) - timedelta(hours=2),
+        avg_confidence=85,
+        avg_severity=80,
+        source_diversity=1,
+        signal_types=signal_types,
+        source_names=[source],
+    )
+
+
+class TestPriority:
+    def test_chapter_7_with_devices_outranks_news_mention(self):
+        filer = enrichment_priority(80, 4000, ["bankruptcy_ch7"])
+        mention = enrichment_priority(30, 20, ["merger"])
+        assert filer > mention + 50
+
+    def test_devices_and_urgency_each_raise_priority(self):
+        assert enrichment_priority(50, 5000, ["layoff"]) > enrichment_priority(50, 50, ["layoff"])
+        assert enrichment_priority(50, 500, ["liquidation"]) > enrichment_priority(50, 500, ["merger"])
+
+    def test_bounded_so_aging_prevents_starvation(self):
+        assert enrichment_priority(100, 10**9, ["bankruptcy_ch7"]) == MAX_PRIORITY
+        assert enrichment_priority(0, 0, []) == 0
+        # A zero-priority company overtakes the maximum after MAX_STARVATION_HOURS
+        assert AGING_POINTS_PER_HOUR * MAX_STARVATION_HOURS >= MAX_PRIORITY
+
+
+class TestRefresh:
+    async def test_sets_priority_on_pending_companies(self):
+        filer, mention = uuid.uuid4(), uuid.uuid4()
+        rows = [
+            _row(filer, 3000, ["bankruptcy_ch7"], "courtlistener"),
+            _row(mention, 10, ["merger"], "gdelt"),
+        ]
+        db = StandInSession(rows=rows)
+
+        assert await refresh_enrichment_priorities(db, {filer, mention}) == 2
+        # Aggregate query, then a single bulk UPDATE keyed by id
+        assert len(db.statements) == 2
+        statement, params = db.statements[1]
+        assert statement.is_dml and statement.table.name == "companies"
+        priorities = {p["id"]: p["enrichment_priority"] for p in params}
+        assert priorities[filer] > priorities[mention] > 0
+
+    async def test_no_pending_rows_skips_update(self):
+        db = StandInSession()
+        assert await refresh_enrichment_priorities(db, {uuid.uuid4()}) == 0
+        assert len(db.statements) == 1
+
+    async def test_no_companies_no_query(self):
+        assert await refresh_enrichment_priorities(None, set()) == 0
+
+
+class TestClaimOrder:
+    def test_orders_by_priority_plus_age(self):
+        sql = str(
+            select(Company.id)
+            .order_by(claim_order())
+            .compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True})
+        )
+        assert "companies.enrichment_priority + " in sql
+        assert "EXTRACT(epoch FROM now() - companies.created_at)" in sql
+        assert sql.rstrip().endswith("DESC")
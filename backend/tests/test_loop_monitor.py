@@ -0,0 +1,99 @@
+"""Tests for the event-loop blocking detector and thread-pool adapter."""
+
+import asyncio
+import threading
+import time
+
+from app.core.blocking import run_blocking
+from app.core.loop_monitor import BlockingStats, LoopMonitor, attribute_frame, stats
+
+
+def _block_the_loop(seconds: float):
+    time.sleep(seconds)
+
+
+async def test_watchdog_records_blocked_interval_with_call_site():
+    before = stats.blocked_count
+    monitor = LoopMonitor("watchdog", threshold_ms=50)
+    monitor.start()
+    try:
+        await asyncio.sleep(0.05)
+        _block_the_loop(0.3)
+        await asyncio.sleep(0.05)
+    finally:
+        await monitor.stop()
+
+    assert stats.blocked_count > before
+    sites = [s for s in stats.sites if "test_loop_monitor.py" in s]
+    assert any("_block_the_loop" in s for s in sites)
+
+
+async def test_watchdog_ignores_short_callbacks():
+    before = stats.blocked_count
+    monitor = LoopMonitor("watchdog", threshold_ms=200)
+    monitor.start()
+    try:
+        for _ in range(5):
+            await asyncio.sleep(0.01)
+    finally:
+        await monitor.stop()
+    assert stats.blocked_count == before
+
+
+async def test_debug_mode_records_slow_callbacks():
+    before = stats.blocked_count
+    monitor = LoopMonitor("debug", threshold_ms=50)
+    monitor.start()
+    try:
+        await asyncio.sleep(0)
+        _block_the_loop(0.1)
+        await asyncio.sleep(0)
+    finally:
+        await monitor.stop()
+    assert stats.blocked_count > before
+
+
+def test_attribute_frame_skips_library_frames():
+    import sys
+
+    site, blocking_in = attribute_frame(sys._getframe())
+    assert "test_attribute_frame_skips_library_frames" in site
+    assert site == blocking_in
+
+
+def test_attribute_frame_none():
+    assert attribute_frame(None) == ("unknown", "unknown")
+
+
+def test_stats_to_dict_ranks_sites_by_total():
+    s = BlockingStats()
+    s.record(10, "a.py:1 in f")
+    s.record(500, "b.py:2 in g")
+    s.record(20, "a.py:1 in f")
+    d = s.to_dict()
+    assert d["blocked_count"] == 3
+    assert d["max_blocked_ms"] == 500
+    assert d["sites"][0]["site"] == "b.py:2 in g"
+    assert d["sites"][1]["count"] == 2
+
+
+async def test_run_blocking_uses_worker_thread():
+    loop_thread = threading.get_ident()
+    result = await run_blocking(lambda x, y=0: (threading.get_ident(), x + y), 1, y=2)
+    assert result[0] != loop_thread
+    assert result[1] == 3
+
+
+async def test_run_blocking_keeps_loop_responsive():
+    ticks = 0
+
+    async def ticker():
+        nonlocal ticks
+        while True:
+            ticks += 1
+            await asyncio.sleep(0.01)
+
+    task = asyncio.create_task(ticker())
+    await run_blocking(time.sleep, 0.2)
+    task.cancel()
+    assert ticks >= 5
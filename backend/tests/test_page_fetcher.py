@@ -0,0 +1,114 @@
+"""Tests for the concurrent team-page fetcher."""
+
+import asyncio
+import time
+
+import httpx
+
+from app.contacts.page_fetcher import PathStats, fetch_pages, html_to_text
+
+PAGE = "<html><body><script>x()</script><p>{}</p></body></html>"
+
+
+def _client(handler) -> httpx.AsyncClient:
+    return httpx.AsyncClient(transport=httpx.MockTransport(handler), base_url="https://acme.test")
+
+
+class TestHtmlToText:
+    def test_strips_script_nav_footer(self):
+        html = "<nav>menu</nav><script>bad()</script><p>Jane Doe, CEO</p><footer>c</footer>"
+        assert html_to_text(html) == "Jane Doe, CEO"
+
+
+class TestPathStats:
+    def test_untried_paths_keep_order(self):
+        assert PathStats().rank(["/a", "/b", "/c"]) == ["/a", "/b", "/c"]
+
+    def test_productive_paths_first(self):
+        stats = PathStats()
+        for _ in range(3):
+            stats.record("/a", False)
+            stats.record("/c", True)
+        assert stats.rank(["/a", "/b", "/c"]) == ["/c", "/b", "/a"]
+
+
+class TestFetchPages:
+    async def test_collects_pages_and_records_stats(self):
+        async def handler(request):
+            if request.url.path == "/team":
+                return httpx.Response(200, text=PAGE.format("Jane Doe CEO " * 20))
+            return httpx.Response(404)
+
+        stats = PathStats()
+        async with _client(handler) as client:
+            text = await fetch_pages("https://acme.test", ["/about", "/team"], client=client, stats=stats)
+
+        assert "--- /team ---" in text and "Jane Doe CEO" in text
+        assert "x()" not in text
+        assert stats.hits == {"/team": 1}
+        assert stats.attempts == {"/about": 1, "/team": 1}
+
+    async def test_stops_once_enough_text_and_cancels_rest(self):
+        cancelled = 0
+
+        async def handler(request):
+            nonlocal cancelled
+            if request.url.path == "/fast":
+                return httpx.Response(200, text=PAGE.format("a" * 6000))
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled += 1
+                raise
+            return httpx.Response(404)
+
+        paths = ["/fast"] + [f"/slow{i}" for i in range(5)]
+        start = time.monotonic()
+        async with _client(handler) as client:
+            text = await fetch_pages("https://acme.test", paths, client=client, stats=PathStats())
+
+        assert time.monotonic() - start < 2
+        assert len(text) == 5000
+        assert cancelled == 5
+
+    async def test_concurrency_limit(self):
+        in_flight = peak = 0
+
+        async def handler(request):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return httpx.Response(404)
+
+        paths = [f"/p{i}" for i in range(12)]
+        async with _client(handler) as client:
+            await fetch_pages("https://acme.test", paths, client=client, stats=PathStats(), concurrency=3)
+        assert peak == 3
+
+    async def test_unreachable_domain_short_circuits(self):
+        calls = 0
+
+        async def handler(request):
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            raise httpx.ConnectError("name resolution failed", request=request)
+
+        paths = [f"/p{i}" for i in range(20)]
+        async with _client(handler) as client:
+            text = await fetch_pages("https://acme.test", paths, client=client, stats=PathStats(), concurrency=2)
+        assert text == ""
+        assert calls <= 4
+
+    async def test_deadline(self):
+        async def handler(request):
+            await asyncio.sleep(5)
+            return httpx.Response(404)
+
+        start = time.monotonic()
+        async with _client(handler) as client:
+            text = await fetch_pages("https://acme.test", ["/a", "/b"], client=client, stats=PathStats(), deadline=0.2)
+        assert text == ""
+        assert time.monotonic() - start < 1
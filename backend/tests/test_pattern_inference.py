@@ -0,0 +1,96 @@
+"""Tests for statistical email-pattern inference."""
+
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from app.config import settings
+from app.contacts import email_validator
+from app.contacts.domain_intel import DomainIntel
+from app.contacts.email_builder import generate_email_permutations
+from app.contacts.pattern_inference import BASE_PRIOR, PatternModel
+
+
+class TestPatternModel:
+    def test_no_evidence_uses_base_prior(self):
+        inference = PatternModel().infer("acme.com")
+        assert inference.best[0] == "first.last"
+        assert inference.domain_evidence == 0
+        assert sum(inference.probabilities.values()) == pytest.approx(1.0)
+        assert not inference.confident
+
+    def test_domain_evidence_dominates(self):
+        model = PatternModel()
+        model.observe("acme.com", None, "flast", count=5)
+        inference = model.infer("acme.com")
+        pattern, probability = inference.best
+        assert pattern == "flast"
+        assert probability > 0.9
+        assert inference.confident
+
+    def test_industry_prior(self):
+        model = PatternModel()
+        for i in range(30):
+            model.observe(f"bank{i}.com", "Banking", "f.last")
+            model.observe(f"shop{i}.com", "Retail", "first.last")
+        assert model.infer("newbank.com", "banking ").best[0] == "f.last"
+        assert model.infer("newshop.com", "Retail").best[0] == "first.last"
+
+    def test_tld_prior(self):
+        model = PatternModel()
+        for i in range(30):
+            model.observe(f"firma{i}.de", None, "last")
+            model.observe(f"co{i}.com", None, "first.last")
+        assert model.infer("neu.de").best[0] == "last"
+        assert model.infer("new.com").best[0] == "first.last"
+
+    def test_priors_alone_never_confident(self):
+        model = PatternModel()
+        for i in range(500):
+            model.observe(f"co{i}.com", "Software", "first")
+        inference = model.infer("brandnew.com", "Software")
+        assert inference.best[1] > settings.pattern_skip_smtp_confidence
+        assert not inference.confident
+
+    def test_threshold_is_configurable(self):
+        model = PatternModel()
+        model.observe("acme.com", None, "first.last", count=2)
+        inference = model.infer("acme.com")
+        with patch.object(settings, "pattern_skip_smtp_confidence", 0.99):
+            assert not inference.confident
+        with patch.object(settings, "pattern_skip_smtp_confidence", 0.5):
+            assert inference.confident
+
+    def test_known_pattern_counts_without_contacts(self):
+        inference = PatternModel().infer("acme.com", known_pattern="flast")
+        assert inference.domain_evidence == 1
+        assert inference.best[0] == "flast"
+
+    def test_unknown_patterns_ignored(self):
+        model = PatternModel()
+        model.observe("acme.com", None, "custom")
+        assert model.infer("acme.com").domain_evidence == 0
+
+    def test_rank_orders_permutations(self):
+        model = PatternModel()
+        model.observe("acme.com", None, "last.first", count=3)
+        ranked = model.infer("acme.com").rank(generate_email_permutations("Jane", "Doe", "acme.com"))
+        assert ranked[0] == ("doe.jane@acme.com", "last.first")
+        assert {p for _, p in ranked} == set(BASE_PRIOR)
+
+
+class TestWaterfallInference:
+    contact = SimpleNamespace(first_name="Jane", last_name="Doe")
+
+    async def test_confident_pattern_skips_smtp(self):
+        model = PatternModel()
+        model.observe("acme.test", None, "flast", count=6)
+        intel = DomainIntel(domain="acme.test", mx_hosts=["mx.acme.test"], mx_valid=True)
+        with (
+            patch.object(email_validator, "get_domain_intel", AsyncMock(return_value=intel)),
+            patch.object(email_validator, "infer_patterns", AsyncMock(return_value=model.infer("acme.test"))),
+            patch.object(email_validator, "SmtpSession", side_effect=AssertionError("SMTP should be skipped")),
+        ):
+            result = await email_validator.waterfall_validate(self.contact, "acme.test", None)
+        assert result == ("unverified", "jdoe@acme.test", "flast")
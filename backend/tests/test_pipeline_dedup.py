@@ -1,8 +1,9 @@
 """Tests for pipeline deduplication logic.
 
-Uses an in-memory SQLite database with minimal table definitions to verify
-that the dedup query correctly identifies duplicate signals (same company +
-type within a 2-day window).
+Uses an in-memory SQLite database holding the ``signals`` table built from
+the model to verify that the batch dedup query correctly identifies
+duplicate signals (same company + type within a 2-day window), both against
+stored signals and within the batch itself.
 """
 
 import uuid
@@ -10,38 +11,20 @@ from datetime import datetime, timedelta, timezone
 
 import pytest
 import pytest_asyncio
-from sqlalchemy import Column, DateTime, Integer, String, Table, MetaData, select, and_
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from sqlalchemy.orm import sessionmaker
 
-# Minimal table definitions that work with SQLite (no JSONB/UUID columns)
-metadata = MetaData()
-
-companies_table = Table(
-    "companies", metadata,
-    Column("id", String(36), primary_key=True),
-    Column("name", String(500), nullable=False),
-    Column("normalized_name", String(500), nullable=False),
-)
-
-signals_table = Table(
-    "signals", metadata,
-    Column("id", String(36), primary_key=True),
-    Column("company_id", String(36), nullable=False),
-    Column("signal_type", String(50), nullable=False),
-    Column("signal_category", String(50), nullable=False),
-    Column("title", String(500), nullable=False),
-    Column("source_name", String(255), nullable=False),
-    Column("source_published_at", DateTime(timezone=True)),
-    Column("severity_score", Integer, default=0),
-)
+from app.models import Signal
+from app.processing.signal_dedup import DedupCandidate, find_duplicate_signals
+
+signals_table = Signal.__table__
 
 
 @pytest_asyncio.fixture
 async def db():
     engine = create_async_engine("sqlite+aiosqlite:///:memory:")
     async with engine.begin() as conn:
-        await conn.run_sync(metadata.create_all)
+        await conn.run_sync(signals_table.create)
 
     async_session = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
     async with async_session() as session:
@@ -50,34 +33,20 @@ async def db():
     await engine.dispose()
 
 
-@pytest_asyncio.fixture
-async def company_id(db: AsyncSession):
-    cid = str(uuid.uuid4())
-    await db.execute(companies_table.insert().values(id=cid, name="Acme Corp", normalized_name="acme"))
-    await db.flush()
-    return cid
-
-
-async def _has_duplicate(db: AsyncSession, company_id: str, signal_type: str, reference_dt: datetime) -> bool:
-    """Mirrors the dedup query from pipeline.py."""
-    window_start = reference_dt - timedelta(days=2)
-    window_end = reference_dt + timedelta(days=2)
-    result = await db.execute(
-        select(signals_table.c.id).where(
-            and_(
-                signals_table.c.company_id == company_id,
-                signals_table.c.signal_type == signal_type,
-                signals_table.c.source_published_at >= window_start,
-                signals_table.c.source_published_at <= window_end,
-            )
-        ).limit(1)
-    )
-    return result.scalar_one_or_none() is not None
-
-
-async def _insert_signal(db, company_id: str, signal_type: str, published_at: datetime):
+@pytest.fixture
+def company_id():
+    return uuid.uuid4()
+
+
+async def _has_duplicate(db: AsyncSession, company_id: uuid.UUID, signal_type: str, reference_dt: datetime) -> bool:
+    """Runs the pipeline's batch dedup check for a single candidate."""
+    candidates = [DedupCandidate(company_id, signal_type, reference_dt)]
+    return await find_duplicate_signals(db, candidates) == {0}
+
+
+async def _insert_signal(db, company_id: uuid.UUID, signal_type: str, published_at: datetime):
     await db.execute(signals_table.insert().values(
-        id=str(uuid.uuid4()),
+        id=uuid.uuid4(),
         company_id=company_id,
         signal_type=signal_type,
         signal_category="news",
@@ -123,3 +92,53 @@ async def test_different_type_in_window_creates_signal(db, company_id):
     await _insert_signal(db, company_id, "layoff", now)
 
     assert not await _has_duplicate(db, company_id, "bankruptcy_ch7", now)
+
+
+@pytest.mark.asyncio
+async def test_batch_checks_every_candidate_in_one_query(db, company_id):
+    """Each candidate is matched against its own company, type and window."""
+    other_id = uuid.uuid4()
+    now = datetime.now(timezone.utc)
+    await _insert_signal(db, company_id, "layoff", now)
+    await _insert_signal(db, other_id, "bankruptcy_ch7", now - timedelta(days=10))
+
+    candidates = [
+        DedupCandidate(company_id, "layoff", now + timedelta(hours=12)),  # duplicate
+        DedupCandidate(company_id, "bankruptcy_ch7", now),  # different type
+        DedupCandidate(other_id, "layoff", now),  # different company
+        DedupCandidate(other_id, "bankruptcy_ch7", now - timedelta(days=9)),  # duplicate
+        DedupCandidate(other_id, "bankruptcy_ch7", now - timedelta(days=5)),  # outside window
+    ]
+    assert await find_duplicate_signals(db, candidates) == {0, 3}
+
+
+@pytest.mark.asyncio
+async def test_duplicates_within_batch_keep_first(db, company_id):
+    """Repeats of an earlier candidate in the same batch are skipped."""
+    now = datetime.now(timezone.utc)
+    candidates = [
+        DedupCandidate(company_id, "layoff", now),
+        DedupCandidate(company_id, "layoff", now + timedelta(days=1)),  # repeats 0
+        DedupCandidate(company_id, "layoff", now + timedelta(days=5)),  # new event
+        DedupCandidate(company_id, "facility_shutdown", now),
+        DedupCandidate(company_id, "layoff", now + timedelta(days=6)),  # repeats 2
+    ]
+    assert await find_duplicate_signals(db, candidates) == {1, 4}
+
+
+@pytest.mark.asyncio
+async def test_stored_duplicate_does_not_shadow_batch(db, company_id):
+    """A candidate skipped against the table is not kept, so it cannot dedupe later ones."""
+    now = datetime.now(timezone.utc)
+    await _insert_signal(db, company_id, "layoff", now - timedelta(days=3))
+
+    candidates = [
+        DedupCandidate(company_id, "layoff", now - timedelta(days=2)),  # stored duplicate
+        DedupCandidate(company_id, "layoff", now),  # 3 days from stored, 2 from skipped 0
+    ]
+    assert await find_duplicate_signals(db, candidates) == {0}
+
+
+@pytest.mark.asyncio
+async def test_empty_batch(db):
+    assert await find_duplicate_signals(db, []) == set()
@@ -0,0 +1,70 @@
+"""Tests for raw-signal retry backoff and dead-lettering in the pipeline."""
+
+import uuid
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from app.config import settings
+from app.processing.pipeline import (
+    MAX_RETRY_DELAY,
+    RETRY_BASE_DELAY,
+    record_failure,
+    retry_delay,
+)
+
+NOW = datetime(2026, 10, 19, 12, 0, tzinfo=timezone.utc)
+
+
+def _raw(attempt_count=0):
+    return SimpleNamespace(
+        id=uuid.uuid4(),
+        processing_status="raw",
+        attempt_count=attempt_count,
+        next_attempt_at=None,
+        last_error=None,
+    )
+
+
+def test_retry_delay_doubles_and_caps():
+    assert retry_delay(1) == RETRY_BASE_DELAY
+    assert retry_delay(2) == RETRY_BASE_DELAY * 2
+    assert retry_delay(3) == RETRY_BASE_DELAY * 4
+    assert retry_delay(30) == MAX_RETRY_DELAY
+
+
+def test_failure_schedules_retry_with_backoff():
+    raw = _raw()
+    with patch.object(settings, "pipeline_max_attempts", 5):
+        record_failure(raw, ValueError("bad json"), NOW)
+        assert raw.processing_status == "raw"
+        assert raw.attempt_count == 1
+        assert raw.next_attempt_at == NOW + RETRY_BASE_DELAY
+        assert raw.last_error == "ValueError: bad json"
+
+        record_failure(raw, ValueError("bad json"), NOW)
+        assert raw.attempt_count == 2
+        assert raw.next_attempt_at == NOW + RETRY_BASE_DELAY * 2
+
+
+def test_failure_dead_letters_after_max_attempts():
+    raw = _raw(attempt_count=2)
+    with patch.object(settings, "pipeline_max_attempts", 3):
+        record_failure(raw, RuntimeError("company insert failed"), NOW)
+    assert raw.processing_status == "dead_letter"
+    assert raw.attempt_count == 3
+    assert raw.next_attempt_at is None
+    assert "company insert failed" in raw.last_error
+
+
+def test_last_error_is_truncated():
+    raw = _raw()
+    record_failure(raw, ValueError("x" * 10_000), NOW)
+    assert len(raw.last_error) <= 2000
+
+
+def test_missing_attempt_count_treated_as_zero():
+    raw = _raw(attempt_count=None)
+    record_failure(raw, ValueError("boom"), NOW)
+    assert raw.attempt_count == 1
+    assert raw.next_attempt_at - NOW == timedelta(minutes=30)
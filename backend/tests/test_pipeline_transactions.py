@@ -0,0 +1,159 @@
+"""Tests for the pipeline's transaction boundaries: claims, LLM calls and per-signal savepoints."""
+
+import uuid
+from datetime import datetime, timezone
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from app.processing import pipeline
+from app.processing.entity_extractor import normalize_company_name
+from tests.conftest import StandInSession
+
+
+class PipelineSession(StandInSession):
+    """Answers every claim with ``raws``; flushing a signal for ``fail_flush_for`` raises."""
+
+    def __init__(self, raws, fail_flush_for=()):
+        super().__init__(rows=raws)
+        self.fail_flush_for = set(fail_flush_for)
+
+    async def flush(self):
+        await super().flush()
+        if self.added and self.added[-1].raw_signal_id in self.fail_flush_for:
+            raise RuntimeError("flush failed")
+
+
+def _raw(name):
+    return SimpleNamespace(
+        id=uuid.uuid4(),
+        raw_text=f"{name} announces layoffs",
+        company_name=name,
+        source_type="gdelt",
+        event_type="layoff",
+        employees_affected=200,
+        source_url=None,
+        created_at=datetime(2026, 10, 1, tzinfo=timezone.utc),
+        processing_status="raw",
+        discard_reason=None,
+        attempt_count=0,
+        next_attempt_at=None,
+        last_error=None,
+    )
+
+
+async def _run(db, failing_step=None):
+    llm_calls = []
+
+    async def extract(text, source_type):
+        assert not db.in_transaction, "entity extraction ran inside a transaction"
+        llm_calls.append("extract")
+        return {}
+
+    async def classify(text, company_name, source_type):
+        assert not db.in_transaction, "classification ran inside a transaction"
+        llm_calls.append("classify")
+        return {"signal_type": "layoff", "signal_category": "news"}
+
+    async def resolve(session, keys):
+        return {
+            normalize_company_name(name): SimpleNamespace(id=uuid.uuid4(), employee_count=None)
+            for name, _, _ in keys
+        }
+
+    async def no_duplicates(session, candidates):
+        return set()
+
+    async def noop(*args, **kwargs):
+        return {}
+
+    async def fail(*args, **kwargs):
+        raise RuntimeError("step failed")
+
+    def step(name):
+        return fail if name == failing_step else noop
+
+    with (
+        patch.object(pipeline, "extract_entities", extract),
+        patch.object(pipeline, "classify_signal", classify),
+        patch.object(pipeline, "resolve_companies", resolve),
+        patch.object(pipeline, "find_duplicate_signals", no_duplicates),
+        patch.object(pipeline, "correlate_signals", noop),
+        patch.object(pipeline, "match_realtime_alerts", noop),
+        patch.object(pipeline, "update_company_risk_scores", step("update_company_risk_scores")),
+        patch.object(pipeline, "refresh_enrichment_priorities", step("refresh_enrichment_priorities")),
+    ):
+        result = await pipeline.process_pending_signals(db)
+    return result, llm_calls
+
+
+@pytest.mark.asyncio
+async def test_llm_calls_run_outside_transactions():
+    raws = [_raw("Acme Corp"), _raw("Globex"), _raw("Initech")]
+    db = PipelineSession(raws)
+
+    result, llm_calls = await _run(db)
+
+    assert llm_calls.count("extract") == 3
+    assert llm_calls.count("classify") == 3
+    assert result["processed"] == 3
+    assert not db.in_transaction  # Final transaction committed
+    assert db.commits == 3  # Claim, companies, signals
+    assert all(r.processing_status == "processed" and r.next_attempt_at is None for r in raws)
+
+
+@pytest.mark.asyncio
+async def test_failed_signal_only_loses_its_own_savepoint():
+    raws = [_raw("Acme Corp"), _raw("Globex"), _raw("Initech")]
+    db = PipelineSession(raws, fail_flush_for=[raws[1].id])
+
+    result, _ = await _run(db)
+
+    assert result["processed"] == 2
+    assert result["errors"] == 1
+    assert [s.raw_signal_id for s in db.added] == [raws[0].id, raws[2].id]
+    assert raws[0].processing_status == "processed"
+    assert raws[2].processing_status == "processed"
+    failed = raws[1]
+    assert failed.processing_status == "raw"
+    assert failed.attempt_count == 1
+    assert "flush failed" in failed.last_error
+
+
+@pytest.mark.asyncio
+async def test_claim_skips_locked_rows_and_leases_batch():
+    raws = [_raw("Acme Corp"), _raw("Globex")]
+    db = PipelineSession(raws)
+    now = datetime(2026, 10, 19, 12, 0, tzinfo=timezone.utc)
+
+    claimed = await pipeline.claim_raw_signals(db, now)
+
+    assert claimed == raws
+    assert all(r.next_attempt_at == now + pipeline.CLAIM_LEASE for r in raws)
+    assert db.commits == 1 and not db.in_transaction
+    sql = str(db.statements[0][0].compile(dialect=postgresql.dialect()))
+    assert "FOR UPDATE SKIP LOCKED" in sql
+
+
+@pytest.mark.asyncio
+async def test_empty_queue_does_nothing():
+    db = PipelineSession([])
+    result, llm_calls = await _run(db)
+    assert result == {"processed": 0}
+    assert llm_calls == []
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("failing_step", ["update_company_risk_scores", "refresh_enrichment_priorities"])
+async def test_batch_step_failure_keeps_signals(failing_step):
+    raws = [_raw("Acme Corp"), _raw("Globex")]
+    db = PipelineSession(raws)
+
+    result, _ = await _run(db, failing_step=failing_step)
+
+    assert result["processed"] == 2
+    assert [s.raw_signal_id for s in db.added] == [r.id for r in raws]
+    assert all(r.processing_status == "processed" for r in raws)
+    assert db.commits == 3 and not db.in_transaction
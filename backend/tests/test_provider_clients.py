@@ -0,0 +1,177 @@
+"""Tests for the async Resend and Stripe adapters against local stand-in servers."""
+
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs
+
+import pytest
+
+from app.services import stripe_client
+from app.services.resend_client import ResendClient, ResendError
+
+
+class StandInServer:
+    """Local HTTP server that records requests and replays scripted responses."""
+
+    def __init__(self):
+        self.requests: list[dict] = []
+        self.responses: list[tuple[int, dict | list]] = []
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def _handle(self):
+                length = int(self.headers.get("content-length") or 0)
+                body = self.rfile.read(length).decode() if length else ""
+                server.requests.append({
+                    "method": self.command,
+                    "path": self.path,
+                    "headers": dict(self.headers),
+                    "body": body,
+                })
+                status, payload = server.responses.pop(0) if server.responses else (200, {})
+                data = json.dumps(payload).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            do_GET = do_POST = _handle
+
+            def log_message(self, *args):
+                pass
+
+        self._httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self._httpd.server_address[1]}"
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+
+@pytest.fixture
+def server():
+    with StandInServer() as s:
+        yield s
+
+
+# ---------------------------------------------------------------------------
+# Resend
+# ---------------------------------------------------------------------------
+
+async def test_resend_send_posts_json_with_auth(server):
+    server.responses.append((200, {"id": "email_1"}))
+    client = ResendClient(api_key="re_test", base_url=server.url)
+    try:
+        result = await client.send(
+            {"from": "a@x.com", "to": "b@x.com", "subject": "Hi", "html": "<p>hi</p>"},
+            idempotency_key="alert-1",
+        )
+    finally:
+        await client.aclose()
+
+    assert result == {"id": "email_1"}
+    req = server.requests[0]
+    assert req["path"] == "/emails"
+    assert req["headers"]["Authorization"] == "Bearer re_test"
+    assert req["headers"]["Idempotency-Key"] == "alert-1"
+    assert json.loads(req["body"])["subject"] == "Hi"
+
+
+async def test_resend_retries_server_errors(server):
+    server.responses.extend([(503, {"message": "busy"}), (200, {"id": "email_2"})])
+    client = ResendClient(api_key="re_test", base_url=server.url)
+    try:
+        result = await client.send({"from": "a@x.com", "to": "b@x.com", "subject": "s", "html": "h"})
+    finally:
+        await client.aclose()
+    assert result["id"] == "email_2"
+    assert len(server.requests) == 2
+
+
+async def test_resend_does_not_retry_client_errors(server):
+    server.responses.append((422, {"message": "invalid to"}))
+    client = ResendClient(api_key="re_test", base_url=server.url)
+    try:
+        with pytest.raises(ResendError) as exc_info:
+            await client.send({"from": "a@x.com", "to": "bad", "subject": "s", "html": "h"})
+    finally:
+        await client.aclose()
+    assert exc_info.value.status_code == 422
+    assert not exc_info.value.retryable
+    assert len(server.requests) == 1
+
+
+async def test_resend_batch(server):
+    server.responses.append((200, {"data": [{"id": "e1"}, {"id": "e2"}]}))
+    client = ResendClient(api_key="re_test", base_url=server.url)
+    emails = [{"from": "a@x.com", "to": f"u{i}@x.com", "subject": "s", "html": "h"} for i in range(2)]
+    try:
+        result = await client.send_batch(emails)
+    finally:
+        await client.aclose()
+    assert [r["id"] for r in result] == ["e1", "e2"]
+    assert server.requests[0]["path"] == "/emails/batch"
+    assert len(json.loads(server.requests[0]["body"])) == 2
+
+
+async def test_resend_batch_limit():
+    client = ResendClient(api_key="re_test", base_url="http://127.0.0.1:9")
+    with pytest.raises(ValueError):
+        await client.send_batch([{}] * 101)
+
+
+# ---------------------------------------------------------------------------
+# Stripe
+# ---------------------------------------------------------------------------
+
+@pytest.fixture
+async def stripe_stand_in(server):
+    from app.config import settings
+
+    original = (settings.stripe_secret_key, settings.stripe_api_base)
+    settings.stripe_secret_key = "sk_test_standin"
+    settings.stripe_api_base = server.url
+    await stripe_client.close_stripe_client()
+    yield server
+    await stripe_client.close_stripe_client()
+    settings.stripe_secret_key, settings.stripe_api_base = original
+
+
+async def test_stripe_create_customer(stripe_stand_in):
+    stripe_stand_in.responses.append((200, {"id": "cus_123", "object": "customer"}))
+    customer = await stripe_client.create_customer("a@x.com", None, {"tenant_id": "t1"})
+
+    assert customer.id == "cus_123"
+    req = stripe_stand_in.requests[0]
+    assert req["path"] == "/v1/customers"
+    form = parse_qs(req["body"])
+    assert form["email"] == ["a@x.com"]
+    assert form["metadata[tenant_id]"] == ["t1"]
+    assert "name" not in form
+
+
+async def test_stripe_portal_session(stripe_stand_in):
+    stripe_stand_in.responses.append(
+        (200, {"id": "bps_1", "object": "billing_portal.session", "url": "https://billing.example/x"})
+    )
+    session = await stripe_client.create_portal_session(customer="cus_123", return_url="http://localhost")
+    assert session.url == "https://billing.example/x"
+    assert stripe_stand_in.requests[0]["path"] == "/v1/billing_portal/sessions"
+
+
+async def test_stripe_retrieve_subscription(stripe_stand_in):
+    stripe_stand_in.responses.append((200, {
+        "id": "sub_1",
+        "object": "subscription",
+        "items": {"object": "list", "data": [{"id": "si_1", "object": "subscription_item", "price": {"id": "price_pro", "object": "price"}}]},
+    }))
+    sub = await stripe_client.retrieve_subscription("sub_1")
+    assert sub["items"]["data"][0]["price"]["id"] == "price_pro"
+    assert stripe_stand_in.requests[0]["method"] == "GET"
@@ -0,0 +1,74 @@
+"""Tests for the Redis sliding-window alert email rate cap."""
+
+import time
+import uuid
+from unittest.mock import patch
+
+from app.email import rate_cap
+from app.email.rate_cap import RATE_CAP_PER_DAY, WINDOW, record_alert_emails, remaining_quota
+from tests.conftest import StandInRedis
+
+
+def _patch(redis, history=None):
+    async def fake_history(db, user_ids):
+        return {uid: entries for uid, entries in (history or {}).items() if uid in user_ids}
+
+    return (
+        patch.object(rate_cap, "get_redis", return_value=redis),
+        patch.object(rate_cap, "_history_in_window", side_effect=fake_history),
+    )
+
+
+class TestRemainingQuota:
+    async def test_seeds_from_history_then_uses_redis(self):
+        user = uuid.uuid4()
+        redis = StandInRedis()
+        history = {user: [(str(uuid.uuid4()), time.time() - 60) for _ in range(5)]}
+        p_redis, p_history = _patch(redis, history)
+        with p_redis, p_history as history_mock:
+            assert await remaining_quota(None, [user]) == {user: RATE_CAP_PER_DAY - 5}
+            assert await remaining_quota(None, [user]) == {user: RATE_CAP_PER_DAY - 5}
+        assert history_mock.call_count == 1
+
+    async def test_bulk_lookup_is_one_round_trip(self):
+        users = [uuid.uuid4() for _ in range(50)]
+        redis = StandInRedis()
+        for uid in users:
+            redis.strings[rate_cap._seeded_key(uid)] = "1"
+        p_redis, p_history = _patch(redis)
+        with p_redis, p_history:
+            quota = await remaining_quota(None, users)
+        assert redis.round_trips == 1
+        assert set(quota.values()) == {RATE_CAP_PER_DAY}
+
+    async def test_recorded_emails_count_and_expire_out_of_window(self):
+        user = uuid.uuid4()
+        redis = StandInRedis()
+        redis.strings[rate_cap._seeded_key(user)] = "1"
+        redis.zsets[rate_cap._key(user)] = {"old": time.time() - WINDOW.total_seconds() - 5}
+        p_redis, p_history = _patch(redis)
+        with p_redis, p_history:
+            await record_alert_emails([(user, uuid.uuid4()), (user, uuid.uuid4())])
+            assert await remaining_quota(None, [user]) == {user: RATE_CAP_PER_DAY - 2}
+
+    async def test_never_negative(self):
+        user = uuid.uuid4()
+        redis = StandInRedis()
+        history = {user: [(str(uuid.uuid4()), time.time()) for _ in range(RATE_CAP_PER_DAY + 3)]}
+        p_redis, p_history = _patch(redis, history)
+        with p_redis, p_history:
+            assert await remaining_quota(None, [user]) == {user: 0}
+
+    async def test_falls_back_to_history_when_redis_down(self):
+        user = uuid.uuid4()
+        history = {user: [(str(uuid.uuid4()), time.time())]}
+        p_redis, p_history = _patch(StandInRedis(fail=True), history)
+        with p_redis, p_history:
+            assert await remaining_quota(None, [user]) == {user: RATE_CAP_PER_DAY - 1}
+            await record_alert_emails([(user, uuid.uuid4())])  # swallowed
+
+    async def test_no_redis_configured(self):
+        user = uuid.uuid4()
+        p_redis, p_history = _patch(None)
+        with p_redis, p_history:
+            assert await remaining_quota(None, [user, user]) == {user: RATE_CAP_PER_DAY}
@@ -0,0 +1,140 @@
+"""Tests for set-based composite risk scoring."""
+
+import math
+import random
+import uuid
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+from sqlalchemy.sql.dml import Update
+
+from app.models import Company
+from app.processing.risk_scorer import (
+    CATEGORY_WEIGHTS,
+    compute_risk_scores,
+    refresh_all_risk_scores,
+    update_company_risk_scores,
+)
+from tests.conftest import StandInSession
+
+NOW = datetime(2026, 3, 2, 12, tzinfo=timezone.utc)
+CATEGORIES = ["warn", "bankruptcy", "filing", "news", "other"]
+
+
+def legacy_score(signals) -> tuple[int, str]:
+    """The original per-row Python computation, kept as the reference."""
+    total_weight = weighted_score = 0
+    categories = set()
+    for s in signals:
+        age_days = max(1, (NOW - s.created_at).days)
+        weight = max(0.1, math.exp(-age_days / 21)) * CATEGORY_WEIGHTS.get(s.signal_category, 0.5)
+        weighted_score += (s.confidence_score + s.severity_score) / 2 * weight
+        total_weight += weight
+        categories.add(s.signal_category)
+    base = weighted_score / total_weight
+    composite = int(min(100, base * (1.0 + (len(categories) - 1) * 0.15) * min(1.5, 1.0 + len(signals) * 0.05)))
+    recent = sum(1 for s in signals if s.created_at >= NOW - timedelta(days=14))
+    older = len(signals) - recent
+    return composite, "rising" if recent > older else "declining" if recent < older else "stable"
+
+
+def aggregate_row(company_id, signals):
+    """What the aggregate query returns for one company, computed the same way."""
+    weights = [
+        max(0.1, math.exp(-max(1, math.floor((NOW - s.created_at).total_seconds() / 86400)) / 21))
+        * CATEGORY_WEIGHTS.get(s.signal_category, 0.5)
+        for s in signals
+    ]
+    scores = [(s.confidence_score + s.severity_score) / 2 for s in signals]
+    return SimpleNamespace(
+        company_id=company_id,
+        base_score=sum(w * x for w, x in zip(weights, scores)) / sum(weights),
+        categories=len({s.signal_category for s in signals}),
+        signal_count=len(signals),
+        recent_count=sum(1 for s in signals if s.created_at >= NOW - timedelta(days=14)),
+        last_signal_at=max(s.created_at for s in signals),
+    )
+
+
+def random_signals(rng: random.Random, n: int):
+    return [
+        SimpleNamespace(
+            created_at=NOW - timedelta(days=rng.uniform(0, 59.9)),
+            signal_category=rng.choice(CATEGORIES),
+            confidence_score=rng.randint(0, 100),
+            severity_score=rng.randint(0, 100),
+        )
+        for _ in range(n)
+    ]
+
+
+class ScoringSession(StandInSession):
+    """Answers the aggregate query from ``rows`` and keyset pages from ``company_ids``."""
+
+    def __init__(self, company_ids=(), rows=(), companies=None):
+        super().__init__(rows=rows, objects=companies)
+        self.company_ids = list(company_ids)
+
+    @property
+    def updates(self):
+        return [params for statement, params in self.statements if isinstance(statement, Update)]
+
+    def respond(self, statement, params):
+        if isinstance(statement, Update):
+            return []
+        if "base_score" in statement.selected_columns:
+            wanted = set(statement.compile().params.get("company_id_1") or [])
+            return [r for r in self.rows if not wanted or r.company_id in wanted]
+        # Keyset page of company ids
+        last = statement.compile().params.get("id_1")
+        return [i for i in self.company_ids if last is None or i > last][: statement._limit]
+
+
+class TestAggregateScoring:
+    async def test_matches_per_row_computation(self):
+        rng = random.Random(7)
+        histories = {uuid.uuid4(): random_signals(rng, rng.randint(1, 30)) for _ in range(200)}
+        db = ScoringSession(rows=[aggregate_row(cid, sigs) for cid, sigs in histories.items()])
+
+        scores = await compute_risk_scores(db, now=NOW)
+
+        assert len(db.statements) == 1
+        for company_id, signals in histories.items():
+            assert (scores[company_id].composite, scores[company_id].trend) == legacy_score(signals)
+            assert scores[company_id].signal_count == len(signals)
+
+
+class TestUpdateCompanies:
+    async def test_scores_touched_companies_in_one_query(self):
+        active, quiet = Company(id=uuid.uuid4(), name="Active"), Company(id=uuid.uuid4(), name="Quiet")
+        quiet.composite_risk_score, quiet.signal_count = 55, 3
+        signals = random_signals(random.Random(1), 4)
+        db = ScoringSession(
+            rows=[aggregate_row(active.id, signals)], companies={active.id: active, quiet.id: quiet}
+        )
+
+        updated = await update_company_risk_scores(db, {active.id, quiet.id})
+
+        assert len(db.statements) == 1
+        assert updated[active.id] == active.composite_risk_score > 0
+        assert active.signal_count == 4
+        assert (quiet.composite_risk_score, quiet.risk_trend, quiet.signal_count) == (0, "stable", 0)
+
+
+class TestRefreshAll:
+    async def test_chunks_with_bulk_updates_and_commits(self):
+        rng = random.Random(3)
+        company_ids = sorted(uuid.uuid4() for _ in range(25))
+        rows = [aggregate_row(cid, random_signals(rng, 3)) for cid in company_ids[:20]]
+        db = ScoringSession(company_ids=company_ids, rows=rows)
+
+        refreshed = await refresh_all_risk_scores(db, chunk_size=10)
+
+        assert refreshed == 25
+        assert db.commits == 3
+        # Per chunk: id page + aggregate + bulk update; then one empty page
+        assert len(db.statements) == 3 * 3 + 1
+        params = [p for chunk in db.updates for p in chunk]
+        assert [p["id"] for p in params] == company_ids
+        assert all(p["signal_count"] == 0 and p["composite_risk_score"] == 0 for p in params[20:])
+        assert all(p["signal_count"] == 3 for p in params[:20])
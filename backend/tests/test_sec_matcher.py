@@ -0,0 +1,104 @@
+"""Tests for the indexed SEC ticker matcher."""
+
+import random
+import time
+
+from app.processing.sec_matcher import SecTickerMatcher, normalize_company_name
+
+
+def linear_scan(company_name: str, tickers_data: dict) -> dict | None:
+    """The original per-company scan, kept as the reference semantics."""
+    target = normalize_company_name(company_name)
+    if not target or len(target) < 3:
+        return None
+    best_match = None
+    for entry in tickers_data.values():
+        sec_normalized = normalize_company_name(entry.get("title", ""))
+        if sec_normalized == target:
+            return entry
+        if len(target) >= 5 and (target in sec_normalized or sec_normalized in target):
+            if best_match is None or len(sec_normalized) < len(best_match.get("title", "")):
+                best_match = entry
+    return best_match
+
+
+def _tickers(titles: list[str]) -> dict:
+    return {
+        str(i): {"cik_str": 1000 + i, "ticker": f"T{i}", "title": title}
+        for i, title in enumerate(titles)
+    }
+
+
+TICKERS = _tickers([
+    "Acme Widgets Holdings Inc.",
+    "ACME WIDGETS CORP",
+    "Acme Widgets International Group",
+    "Global Acme Widgets Co",
+    "Boeing Co",
+    "Intel Corp",
+    "Intellicheck, Inc.",
+    "Apple Inc.",
+    "Pineapple Express Ltd",
+    "Meta Platforms, Inc.",
+    "The Walt Disney Company",
+    "IBM",
+])
+
+
+class TestNormalize:
+    def test_strips_suffix_and_punctuation(self):
+        assert normalize_company_name("  Meta Platforms, Inc. ") == "meta platforms"
+        assert normalize_company_name("AT&T Inc.") == "att"
+
+
+class TestSecTickerMatcher:
+    def test_exact_match_first_in_file_order(self):
+        matcher = SecTickerMatcher(TICKERS)
+        assert matcher.match("Acme Widgets")["ticker"] == "T0"
+
+    def test_short_names_exact_only(self):
+        matcher = SecTickerMatcher(TICKERS)
+        assert matcher.match("IBM")["ticker"] == "T11"
+        assert matcher.match("Intl") is None
+        assert matcher.match("AB") is None
+
+    def test_containment_matches_linear_scan(self):
+        matcher = SecTickerMatcher(TICKERS)
+        for name in [
+            "Acme Widgets Intl",
+            "Global Acme Widgets of Ohio",
+            "Intellicheck Mobilisa",
+            "Apple",
+            "pineapple",
+            "Walt Disney",
+            "Intel Corporation",
+            "Boeing Defense Space",
+            "Nothing Like It",
+        ]:
+            assert matcher.match(name) == linear_scan(name, TICKERS), name
+
+    def test_randomized_equivalence(self):
+        rng = random.Random(7)
+        words = ["acme", "global", "apple", "intel", "systems", "bank", "energy", "north", "co", "the", "inc"]
+        titles = [" ".join(rng.choices(words, k=rng.randint(1, 4))).title() for _ in range(300)]
+        titles += ["", "   ", "Inc."]  # Titles that normalize to nothing match every target
+        tickers = _tickers(titles)
+        matcher = SecTickerMatcher(tickers)
+        for _ in range(300):
+            name = " ".join(rng.choices(words, k=rng.randint(1, 3)))
+            assert matcher.match(name) == linear_scan(name, tickers), name
+
+    def test_fast_on_full_size_file(self):
+        rng = random.Random(1)
+        alphabet = "abcdefghijklmnopqrstuvwxyz"
+        titles = [
+            " ".join("".join(rng.choices(alphabet, k=rng.randint(3, 9))) for _ in range(rng.randint(1, 4))) + " Inc"
+            for _ in range(13_000)
+        ]
+        matcher = SecTickerMatcher(_tickers(titles))
+        names = [titles[i][:-4] + " holdings" for i in range(0, 13_000, 13)]
+        start = time.perf_counter()
+        for name in names:
+            matcher.match(name)
+        # ~1000 lookups; the linear scan needs seconds for this
+        assert time.perf_counter() - start < 1.0
@@ -0,0 +1,122 @@
+"""Tests for the on-disk, conditionally refreshed SEC reference store."""
+
+import json
+import time
+from unittest.mock import patch
+
+import httpx
+import pytest
+
+from app.processing import sec_reference as sec_reference_module
+from app.processing.sec_reference import SecReferenceStore
+
+TICKERS = {"0": {"cik_str": 320193, "ticker": "AAPL", "title": "Apple Inc."}}
+SUBMISSIONS = {
+    "cik": "0000320193",
+    "name": "Apple Inc.",
+    "sic": "3571",
+    "stateOfIncorporation": "CA",
+    "addresses": {"business": {"stateOrCountry": "CA", "street1": "One Apple Park Way"}},
+    "filings": {"recent": {"accessionNumber": ["x"] * 1000}},
+}
+
+
+class StandInSec:
+    """Serves the two SEC documents with ETag validation."""
+
+    def __init__(self):
+        self.etag = '"v1"'
+        self.tickers = TICKERS
+        self.requests: list[httpx.Request] = []
+        self.fail = False
+
+    def handler(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        if self.fail:
+            raise httpx.ConnectError("down")
+        if request.headers.get("if-none-match") == self.etag:
+            return httpx.Response(304, headers={"ETag": self.etag})
+        body = self.tickers if request.url.path.endswith("company_tickers.json") else SUBMISSIONS
+        return httpx.Response(200, json=body, headers={"ETag": self.etag, "Last-Modified": "Mon, 02 Mar 2026 00:00:00 GMT"})
+
+
+@pytest.fixture(autouse=True)
+def local_rate_limit():
+    # No Redis here: the shared sec.gov bucket falls back to a per-process one
+    with patch("app.core.throttle.get_redis", return_value=None):
+        yield
+
+
+@pytest.fixture
+def sec():
+    return StandInSec()
+
+
+def _store(root, sec) -> SecReferenceStore:
+    return SecReferenceStore(root, client=httpx.AsyncClient(transport=httpx.MockTransport(sec.handler)))
+
+
+class TestTickers:
+    async def test_downloads_once_then_serves_from_memory(self, tmp_path, sec):
+        store = _store(tmp_path, sec)
+        assert await store.tickers() == TICKERS
+        assert await store.tickers() is await store.tickers()
+        assert len(sec.requests) == 1
+        assert json.loads((tmp_path / "company_tickers.json").read_text()) == TICKERS
+
+    async def test_other_process_reads_disk_copy(self, tmp_path, sec):
+        await _store(tmp_path, sec).tickers()
+        second = _store(tmp_path, sec)
+        assert await second.tickers() == TICKERS
+        assert len(sec.requests) == 1
+
+    async def test_revalidates_with_etag_when_stale(self, tmp_path, sec, monkeypatch):
+        store = _store(tmp_path, sec)
+        first = await store.tickers()
+        monkeypatch.setattr(sec_reference_module, "TICKERS_MAX_AGE", 0)
+        assert await store.tickers() is first
+        assert sec.requests[-1].headers["if-none-match"] == '"v1"'
+        assert sec.requests[-1].headers["if-modified-since"]
+
+        sec.etag, sec.tickers = '"v2"', {**TICKERS, "1": {"cik_str": 1, "ticker": "NEW", "title": "New Co"}}
+        updated = await store.tickers()
+        assert updated is not first
+        assert "1" in updated
+
+    async def test_stale_copy_used_when_sec_unreachable(self, tmp_path, sec, monkeypatch):
+        store = _store(tmp_path, sec)
+        await store.tickers()
+        monkeypatch.setattr(sec_reference_module, "TICKERS_MAX_AGE", 0)
+        monkeypatch.setattr(sec_reference_module, "TICKERS_ATTEMPTS", 1)
+        sec.fail = True
+        assert await store.tickers() == TICKERS
+
+    async def test_nothing_available(self, tmp_path, sec, monkeypatch):
+        monkeypatch.setattr(sec_reference_module, "TICKERS_ATTEMPTS", 1)
+        sec.fail = True
+        assert await _store(tmp_path, sec).tickers() == {}
+
+
+class TestSubmissions:
+    async def test_trimmed_and_cached_on_disk(self, tmp_path, sec):
+        store = _store(tmp_path, sec)
+        data = await store.submissions(320193)
+        assert data["sic"] == "3571"
+        assert data["addresses"] == {"business": {"stateOrCountry": "CA"}}
+        assert "filings" not in data
+        assert await _store(tmp_path, sec).submissions("320193") == data
+        assert len(sec.requests) == 1
+        assert sec.requests[0].url.path == "/submissions/CIK0000320193.json"
+
+    async def test_not_modified_keeps_data(self, tmp_path, sec, monkeypatch):
+        store = _store(tmp_path, sec)
+        data = await store.submissions(320193)
+        monkeypatch.setattr(sec_reference_module, "SUBMISSIONS_MAX_AGE", 0)
+        assert await store.submissions(320193) == data
+        assert len(sec.requests) == 2
+        record = json.loads((tmp_path / "submissions" / "CIK0000320193.json").read_text())
+        assert record["checked_at"] <= time.time()
+
+    async def test_unreachable_without_cache(self, tmp_path, sec):
+        sec.fail = True
+        assert await _store(tmp_path, sec).submissions(1) is None
@@ -0,0 +1,137 @@
+"""Tests for batch, set-based signal correlation."""
+
+import random
+import uuid
+from types import SimpleNamespace
+
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.sql.dml import Insert, Update
+
+from app.models import Signal
+from app.processing.signal_correlator import _CompanyWindow, assign_group, correlate_signals
+from tests.conftest import StandInSession
+
+
+def legacy_grouped(existing: list[tuple[str, uuid.UUID | None]], new: list[str]) -> bool:
+    """The original one-signal-at-a-time rule: does the company end up grouped?"""
+    history = list(existing)
+    grouped = False
+    for category in new:
+        existing_group = next((g for _, g in reversed(history) if g), None)
+        related_categories = {c for c, _ in history}
+        if history and (category not in related_categories or existing_group):
+            group = existing_group or uuid.uuid4()
+            history = [(c, g or group) for c, g in history]
+            history.append((category, group))
+            grouped = True
+        else:
+            history.append((category, None))
+    return grouped
+
+
+class TestAssignGroup:
+    def test_first_signal_for_company_stays_alone(self):
+        assert assign_group(_CompanyWindow(), ["warn"]) == (None, False)
+
+    def test_same_category_does_not_correlate(self):
+        assert assign_group(_CompanyWindow(2, {"news"}), ["news", "news"]) == (None, False)
+
+    def test_new_category_forms_group(self):
+        group_id, is_new = assign_group(_CompanyWindow(1, {"news"}), ["warn"])
+        assert group_id is not None and is_new
+
+    def test_joins_existing_group(self):
+        existing = uuid.uuid4()
+        assert assign_group(_CompanyWindow(3, {"news"}, existing), ["news"]) == (existing, False)
+
+    def test_batch_signals_correlate_with_each_other(self):
+        group_id, is_new = assign_group(_CompanyWindow(), ["news", "bankruptcy"])
+        assert group_id is not None and is_new
+
+    def test_matches_per_signal_rule(self):
+        rng = random.Random(11)
+        categories = ["warn", "news", "filing", "bankruptcy"]
+        for _ in range(500):
+            existing = [
+                (rng.choice(categories), uuid.uuid4() if rng.random() < 0.2 else None)
+                for _ in range(rng.randint(0, 4))
+            ]
+            new = [rng.choice(categories) for _ in range(rng.randint(1, 4))]
+            window = _CompanyWindow(
+                len(existing),
+                {c for c, _ in existing},
+                next((g for _, g in reversed(existing) if g), None),
+            )
+            assert (assign_group(window, new)[0] is not None) == legacy_grouped(existing, new)
+
+
+def _signal(company_id, category):
+    return Signal(id=uuid.uuid4(), company_id=company_id, signal_category=category)
+
+
+class TestCorrelateSignals:
+    async def test_batch_written_with_set_based_statements(self):
+        grouped, fresh, lonely = uuid.uuid4(), uuid.uuid4(), uuid.uuid4()
+        existing_group = uuid.uuid4()
+        windows = [
+            SimpleNamespace(company_id=grouped, signal_count=2, categories=["warn"], group_id=existing_group),
+            SimpleNamespace(company_id=fresh, signal_count=1, categories=["news"], group_id=None),
+        ]
+        batch = [
+            _signal(grouped, "warn"),
+            _signal(fresh, "news"),
+            _signal(fresh, "bankruptcy"),
+            _signal(lonely, "news"),
+        ]
+        db = StandInSession(rows=windows)
+
+        assignments = await correlate_signals(db, batch)
+
+        assert assignments[grouped] == existing_group
+        assert fresh in assignments and lonely not in assignments
+        assert batch[0].correlation_group_id == existing_group
+        assert batch[1].correlation_group_id == batch[2].correlation_group_id == assignments[fresh]
+        assert batch[3].correlation_group_id is None
+
+        kinds = [type(statement) for statement, _ in db.statements]
+        assert kinds[1:] == [Insert, Update, Update]
+        _, new_groups = db.statements[1]
+        assert [g["company_id"] for g in new_groups] == [fresh]
+        _, attach = db.statements[2]
+        assert {p["b_company_id"]: p["b_group_id"] for p in attach} == assignments
+
+    async def test_statements_compile_for_postgres(self):
+        company_id = uuid.uuid4()
+        window = SimpleNamespace(
+            company_id=company_id, signal_count=1, categories=["news"], group_id=None
+        )
+        db = StandInSession(rows=[window])
+        await correlate_signals(db, [_signal(company_id, "warn")])
+
+        def sql(position):
+            compiled = db.statements[position][0].compile(
+                dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}
+            )
+            return str(compiled)
+
+        # Latest group id per company from an ordered, filtered aggregate
+        assert (
+            "(array_agg(signals.correlation_group_id ORDER BY signals.created_at DESC) "
+            "FILTER (WHERE signals.correlation_group_id IS NOT NULL))[1]"
+        ) in sql(0)
+        # Group stats refreshed with UPDATE ... FROM the aggregate subquery
+        stats = sql(3)
+        assert stats.startswith("UPDATE correlation_groups SET window_start=anon_1.window_start")
+        assert "FROM (SELECT signals.correlation_group_id AS group_id" in stats
+        assert stats.endswith("WHERE correlation_groups.id = anon_1.group_id")
+
+    async def test_nothing_to_correlate_is_one_query(self):
+        company_id = uuid.uuid4()
+        db = StandInSession()
+        assert await correlate_signals(db, [_signal(company_id, "news")]) == {}
+        assert len(db.statements) == 1
+
+    async def test_empty_batch_no_queries(self):
+        db = StandInSession()
+        assert await correlate_signals(db, []) == {}
+        assert db.statements == []
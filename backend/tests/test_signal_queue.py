@@ -0,0 +1,56 @@
+"""Tests for priority claiming of raw signals."""
+
+from sqlalchemy.dialects import postgresql
+
+from app.processing.deal_scorer import URGENCY_MAP
+from app.processing.signal_classifier import SOURCE_WEIGHTS
+from app.processing.signal_queue import (
+    MAX_PRIORITY,
+    MAX_STARVATION_HOURS,
+    MIN_PRIORITY,
+    claim_order,
+    claim_score,
+    raw_signal_priority,
+)
+
+
+def test_urgent_trusted_sources_rank_above_news():
+    ch7 = raw_signal_priority("courtlistener", "bankruptcy_ch7")
+    warn_closure = raw_signal_priority("warn_act", "facility_shutdown")
+    gdelt_layoff = raw_signal_priority("gdelt", "layoff")
+    assert ch7 > gdelt_layoff
+    assert warn_closure > gdelt_layoff
+
+
+def test_unknown_source_and_event_use_defaults():
+    assert raw_signal_priority("globenewswire", "unknown") == MIN_PRIORITY
+
+
+def test_priorities_stay_in_bounds():
+    sources = list(SOURCE_WEIGHTS) + ["globenewswire"]
+    events = list(URGENCY_MAP) + ["unknown"]
+    for source in sources:
+        for event in events:
+            assert MIN_PRIORITY <= raw_signal_priority(source, event) <= MAX_PRIORITY
+
+
+def test_older_signal_ranks_first_at_equal_priority():
+    assert claim_score("gdelt", "layoff", 2) > claim_score("gdelt", "layoff", 1)
+
+
+def test_no_signal_starves():
+    """After MAX_STARVATION_HOURS the lowest-priority raw beats any fresh raw."""
+    starved = claim_score("globenewswire", "unknown", MAX_STARVATION_HOURS)
+    assert starved >= claim_score("warn_act", "bankruptcy_ch7", 0)
+    # ...but before that, a fresh urgent filing still jumps the queue
+    assert claim_score("globenewswire", "unknown", MAX_STARVATION_HOURS / 2) < claim_score(
+        "courtlistener", "bankruptcy_ch7", 0
+    )
+
+
+def test_claim_order_ranks_in_sql():
+    sql = str(claim_order().compile(dialect=postgresql.dialect()))
+    assert "CASE raw_signals.source_type" in sql
+    assert "CASE raw_signals.event_type" in sql
+    assert "now()" in sql
+    assert sql.endswith("DESC")
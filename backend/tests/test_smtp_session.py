@@ -0,0 +1,176 @@
+"""Tests for SMTP session reuse and the waterfall's use of it (against a local fake MX)."""
+
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from app.contacts import email_validator, smtp_session
+from app.contacts.domain_intel import DomainIntel
+from app.contacts.pattern_inference import PatternModel
+from app.contacts.smtp_session import SmtpSession
+
+
+class FakeMx:
+    """Minimal asyncio SMTP server that records every command it receives."""
+
+    def __init__(self, accept: set[str] = frozenset(), pipelining: bool = True, catch_all: bool = False,
+                 drop_after_rcpts: int | None = None):
+        self.accept = {a.lower() for a in accept}
+        self.pipelining = pipelining
+        self.catch_all = catch_all
+        self.drop_after_rcpts = drop_after_rcpts
+        self.connections = 0
+        self.commands: list[str] = []
+        self.reads_with_multiple_rcpts = 0
+        self.server: asyncio.base_events.Server | None = None
+
+    @property
+    def port(self) -> int:
+        return self.server.sockets[0].getsockname()[1]
+
+    async def __aenter__(self):
+        self.server = await asyncio.start_server(self._handle, "127.0.0.1", 0)
+        return self
+
+    async def __aexit__(self, *exc):
+        self.server.close()
+        await self.server.wait_closed()
+
+    async def _handle(self, reader, writer):
+        self.connections += 1
+        rcpts_seen = 0
+        writer.write(b"220 mx.test ESMTP\r\n")
+        await writer.drain()
+        while True:
+            chunk = await reader.readline()
+            if not chunk:
+                break
+            # Count pipelined RCPT groups: more lines already buffered behind this one
+            if chunk.startswith(b"RCPT") and b"RCPT" in reader._buffer:
+                self.reads_with_multiple_rcpts += 1
+            line = chunk.decode().strip()
+            self.commands.append(line)
+            verb = line.split(" ", 1)[0].split(":", 1)[0].upper()
+            if verb == "EHLO":
+                ext = ["250-mx.test greets you", "250-SIZE 35882577"]
+                if self.pipelining:
+                    ext.append("250-PIPELINING")
+                ext.append("250 8BITMIME")
+                writer.write(("\r\n".join(ext) + "\r\n").encode())
+            elif verb == "RCPT":
+                rcpts_seen += 1
+                if self.drop_after_rcpts is not None and rcpts_seen > self.drop_after_rcpts:
+                    writer.close()
+                    self.drop_after_rcpts = None
+                    return
+                address = line[line.index("<") + 1 : line.index(">")].lower()
+                ok = self.catch_all or address in self.accept
+                writer.write(b"250 OK\r\n" if ok else b"550 No such user\r\n")
+            elif verb == "QUIT":
+                writer.write(b"221 Bye\r\n")
+                await writer.drain()
+                writer.close()
+                return
+            else:
+                writer.write(b"250 OK\r\n")
+            await writer.drain()
+
+
+class TestSmtpSession:
+    async def test_one_connection_many_batches(self):
+        async with FakeMx(accept={"a@x.test"}) as mx:
+            async with SmtpSession("127.0.0.1", port=mx.port) as session:
+                first = await session.check(["a@x.test", "b@x.test"])
+                second = await session.check(["c@x.test"])
+        assert first == {"a@x.test": "accepted", "b@x.test": "rejected"}
+        assert second == {"c@x.test": "rejected"}
+        assert mx.connections == 1
+        assert [c for c in mx.commands if c.startswith("EHLO")] == ["EHLO disposight.com"]
+        assert mx.commands.count("RSET") == 2
+
+    async def test_parses_multiline_ehlo_and_pipelines(self):
+        async with FakeMx(pipelining=True) as mx:
+            async with SmtpSession("127.0.0.1", port=mx.port) as session:
+                await session.check([f"u{i}@x.test" for i in range(5)])
+                assert session.extensions == {"SIZE", "PIPELINING", "8BITMIME"}
+        assert mx.reads_with_multiple_rcpts >= 1
+
+    async def test_sequential_without_pipelining(self):
+        async with FakeMx(pipelining=False) as mx:
+            async with SmtpSession("127.0.0.1", port=mx.port) as session:
+                result = await session.check([f"u{i}@x.test" for i in range(3)])
+                assert not session.pipelining
+        assert set(result.values()) == {"rejected"}
+        assert mx.reads_with_multiple_rcpts == 0
+
+    async def test_reconnects_once_after_drop(self):
+        async with FakeMx(accept={"b@x.test"}, drop_after_rcpts=1) as mx:
+            async with SmtpSession("127.0.0.1", port=mx.port) as session:
+                assert await session.check(["a@x.test"]) == {"a@x.test": "rejected"}
+                assert await session.check(["b@x.test"]) == {"b@x.test": "accepted"}
+        assert mx.connections == 2
+
+    async def test_probe_meter_counts_rcpts(self):
+        meter = smtp_session.ProbeMeter()
+        token = smtp_session.probe_meter.set(meter)
+        try:
+            async with FakeMx() as mx:
+                async with SmtpSession("127.0.0.1", port=mx.port) as session:
+                    await session.check(["a@x.test", "b@x.test"])
+                    await session.check(["c@x.test"])
+        finally:
+            smtp_session.probe_meter.reset(token)
+        assert meter.rcpts == 3
+
+    async def test_unreachable_host_not_retried(self):
+        async with FakeMx() as mx:
+            port = mx.port
+        session = SmtpSession("127.0.0.1", port=port, connect_timeout=0.5)
+        assert await session.check(["a@x.test"]) == {"a@x.test": "error"}
+        assert session.unreachable
+        assert await session.check(["b@x.test"]) == {"b@x.test": "error"}
+        assert session.connections == 0
+
+
+@pytest.fixture
+def waterfall_env():
+    intel = DomainIntel(domain="acme.test", mx_hosts=["127.0.0.1"], mx_valid=True)
+    with (
+        patch.object(email_validator, "get_domain_intel", AsyncMock(return_value=intel)),
+        patch.object(email_validator, "record_probe", AsyncMock()),
+        patch.object(email_validator, "infer_patterns", AsyncMock(return_value=PatternModel().infer("acme.test"))),
+    ):
+        yield
+
+
+class TestWaterfallSessions:
+    contact = SimpleNamespace(first_name="Jane", last_name="Doe")
+
+    async def test_single_connection_for_all_permutations(self, waterfall_env):
+        async with FakeMx(accept={"jdoe@acme.test"}) as mx:
+            with patch.object(smtp_session, "SMTP_PORT", mx.port):
+                status, email, pattern = await email_validator.waterfall_validate(self.contact, "acme.test", None)
+        assert (status, email) == ("valid", "jdoe@acme.test")
+        assert mx.connections == 1
+        assert sum(c.startswith("MAIL FROM") for c in mx.commands) == 2  # probe batch + one group
+        assert sum(c.startswith("RCPT") for c in mx.commands) == 4
+
+    async def test_stops_probing_at_first_accepted_group(self, waterfall_env):
+        # Fourth most likely pattern: two groups after the first batch, rest never probed
+        async with FakeMx(accept={"janedoe@acme.test"}) as mx:
+            with patch.object(smtp_session, "SMTP_PORT", mx.port):
+                status, email, _ = await email_validator.waterfall_validate(self.contact, "acme.test", None)
+        assert (status, email) == ("valid", "janedoe@acme.test")
+        assert mx.connections == 1
+        assert sum(c.startswith("RCPT") for c in mx.commands) == 2 + 2 * email_validator.RCPT_GROUP_SIZE
+
+    async def test_catch_all_detected_in_first_batch(self, waterfall_env):
+        async with FakeMx(catch_all=True) as mx:
+            with patch.object(smtp_session, "SMTP_PORT", mx.port):
+                status, email, _ = await email_validator.waterfall_validate(self.contact, "acme.test", None)
+        assert status == "risky"
+        assert email == "jane.doe@acme.test"
+        assert mx.connections == 1
+        assert sum(c.startswith("RCPT") for c in mx.commands) == 2
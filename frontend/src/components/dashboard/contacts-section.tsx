@@ -1,13 +1,22 @@
 "use client";
 
 import { useEffect, useState } from "react";
-import { api, PlanLimitError, type ContactInfo } from "@/lib/api";
+import { api, PlanLimitError, type ContactInfo, type ContactsResponse } from "@/lib/api";
 import { ContactCard } from "./contact-card";
 import { UpgradePrompt } from "./upgrade-prompt";
 import KineticDotsLoader from "@/components/ui/kinetic-dots-loader";
 
 type ContactsState = "idle" | "loading" | "found" | "none_found" | "no_domain" | "error" | "gated";
 
+const POLL_INTERVAL_MS = 2000;
+const MAX_POLLS = 90;
+
+const progressLabels: Record<string, string> = {
+  scraping: "Reading website",
+  extracting: "Identifying leadership",
+  validating: "Verifying emails",
+};
+
 interface ContactsSectionProps {
   companyId: string;
   companyName: string;
@@ -19,6 +28,7 @@ export function ContactsSection({ companyId, companyName, domain, isPaid }: Cont
   const [state, setState] = useState<ContactsState>(isPaid ? "idle" : "gated");
   const [contacts, setContacts] = useState<ContactInfo[]>([]);
   const [error, setError] = useState("");
+  const [stage, setStage] = useState("");
 
   // Check for cached contacts on mount
   useEffect(() => {
@@ -51,8 +61,22 @@ export function ContactsSection({ companyId, companyName, domain, isPaid }: Cont
     setError("");
 
     try {
-      const res = await api.findContacts(companyId);
-      if (res.contacts.length > 0) {
+      let res: ContactsResponse = await api.findContacts(companyId);
+      // Discovery runs as a background job — poll until it settles
+      for (let polls = 0; res.status === "pending" && polls < MAX_POLLS; polls++) {
+        setStage(res.progress ? progressLabels[res.progress.state] ?? "" : "");
+        await new Promise((resolve) => setTimeout(resolve, POLL_INTERVAL_MS));
+        res = await api.getContactsStatus(companyId);
+      }
+      setStage("");
+
+      if (res.status === "pending") {
+        setError("Contact discovery is taking longer than usual. Check back in a few minutes.");
+        setState("error");
+      } else if (res.status === "failed" && res.contacts.length === 0) {
+        setError("Contact discovery failed");
+        setState("error");
+      } else if (res.contacts.length > 0) {
         setContacts(res.contacts);
         setState("found");
       } else if (res.status === "no_domain") {
@@ -130,7 +154,9 @@ export function ContactsSection({ companyId, companyName, domain, isPaid }: Cont
 
       {state === "loading" && (
         <div className="py-4">
-          <KineticDotsLoader label={`Finding decision-makers at ${companyName}`} />
+          <KineticDotsLoader
+            label={stage ? `${stage} at ${companyName}` : `Finding decision-makers at ${companyName}`}
+          />
         </div>
       )}
 
@@ -185,6 +185,8 @@ export const api = {
     apiFetch<ContactsResponse>(`/contacts/${companyId}/find`, { method: "POST" }),
   getContacts: (companyId: string) =>
     apiFetch<ContactsResponse>(`/contacts/${companyId}`),
+  getContactsStatus: (companyId: string) =>
+    apiFetch<ContactsResponse>(`/contacts/${companyId}/status`),
 
   // Pipelines
   checkNewSignals: (since: string) =>
@@ -347,6 +349,12 @@ export interface PipelineHealthItem {
   last_run_status: string | null;
   last_run_signals_count: number;
   error_count: number;
+  enrichment_queue_depth: number;
+  enrichment_oldest_wait_seconds: number | null;
+  raw_queue_depth: number;
+  raw_oldest_wait_seconds: number | null;
+  avg_queue_wait_seconds: number | null;
+  max_queue_wait_seconds: number | null;
 }
 
 export interface PlanLimitsInfo {
@@ -541,12 +549,22 @@ export interface ContactInfo {
   created_at: string;
 }
 
+export interface ContactDiscoveryProgress {
+  state: "queued" | "scraping" | "extracting" | "validating" | "done" | "failed";
+  found: number | null;
+  validated: number | null;
+  error: string | null;
+  updated_at: string | null;
+}
+
 export interface ContactsResponse {
   contacts: ContactInfo[];
   company_id: string;
   company_name: string;
-  status: "found" | "none_found" | "no_domain";
+  status: "found" | "none_found" | "no_domain" | "pending" | "failed";
   total: number;
+  job_id: string | null;
+  progress: ContactDiscoveryProgress | null;
 }
 
 // Pipeline activity types